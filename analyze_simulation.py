@@ -4,11 +4,27 @@ Simulation Data Analyzer
 Transforms raw simulation_log.json into analysis-ready structured format
 """
 
+import glob
 import json
+import statistics
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any, Optional
 
+from simulation_analytics import SimulationAnalytics
+
+# Per-run metrics compared across a batch: (label, summary section, key)
+BATCH_METRICS = [
+    ("prey_max_gen", "generation_spread", "prey_max_generation"),
+    ("pred_max_gen", "generation_spread", "pred_max_generation"),
+    ("prey_mut_rate", "mutation_overview", "prey_mutation_rate"),
+    ("pred_mut_rate", "mutation_overview", "pred_mutation_rate"),
+    ("prey_births", "simulation_overview", "total_prey"),
+    ("pred_births", "simulation_overview", "total_predators"),
+    ("sim_seconds", "simulation_overview", "simulation_time_seconds"),
+]
+
 def load_simulation_data(filepath: str) -> Dict[str, Any]:
     """Load raw simulation data from JSON file"""
     try:
@@ -86,6 +102,42 @@ def organize_entities(events: List[List[Any]]) -> Dict[str, Dict[str, Any]]:
                 entity["lifespan_frames"] = frame - birth_frame
                 entity["lifespan_seconds"] = age_seconds
                 
+        elif event_type == "migrate_in":
+            entity_id = str(event[2])
+            entities[entity_id] = {
+                "id": entity_id,
+                "species": event[4],
+                "generation": event[5],
+                "parent_id": None,   # immigrants have no parent in this world's log
+                "source_island": event[3],
+                "birth": {
+                    "frame": frame,
+                    "mutations": {}
+                },
+                "death": None,
+                "hunts": [],
+                "hunted_by": [],
+                "children": [],
+                "lifespan_frames": None,
+                "lifespan_seconds": None
+            }
+
+        elif event_type == "migrate_out":
+            entity_id = str(event[2])
+            if entity_id in entities:
+                entity = entities[entity_id]
+                entity["death"] = {
+                    "frame": frame,
+                    "age_seconds": event[4],
+                    "children_spawned": event[6],
+                    "replaced": True
+                }
+                if event[5] == "predator":
+                    entity["death"]["total_prey_eaten"] = event[7]
+                    entity["total_prey_eaten"] = event[7]
+                entity["lifespan_frames"] = frame - entity["birth"]["frame"]
+                entity["lifespan_seconds"] = event[4]
+
         elif event_type == "hunt":
             predator_id = str(event[2])
             predator_generation = event[3]
@@ -193,9 +245,96 @@ def generate_summary_stats(entities: Dict[str, Dict[str, Any]], frame_data: List
     
     return stats
 
+def summarize_simulation_log(filepath: str) -> Dict[str, Any]:
+    """Batch worker: reduce one log to a compact summary (no entity dicts cross the process boundary)"""
+    try:
+        with open(filepath, 'r') as f:
+            raw_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return {"file": filepath, "error": str(e)}
+    missing = [key for key in ("events", "frame_data") if not isinstance(raw_data, dict) or key not in raw_data]
+    if missing:
+        return {"file": filepath, "error": f"not a simulation log (missing {', '.join(missing)})"}
+
+    analytics = SimulationAnalytics.from_events(raw_data["events"], raw_data["frame_data"])
+    summary = analytics.get_summary()
+    return {
+        "file": filepath,
+        "metrics": {label: summary[section][key] for label, section, key in BATCH_METRICS},
+        "lifespans_seconds": summary["lifespans_seconds"],
+        "lineage": summary["lineage"]
+    }
+
+def merge_run_summaries(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-run summaries into cross-run mean/spread statistics"""
+    valid_runs = [r for r in runs if "error" not in r]
+    merged = {}
+    for label, _, _ in BATCH_METRICS:
+        values = [r["metrics"][label] for r in valid_runs]
+        if not values:
+            continue
+        merged[label] = {
+            "mean": statistics.fmean(values),
+            "stdev": statistics.pstdev(values),
+            "min": min(values),
+            "max": max(values)
+        }
+    return {
+        "runs_analyzed": len(valid_runs),
+        "runs_failed": len(runs) - len(valid_runs),
+        "metrics": merged
+    }
+
+def expand_log_paths(patterns: List[str]) -> List[str]:
+    """Expand file names and glob patterns into a sorted, de-duplicated path list"""
+    paths = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern)
+        paths.update(matches if matches else [pattern])
+    return sorted(paths)
+
+def analyze_batch(filepaths: List[str], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Analyze many simulation logs in a process pool and merge the results"""
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        runs = list(executor.map(summarize_simulation_log, filepaths))
+    return {"runs": runs, "comparison": merge_run_summaries(runs)}
+
+def print_batch_table(batch: Dict[str, Any]):
+    """Print the cross-run comparison table"""
+    labels = [label for label, _, _ in BATCH_METRICS]
+    name_width = max([len(r["file"]) for r in batch["runs"]] + [10])
+    print(f"{'run':<{name_width}}  " + "  ".join(f"{label:>13}" for label in labels))
+
+    for run in batch["runs"]:
+        name = run["file"]
+        if "error" in run:
+            print(f"{name:<{name_width}}  error: {run['error']}")
+            continue
+        print(f"{name:<{name_width}}  " + "  ".join(f"{run['metrics'][label]:>13.3g}" for label in labels))
+
+    metrics = batch["comparison"]["metrics"]
+    if metrics:
+        print(f"{'mean':<{name_width}}  " + "  ".join(f"{metrics[label]['mean']:>13.3g}" for label in labels))
+        print(f"{'stdev':<{name_width}}  " + "  ".join(f"{metrics[label]['stdev']:>13.3g}" for label in labels))
+
+def batch_main(patterns: List[str], output_file: str = "batch_analysis.json"):
+    filepaths = expand_log_paths(patterns)
+    print(f"Analyzing {len(filepaths)} simulation logs...")
+    batch = analyze_batch(filepaths)
+
+    print_batch_table(batch)
+    with open(output_file, 'w') as f:
+        json.dump(batch, f, indent=2)
+    print(f"\nBatch comparison saved to: {output_file}")
+
 def main():
+    if len(sys.argv) >= 3 and sys.argv[1] == "--batch":
+        batch_main(sys.argv[2:])
+        return
+
     if len(sys.argv) != 2:
         print("Usage: python analyze_simulation.py simulation_log.json")
+        print("       python analyze_simulation.py --batch 'runs/*/simulation_log.json' [more logs...]")
         sys.exit(1)
     
     input_file = sys.argv[1]
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Scenario Benchmarks for Evolution Simulation
+Runs seeded, headless scenarios for a fixed number of steps and reports steps/s and
+per-phase time, plus a scaling curve of time per step against population.
+No rendering or clock.tick is involved, so results compare simulation cost only.
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from entities.predator import Predator
+from simulation import Simulation, STEP_PHASES, MAX_PREY
+from work_counters import get_work_counters
+from frame_tracer import get_tracer
+
+# Scenario -> Simulation arguments plus benchmark settings
+SCENARIOS = {
+    "default": {
+        "description": "Interactive defaults: 250 prey, 5 predators",
+        "sim": {"num_prey": 250, "num_predators": 5},
+        "steps": 600,
+    },
+    "max_prey": {
+        "description": f"{MAX_PREY} prey starting at the MAX_PREY cap",
+        "sim": {"num_prey": MAX_PREY, "num_predators": 5, "max_prey": MAX_PREY},
+        "steps": 300,
+    },
+    "stress_10k": {
+        "description": "10,000 prey on a 4x larger world",
+        "sim": {"width": 2880, "height": 2000, "num_prey": 10000, "num_predators": 20, "max_prey": 10000},
+        "steps": 30,
+    },
+    "predator_heavy": {
+        "description": "250 prey hunted by 50 predators with 30 vision rays",
+        "sim": {"num_prey": 250, "num_predators": 0},
+        "predators": 50,
+        "predator_rays": 30,
+        "steps": 300,
+    },
+}
+
+SCALING_POPULATIONS = [100, 250, 500, 1000, 2000, 4000]
+SCALING_STEPS = 60
+
+
+def build_scenario(scenario: Dict[str, Any], seed: int) -> Simulation:
+    """Create the scenario's world; extra predators are placed from the world stream"""
+    sim = Simulation(seed=seed, **scenario["sim"])
+    world_rng = sim.rng["world"]
+    for _ in range(scenario.get("predators", 0)):
+        x = world_rng.randint(100, sim.width - 100)
+        y = world_rng.randint(100, sim.height - 100)
+        predator = Predator(x, y, generation=0, frame_rate=sim.frame_rate,
+                            num_rays=scenario.get("predator_rays", 7))
+        predator.fitness_stats['birth_frame'] = 0
+        sim.add_entity(predator)
+    return sim
+
+
+def measure(sim: Simulation, steps: int, warmup: int) -> Dict[str, Any]:
+    """Step the world, discarding warmup steps (Numba JIT compilation, cache fill)"""
+    for _ in range(warmup):
+        sim.step()
+
+    work = get_work_counters()
+    work.reset()
+    phase_ns = dict.fromkeys(STEP_PHASES, 0)
+    step_ns = []
+    population = 0
+    for _ in range(steps):
+        start = time.perf_counter_ns()
+        sim.step()
+        step_ns.append(time.perf_counter_ns() - start)
+        for phase, ns in sim.phase_times_ns.items():
+            phase_ns[phase] += ns
+        population += len(sim.entities)
+
+    step_ms = np.array(step_ns) / 1e6
+    total_seconds = step_ms.sum() / 1000
+    return {
+        "steps": steps,
+        "warmup_steps": warmup,
+        "elapsed_seconds": total_seconds,
+        "steps_per_second": steps / total_seconds if total_seconds > 0 else 0,
+        "ms_per_step": {
+            "mean": float(step_ms.mean()),
+            "median": float(np.median(step_ms)),
+            "p90": float(np.percentile(step_ms, 90)),
+            "max": float(step_ms.max())
+        },
+        "phase_ms_per_step": {phase: ns / steps / 1e6 for phase, ns in phase_ns.items()},
+        "mean_population": population / steps,
+        "work_per_step": {name: value / steps if isinstance(value, int) else value
+                          for name, value in work.collect().items()},
+        "final": {"prey_count": len(sim.prey_list), "predator_count": len(sim.predators)}
+    }
+
+
+def run_scenario(name: str, seed: int, steps: Optional[int] = None, warmup: int = 10) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+    sim = build_scenario(scenario, seed)
+    result = measure(sim, steps or scenario["steps"], warmup)
+    result.update({"scenario": name, "description": scenario["description"], "seed": seed})
+    return result
+
+
+def run_scaling_curve(populations: List[int], seed: int, steps: int = SCALING_STEPS,
+                      warmup: int = 5) -> Dict[str, Any]:
+    """Time per step against population, with the log-log slope as the scaling exponent"""
+    points = []
+    for num_prey in populations:
+        sim = Simulation(seed=seed, num_prey=num_prey, num_predators=5, max_prey=num_prey)
+        result = measure(sim, steps, warmup)
+        points.append({
+            "num_prey": num_prey,
+            "mean_population": result["mean_population"],
+            "ms_per_step": result["ms_per_step"]["mean"],
+            "phase_ms_per_step": result["phase_ms_per_step"]
+        })
+        print(f"  {num_prey:>6} prey: {result['ms_per_step']['mean']:8.2f} ms/step")
+
+    exponent = None
+    if len(points) >= 2:
+        x = np.log([p["mean_population"] for p in points])
+        y = np.log([p["ms_per_step"] for p in points])
+        exponent = float(np.polyfit(x, y, 1)[0])
+    return {"steps": steps, "points": points, "scaling_exponent": exponent}
+
+
+def environment_info() -> Dict[str, Any]:
+    import numba
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": numba.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def print_scenario(result: Dict[str, Any]):
+    print(f"{result['scenario']}: {result['steps_per_second']:.1f} steps/s, "
+          f"{result['ms_per_step']['mean']:.2f} ms/step (p90 {result['ms_per_step']['p90']:.2f}), "
+          f"mean population {result['mean_population']:.0f}")
+    phases = sorted(result["phase_ms_per_step"].items(), key=lambda item: item[1], reverse=True)
+    print("    " + "  ".join(f"{phase}={ms:.2f}ms" for phase, ms in phases))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless scenario benchmarks')
+    parser.add_argument('--scenario', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS),
+                        help='Scenarios to run (default: all)')
+    parser.add_argument('--steps', type=int, help='Override the measured steps of every scenario')
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured steps before timing')
+    parser.add_argument('--seed', type=int, default=0, help='World seed (identical workloads across runs)')
+    parser.add_argument('--scaling', type=int, nargs='*', metavar='PREY',
+                        help=f'Also measure a scaling curve (default populations: {SCALING_POPULATIONS})')
+    parser.add_argument('--scaling-steps', type=int, default=SCALING_STEPS, help='Measured steps per scaling point')
+    parser.add_argument('--no-work-counters', action='store_true',
+                        help='Disable hot-path work counters (measures their overhead)')
+    parser.add_argument('--trace', metavar='TRACE', help='Export step phase spans as Chrome/Perfetto JSON')
+    parser.add_argument('--output', default='benchmark_results.json', help='Where to write results')
+    args = parser.parse_args()
+    get_work_counters().enabled = not args.no_work_counters
+    if args.trace:
+        get_tracer().enable()
+
+    report = {
+        "metadata": {"seed": args.seed, "timestamp": time.time(), "environment": environment_info(),
+                     "work_counters": not args.no_work_counters},
+        "scenarios": {}
+    }
+
+    print("=== Scenario Benchmarks ===")
+    for name in args.scenario:
+        result = run_scenario(name, args.seed, args.steps, args.warmup)
+        report["scenarios"][name] = result
+        print_scenario(result)
+
+    if args.scaling is not None:
+        print("\n=== Scaling Curve ===")
+        curve = run_scaling_curve(args.scaling or SCALING_POPULATIONS, args.seed, args.scaling_steps)
+        report["scaling"] = curve
+        if curve["scaling_exponent"] is not None:
+            print(f"Time per step grows as population^{curve['scaling_exponent']:.2f}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to: {args.output}")
+    if args.trace:
+        print(f"Trace saved to: {args.trace} ({get_tracer().export(args.trace)} events)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+World Checkpoints for Evolution Simulation
+Saves the whole world (positions, traits, stacked brain weights, timers, entity IDs,
+RNG stream state and the event log) to a compact .npz file and restores it for a fast restart
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from entities.base_entity import BaseEntity, HIT_TYPE_MAP
+from entities.prey import Prey
+from entities.predator import Predator
+from genome import (PREY_TRAITS, PREDATOR_TRAITS, PREY_BRAIN_SHAPE, MAX_PREDATOR_BRAIN_SHAPE,
+                    STATE_FIELDS, INT_STATE_FIELDS, FITNESS_FIELDS)
+from simulation import Simulation, COLLISION_INTERVAL, WRAP_WORLD, CROWDING
+from simulation_analytics import SimulationAnalytics
+from rng import activate_streams
+from frame_tracer import get_tracer
+
+CHECKPOINT_VERSION = 2
+MAX_RAYS = MAX_PREDATOR_BRAIN_SHAPE[0] - 3
+HIT_CODES = {name: code for code, name in HIT_TYPE_MAP.items()}
+
+
+def _json_array(obj) -> np.ndarray:
+    return np.frombuffer(json.dumps(obj).encode("utf-8"), dtype=np.uint8)
+
+
+def _from_json_array(array: np.ndarray):
+    return json.loads(array.tobytes().decode("utf-8"))
+
+
+def _pack_brains(population, input_size: int, hidden_size: int) -> Dict[str, np.ndarray]:
+    """Stack brain weights into (n, ...) arrays; narrower predator inputs are zero-padded"""
+    n = len(population)
+    w1 = np.zeros((n, hidden_size, input_size))
+    b1 = np.empty((n, hidden_size, 1))
+    w2 = np.empty((n, 2, hidden_size))
+    b2 = np.empty((n, 2, 1))
+    inputs = np.empty(n, dtype=np.int32)
+    for i, e in enumerate(population):
+        brain = e.brain
+        w1[i, :, :brain.input_size] = brain.w1
+        b1[i] = brain.b1
+        w2[i] = brain.w2
+        b2[i] = brain.b2
+        inputs[i] = brain.input_size
+    return {"w1": w1, "b1": b1, "w2": w2, "b2": b2, "inputs": inputs}
+
+
+def snapshot_world(sim: Simulation) -> Dict[str, np.ndarray]:
+    """Capture the world into plain arrays (call on the simulation thread; cheap enough per frame)"""
+    population = sim.entities
+    n = len(population)
+    is_prey = np.array([isinstance(e, Prey) for e in population], dtype=bool)
+    prey = [e for e in population if isinstance(e, Prey)]
+    predators = [e for e in population if not isinstance(e, Prey)]
+
+    ids = np.array([e.id for e in population], dtype=np.int64)
+    parent_ids = np.array([getattr(e, "parent_id", None) or -1 for e in population], dtype=np.int64)
+    generations = np.array([e.generation for e in population], dtype=np.int32)
+    positions = np.array([(e.x, e.y) for e in population], dtype=np.float64).reshape(n, 2)
+    colors = np.array([e.color for e in population], dtype=np.int16).reshape(n, 3)
+    state = np.array([[getattr(e, f, 0) for f in STATE_FIELDS] for e in population],
+                     dtype=np.float64).reshape(n, len(STATE_FIELDS))
+    fitness = np.array([[e.fitness_stats.get(f, 0) for f in FITNESS_FIELDS] for e in population],
+                       dtype=np.float64).reshape(n, len(FITNESS_FIELDS))
+    num_rays = np.array([len(e.vision) for e in population], dtype=np.int32)
+    vision = np.ones((n, MAX_RAYS), dtype=np.float32)
+    hits = np.zeros((n, MAX_RAYS), dtype=np.int8)
+    for i, e in enumerate(population):
+        vision[i, :num_rays[i]] = e.vision
+        hits[i, :num_rays[i]] = [HIT_CODES[h] for h in e.vision_hits]
+
+    prey_traits = np.array([[getattr(e, t) for t in PREY_TRAITS] for e in prey],
+                           dtype=np.float64).reshape(len(prey), len(PREY_TRAITS))
+    predator_traits = np.array([[getattr(e, t) for t in PREDATOR_TRAITS] for e in predators],
+                               dtype=np.float64).reshape(len(predators), len(PREDATOR_TRAITS))
+    predator_vision_trait = np.array(["vision" in e.visual_traits for e in predators], dtype=bool)
+
+    metadata = {
+        "version": CHECKPOINT_VERSION,
+        "saved_at": time.time(),
+        "frame_count": sim.frame_count,
+        "next_id": BaseEntity._next_id,
+        "vision_arrivals": sim.vision_scheduler.arrivals,
+        "config": {
+            "width": sim.width, "height": sim.height, "frame_rate": sim.frame_rate,
+            "max_prey": sim.max_prey, "vision_throttle": sim.vision_throttle,
+            "grid_cell_size": sim.grid.cell_size, "seed": sim.seed,
+            "collision_interval": sim.collision_interval, "wrap": sim.grid.wrap,
+            "crowding": sim.crowding
+        },
+        "rng": sim.rng.get_state()
+    }
+
+    arrays = {
+        "metadata": metadata,
+        "is_prey": is_prey, "ids": ids, "parent_ids": parent_ids, "generations": generations,
+        "positions": positions, "colors": colors, "state": state, "fitness": fitness,
+        "num_rays": num_rays, "vision": vision, "hits": hits,
+        "prey_traits": prey_traits, "predator_traits": predator_traits,
+        "predator_vision_trait": predator_vision_trait,
+        # Shallow copies: later appends on the simulation thread do not affect the snapshot
+        "events": list(sim.simulation_data["events"]),
+        "frame_data": list(sim.simulation_data["frame_data"]),
+        "start_time": sim.simulation_data["start_time"],
+    }
+    for prefix, group, shape in (("prey_brain", prey, PREY_BRAIN_SHAPE),
+                                 ("predator_brain", predators, MAX_PREDATOR_BRAIN_SHAPE)):
+        for key, value in _pack_brains(group, *shape).items():
+            arrays[f"{prefix}_{key}"] = value
+    return arrays
+
+
+def write_checkpoint(snapshot: Dict[str, Any], path: str):
+    """Serialize a snapshot to path atomically (write to a temp file, then rename)"""
+    arrays = dict(snapshot)
+    arrays["metadata"] = _json_array(arrays["metadata"])
+    arrays["log"] = _json_array({"start_time": arrays.pop("start_time"),
+                                 "events": arrays.pop("events"),
+                                 "frame_data": arrays.pop("frame_data")})
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def save_checkpoint(sim: Simulation, path: str = "checkpoint.npz"):
+    """Synchronously snapshot and write a checkpoint"""
+    write_checkpoint(snapshot_world(sim), path)
+
+
+def _restore_brain(entity, data, prefix: str, index: int):
+    brain = entity.brain
+    inputs = int(data[f"{prefix}_inputs"][index])
+    if brain.input_size != inputs:
+        brain = brain.resize_input(inputs)
+    brain.w1 = data[f"{prefix}_w1"][index, :, :inputs].copy()
+    brain.b1 = data[f"{prefix}_b1"][index].copy()
+    brain.w2 = data[f"{prefix}_w2"][index].copy()
+    brain.b2 = data[f"{prefix}_b2"][index].copy()
+    entity.brain = brain
+
+
+def load_checkpoint(path: str = "checkpoint.npz") -> Simulation:
+    """Rebuild a Simulation (entities, grid, event log, analytics, IDs and RNG streams) from a checkpoint"""
+    with np.load(path, allow_pickle=False) as archive:
+        data = {key: archive[key] for key in archive.files}
+    metadata = _from_json_array(data["metadata"])
+    if metadata["version"] != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {metadata['version']}")
+    log = _from_json_array(data["log"])
+    config = metadata["config"]
+
+    sim = Simulation(config["width"], config["height"], frame_rate=config["frame_rate"],
+                     num_prey=0, num_predators=0, max_prey=config["max_prey"],
+                     vision_throttle=config["vision_throttle"], grid_cell_size=config["grid_cell_size"],
+                     seed=config["seed"],
+                     collision_interval=config.get("collision_interval", COLLISION_INTERVAL),
+                     wrap=config.get("wrap", WRAP_WORLD), crowding=config.get("crowding", CROWDING))
+    sim.frame_count = metadata["frame_count"]
+
+    prey_index = predator_index = 0
+    for i in range(len(data["ids"])):
+        x, y = data["positions"][i]
+        generation = int(data["generations"][i])
+        if data["is_prey"][i]:
+            entity = Prey(float(x), float(y), generation=generation, frame_rate=sim.frame_rate)
+            traits, trait_values = PREY_TRAITS, data["prey_traits"][prey_index]
+            _restore_brain(entity, data, "prey_brain", prey_index)
+            prey_index += 1
+        else:
+            num_rays = int(data["num_rays"][i])
+            entity = Predator(float(x), float(y), generation=generation, frame_rate=sim.frame_rate,
+                              num_rays=num_rays)
+            traits, trait_values = PREDATOR_TRAITS, data["predator_traits"][predator_index]
+            _restore_brain(entity, data, "predator_brain", predator_index)
+            if data["predator_vision_trait"][predator_index]:
+                entity.visual_traits.append("vision")
+            predator_index += 1
+
+        entity.id = int(data["ids"][i])
+        parent_id = int(data["parent_ids"][i])
+        if parent_id >= 0:
+            entity.parent_id = parent_id
+        for trait, value in zip(traits, trait_values):
+            setattr(entity, trait, float(value))
+        entity.radius = int(entity.radius)
+        entity.color = tuple(int(c) for c in data["colors"][i])
+        for field, value in zip(STATE_FIELDS, data["state"][i]):
+            if hasattr(entity, field):
+                setattr(entity, field, int(value) if field in INT_STATE_FIELDS else float(value))
+        entity.is_moving = bool(entity.is_moving)
+        for field, value in zip(FITNESS_FIELDS, data["fitness"][i]):
+            if field in entity.fitness_stats:
+                entity.fitness_stats[field] = int(value)
+        num_rays = int(data["num_rays"][i])
+        # Keep the float32 scalars raycasting produces so resumed arithmetic matches bit for bit
+        entity.vision = list(data["vision"][i, :num_rays])
+        entity.vision_hits = [HIT_TYPE_MAP[int(h)] for h in data["hits"][i, :num_rays]]
+        sim.add_entity(entity)
+
+    sim.simulation_data = {"start_time": log["start_time"], "seed": sim.seed, "frame_data": log["frame_data"], "events": log["events"]}
+    sim.analytics = SimulationAnalytics.from_events(log["events"], log["frame_data"])
+
+    # Restore IDs and RNG state last: building the entities above consumed IDs and random draws
+    BaseEntity._next_id = metadata["next_id"]
+    sim.vision_scheduler.arrivals = metadata.get("vision_arrivals", 0)
+    sim.rng.set_state(metadata["rng"])
+    activate_streams(sim.rng)
+    return sim
+
+
+class CheckpointWriter:
+    """Writes periodic checkpoints on a background thread
+
+    The snapshot is taken on the caller's thread so the world is consistent; only
+    serialization and disk I/O run in the background. A request is skipped while the
+    previous write is still in progress.
+    """
+
+    def __init__(self, path: str = "checkpoint.npz"):
+        self.path = path
+        self._thread: Optional[threading.Thread] = None
+        self.checkpoints_written = 0
+        self.last_write_seconds = 0.0
+
+    @property
+    def busy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def save_async(self, sim: Simulation) -> bool:
+        if self.busy:
+            return False
+        with get_tracer().trace("checkpoint_snapshot", args={"entities": len(sim.entities)}):
+            snapshot = snapshot_world(sim)
+        self._thread = threading.Thread(target=self._write, args=(snapshot,), daemon=True,
+                                        name="checkpoint-writer")
+        self._thread.start()
+        return True
+
+    def _write(self, snapshot: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            with get_tracer().trace("checkpoint_write"):
+                write_checkpoint(snapshot, self.path)
+            self.checkpoints_written += 1
+        except Exception as e:
+            print(f"Error writing checkpoint: {e}")
+        self.last_write_seconds = time.perf_counter() - start
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+
+
+def verify_resume(seed: int = 0, checkpoint_frame: int = 400, frames: int = 300,
+                  path: str = "checkpoint.npz") -> Tuple[bool, int]:
+    """Check that a resumed run logs exactly the events of the uninterrupted run
+
+    Returns (match, first differing event index, or -1 when the logs match).
+    """
+    BaseEntity._next_id = 1
+    sim = Simulation(seed=seed)
+    for _ in range(checkpoint_frame):
+        sim.step()
+    save_checkpoint(sim, path)
+    for _ in range(frames):
+        sim.step()
+    expected = sim.simulation_data["events"]
+
+    resumed = load_checkpoint(path)
+    for _ in range(frames):
+        resumed.step()
+    actual = resumed.simulation_data["events"]
+
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return False, i
+    if len(expected) != len(actual):
+        return False, min(len(expected), len(actual))
+    return True, -1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that resuming from a checkpoint reproduces an uninterrupted run')
+    parser.add_argument('--seed', type=int, default=0, help='World seed')
+    parser.add_argument('--checkpoint-frame', type=int, default=400, help='Frame to checkpoint at')
+    parser.add_argument('--frames', type=int, default=300, help='Frames to run after the checkpoint')
+    parser.add_argument('--path', default='checkpoint.npz', help='Where to write the checkpoint')
+    args = parser.parse_args()
+
+    match, index = verify_resume(args.seed, args.checkpoint_frame, args.frames, args.path)
+    if match:
+        print(f"Resume matches the uninterrupted run over {args.frames} frames")
+    else:
+        print(f"Resume diverges from the uninterrupted run at event {index}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Batched Predator-Prey Contacts for Evolution Simulation
+Resolves every hunting predator's contacts for a frame in one Numba kernel: overlap and
+facing tests on all candidate pairs, then deterministic ownership so each prey is eaten
+at most once (nearest hunter wins, ties go to the hunter earlier in the entity list).
+Returns compact eat and reproduce event arrays for the simulation to apply.
+"""
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+from numba import njit
+
+from work_counters import get_work_counters
+
+FACING_HALF_ANGLE = math.radians(60)   # Prey must be within this angle of the heading to be eaten
+CONTACT_RADIUS_FACTOR = 3              # Candidate query radius, in predator radii
+
+
+@njit
+def contact_kernel(hunter_x, hunter_y, hunter_angle, hunter_radius, can_eat, breeds_on_meal,
+                   pair_hunter, pair_prey, prey_x, prey_y, prey_radius,
+                   period_x, period_y, half_x, half_y, cos_facing):
+    """Contact events for a frame
+
+    Pairs must be grouped by hunter in hunter order, each group in candidate order.
+    Returns (eats, reproductions, attempts): eats and reproductions are (n, 2) int32
+    arrays of (hunter, prey) rows in hunter order; a reproducing hunter eats only the
+    prey it reproduced on. attempts counts facing contacts per hunter, won or not.
+
+    Ownership is settled once, before reproduction: other prey a reproducing hunter won
+    are released for the frame rather than offered to the next-nearest facing hunter,
+    so they survive the frame even if another hunter was facing them too.
+    """
+    n_hunters = len(hunter_x)
+    n_pairs = len(pair_hunter)
+    attempts = np.zeros(n_hunters, dtype=np.int32)
+    best_dist = np.full(len(prey_x), np.inf)
+    best_pair = np.full(len(prey_x), -1, dtype=np.int64)
+
+    for k in range(n_pairs):
+        h = pair_hunter[k]
+        p = pair_prey[k]
+        dx = prey_x[p] - hunter_x[h]
+        dy = prey_y[p] - hunter_y[h]
+        dx -= period_x * (dx > half_x) - period_x * (dx < -half_x)   # minimum image
+        dy -= period_y * (dy > half_y) - period_y * (dy < -half_y)
+        dist_sq = dx * dx + dy * dy
+        reach = hunter_radius[h] + prey_radius[p]
+        if dist_sq >= reach * reach:
+            continue
+        # Facing: angle between heading and prey below the half angle, without atan2
+        dist = math.sqrt(dist_sq)
+        if dx * math.cos(hunter_angle[h]) + dy * math.sin(hunter_angle[h]) <= cos_facing * dist:
+            continue
+        attempts[h] += 1
+        if dist_sq < best_dist[p]:   # strict: on ties the earlier hunter keeps the prey
+            best_dist[p] = dist_sq
+            best_pair[p] = k
+
+    eats = np.empty((n_pairs, 2), dtype=np.int32)
+    reproductions = np.empty((n_hunters, 2), dtype=np.int32)
+    n_eats = 0
+    n_reproductions = 0
+    done_hunter = -1   # hunter that reproduced; its remaining prey are left alone
+    first_meal = np.ones(n_hunters, dtype=np.bool_)
+    for k in range(n_pairs):
+        h = pair_hunter[k]
+        p = pair_prey[k]
+        if best_pair[p] != k or h == done_hunter:
+            continue
+        eats[n_eats, 0] = h
+        eats[n_eats, 1] = p
+        n_eats += 1
+        if first_meal[h]:
+            first_meal[h] = False
+            if can_eat[h] and breeds_on_meal[h]:
+                reproductions[n_reproductions, 0] = h
+                reproductions[n_reproductions, 1] = p
+                n_reproductions += 1
+                done_hunter = h
+    return eats[:n_eats], reproductions[:n_reproductions], attempts
+
+
+def resolve_contacts(hunters: List, grid, frame_count: int, skip_ids=()) -> Tuple[List, np.ndarray, np.ndarray, np.ndarray]:
+    """Gather each hunter's candidate prey from the grid and resolve all contacts at once
+
+    Args:
+        hunters: Predators testing contacts this frame, in entity-list order
+        grid: SpatialGrid-like index (its periodic tuple sets the minimum image)
+        frame_count: Current frame, for the eat cooldown
+        skip_ids: Ids of prey already dead this frame
+
+    Returns:
+        (prey, eats, reproductions, attempts) where event rows index hunters and prey
+    """
+    n = len(hunters)
+    hunter_x = np.empty(n)
+    hunter_y = np.empty(n)
+    hunter_angle = np.empty(n)
+    hunter_radius = np.empty(n)
+    can_eat = np.empty(n, dtype=np.bool_)
+    breeds_on_meal = np.empty(n, dtype=np.bool_)
+    pair_hunter = []
+    pair_prey = []
+    prey = []
+    slots = {}
+    for h, e in enumerate(hunters):
+        hunter_x[h] = e.x
+        hunter_y[h] = e.y
+        hunter_angle[h] = e.angle
+        hunter_radius[h] = e.radius
+        can_eat[h] = e.can_eat(frame_count)
+        breeds_on_meal[h] = e.prey_eaten + 1 >= e.required_eats_to_reproduce
+        for o in grid.get_neighbors(e, radius=e.radius * CONTACT_RADIUS_FACTOR, species="prey"):
+            if o.entity_type != "prey" or o.id in skip_ids:
+                continue
+            slot = slots.get(o.id)
+            if slot is None:
+                slot = slots[o.id] = len(prey)
+                prey.append(o)
+            pair_hunter.append(h)
+            pair_prey.append(slot)
+
+    work = get_work_counters()
+    if work.enabled:
+        work.contact_checks += len(pair_hunter)
+    period_x, period_y, half_x, half_y = grid.periodic
+    eats, reproductions, attempts = contact_kernel(
+        hunter_x, hunter_y, hunter_angle, hunter_radius, can_eat, breeds_on_meal,
+        np.array(pair_hunter, dtype=np.int32), np.array(pair_prey, dtype=np.int32),
+        np.array([p.x for p in prey], dtype=np.float64), np.array([p.y for p in prey], dtype=np.float64),
+        np.array([p.radius for p in prey], dtype=np.float64),
+        float(period_x), float(period_y), float(half_x), float(half_y), math.cos(FACING_HALF_ANGLE)
+    )
+    return prey, eats, reproductions, attempts
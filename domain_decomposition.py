@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+Spatial Domain Decomposition for Evolution Simulation
+Splits one world into rectangular tiles aligned to SpatialGrid cells. Each tile is
+owned by a worker process that runs vision, movement and eating for its entities.
+Every frame the tiles exchange through shared memory:
+  - positions of all owned entities, from which each tile builds "ghosts" for the
+    halo band (as wide as the largest view range) around its own cells; the band wraps
+    around the world edges, and ghosts keep their true positions because the local grid
+    and distance checks are already periodic
+  - claims on ghost prey eaten by a local predator, plus the ids of each tile's own
+    prey that died this frame; every tile settles claims with the same rule (a prey
+    that died at its owner is lost to all claimants, otherwise the lowest claiming tile
+    wins), so the owner kills the prey once and only the winning predator is credited
+  - entities that crossed a tile border (full state, re-created by the new owner)
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+import warnings
+from multiprocessing import Barrier, Process, Queue
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+import entities.prey as prey_module
+import entities.predator as predator_module
+from entities.base_entity import BaseEntity
+from entities.prey import Prey
+from entities.predator import Predator
+from genome import (encode_genome, decode_genome, max_genome_size, MAX_PREDATOR_BRAIN_SHAPE,
+                    STATE_FIELDS, INT_STATE_FIELDS, FITNESS_FIELDS)
+from simulation import (Simulation, WORLD_WIDTH, WORLD_HEIGHT, MAX_PREY,
+                        GRID_CELL_SIZE, NUM_STARTING_PREY, NUM_STARTING_PREDATORS, WRAP_WORLD)
+from rng import RandomStreams
+from simulation_analytics import SimulationAnalytics
+from vision_utils import HIT_NONE, HIT_PREDATOR, HIT_PREY
+
+BARRIER_TIMEOUT_SECONDS = 600
+ID_STRIDE = 10_000_000           # Entity IDs minted by tile t start at t * ID_STRIDE + 1
+POSITION_FIELDS = 5              # [id, x, y, radius, type]
+KILL_CAPACITY = 256              # Ghost prey claims per tile per frame (excess claims are withdrawn)
+MIGRANT_CAPACITY = 256           # Border crossings per tile per frame (overflow waits a frame)
+MAX_RAYS = MAX_PREDATOR_BRAIN_SHAPE[0] - 3
+
+TYPE_CODES = {"prey": HIT_PREY, "predator": HIT_PREDATOR}
+HIT_CODES = {"none": HIT_NONE, "predator": HIT_PREDATOR, "prey": HIT_PREY}
+HIT_NAMES = {code: name for name, code in HIT_CODES.items()}
+
+# Migrant record: [dest_tile, id, parent_id, state..., fitness..., num_rays, vision..., hits..., genome...]
+STATE_OFFSET = 3
+FITNESS_OFFSET = STATE_OFFSET + len(STATE_FIELDS)
+RAYS_OFFSET = FITNESS_OFFSET + len(FITNESS_FIELDS)
+VISION_OFFSET = RAYS_OFFSET + 1
+HITS_OFFSET = VISION_OFFSET + MAX_RAYS
+GENOME_OFFSET = HITS_OFFSET + MAX_RAYS
+
+
+def migrant_record_size() -> int:
+    return GENOME_OFFSET + max_genome_size()
+
+
+class TileBuffers:
+    """Shared-memory exchange buffers for all tiles"""
+
+    def __init__(self, num_tiles: int, position_capacity: int, names: Tuple[str, ...] = None):
+        self.shapes = {
+            "counts": ((num_tiles, 5), np.int64),       # [entities, prey, kills, migrants, prey deaths]
+            "positions": ((num_tiles, position_capacity, POSITION_FIELDS), np.float64),
+            "kills": ((num_tiles, KILL_CAPACITY), np.int64),
+            # A tile cannot lose more prey in a frame than it publishes positions for
+            "prey_deaths": ((num_tiles, position_capacity), np.int64),
+            "migrants": ((num_tiles, MIGRANT_CAPACITY, migrant_record_size()), np.float64),
+        }
+        self.blocks = {}
+        self.arrays = {}
+        for i, (key, (shape, dtype)) in enumerate(self.shapes.items()):
+            if names is None:
+                size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+                block = SharedMemory(create=True, size=size)
+            else:
+                block = SharedMemory(name=names[i])
+            self.blocks[key] = block
+            self.arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(block.name for block in self.blocks.values())
+
+    def close(self):
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+
+    def unlink(self):
+        for block in self.blocks.values():
+            block.unlink()
+
+
+class TileLayout:
+    """Tile bounds in SpatialGrid cell units, with the halo each tile needs"""
+
+    def __init__(self, width: int, height: int, cell_size: int, tiles_x: int, tiles_y: int, halo: float,
+                 wrap: bool = WRAP_WORLD):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cols = math.ceil(width / cell_size)
+        self.rows = math.ceil(height / cell_size)
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_y
+        self.tile_cols = math.ceil(self.cols / tiles_x)
+        self.tile_rows = math.ceil(self.rows / tiles_y)
+        self.wrap = wrap
+        # Across a wrapped edge the last, partial cell is narrower: allow one cell of slack
+        partial = width % cell_size or height % cell_size
+        self.halo_cells = math.ceil(halo / cell_size) + (1 if wrap and partial else 0)
+
+    @property
+    def num_tiles(self) -> int:
+        return self.tiles_x * self.tiles_y
+
+    def tile_of(self, x: float, y: float) -> int:
+        tx = min(int(x // self.cell_size) // self.tile_cols, self.tiles_x - 1)
+        ty = min(int(y // self.cell_size) // self.tile_rows, self.tiles_y - 1)
+        return ty * self.tiles_x + tx
+
+    def halo_cell_bounds(self, tile: int) -> Tuple[int, int, int, int]:
+        """Inclusive (min_cx, max_cx, min_cy, max_cy) of the tile's cells grown by the halo"""
+        tx, ty = tile % self.tiles_x, tile // self.tiles_x
+        return (tx * self.tile_cols - self.halo_cells, (tx + 1) * self.tile_cols - 1 + self.halo_cells,
+                ty * self.tile_rows - self.halo_cells, (ty + 1) * self.tile_rows - 1 + self.halo_cells)
+
+    def halo_mask(self, tile: int, cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+        """Which cells (arrays of cell coordinates) fall in the tile's halo, wrapping around the world edges"""
+        min_cx, max_cx, min_cy, max_cy = self.halo_cell_bounds(tile)
+        if self.wrap:
+            return ((cx - min_cx) % self.cols <= max_cx - min_cx) & ((cy - min_cy) % self.rows <= max_cy - min_cy)
+        return (cx >= min_cx) & (cx <= max_cx) & (cy >= min_cy) & (cy <= max_cy)
+
+
+class TileSimulation(Simulation):
+    """Simulation of the entities owned by one tile, with halo ghosts from its neighbours"""
+
+    def __init__(self, tile: int, layout: TileLayout, buffers: TileBuffers, barrier,
+                 global_max_prey: int, **kwargs):
+        super().__init__(layout.width, layout.height, num_prey=0, num_predators=0,
+                         grid_cell_size=layout.cell_size, max_prey=global_max_prey, **kwargs)
+        self.tile = tile
+        self.layout = layout
+        self.buffers = buffers
+        self.barrier = barrier
+        self.global_max_prey = global_max_prey
+        self.ghosts = {}              # id -> ghost entity in the local grid
+        self.pending_kills = []       # ghost prey claimed by local hunters this frame
+        self.deferred_hunts = []      # (hunter, attempts, eaten, reproduced, claims) waiting on claims
+        self.local_prey_deaths = []   # ids of owned prey that died this frame
+        self.migrations = 0
+
+    def step(self):
+        self.publish_positions()
+        self.barrier.wait(BARRIER_TIMEOUT_SECONDS)
+        self.sync_ghosts()
+
+        super().step()
+
+        self.publish_kills_and_migrants()
+        self.barrier.wait(BARRIER_TIMEOUT_SECONDS)
+        self.adopt_migrants()
+        won = self.apply_remote_kills()
+        self.settle_hunts(won)
+
+    def apply_hunt(self, e, attempts, eaten, reproduced, removed_prey, new_entities) -> int:
+        ghosts = [p.id for p in eaten if p.id in self.ghosts]
+        if not ghosts:
+            return super().apply_hunt(e, attempts, eaten, reproduced, removed_prey, new_entities)
+        # Owned prey die now (the owner always keeps its own prey); crediting the hunter
+        # waits until every tile's claims on the ghosts are known
+        removed_prey.extend(p for p in eaten if p.id not in self.ghosts)
+        self.pending_kills.extend(ghosts)
+        self.deferred_hunts.append((e, attempts, eaten, reproduced, set(ghosts)))
+        return 0
+
+    def remove_dead_prey(self, prey):
+        self.local_prey_deaths.append(prey.id)
+        super().remove_dead_prey(prey)
+
+    def publish_positions(self):
+        positions = self.buffers.arrays["positions"][self.tile]
+        n = len(self.entities)
+        if n > len(positions):
+            raise RuntimeError(f"tile {self.tile} owns {n} entities but the position buffer holds "
+                               f"{len(positions)}; raise position_capacity in run_decomposed")
+        for i in range(n):
+            e = self.entities[i]
+            positions[i] = (e.id, e.x, e.y, e.radius, TYPE_CODES[e.entity_type])
+        counts = self.buffers.arrays["counts"]
+        counts[self.tile, 0] = n
+        counts[self.tile, 1] = len(self.prey_list)
+
+    def sync_ghosts(self):
+        """Refresh ghost entities for everything other tiles own inside this tile's halo"""
+        counts = self.buffers.arrays["counts"]
+        positions = self.buffers.arrays["positions"]
+        cell_size = self.layout.cell_size
+
+        # Share the remaining global prey headroom between tiles so births cannot overshoot MAX_PREY
+        global_prey = int(counts[:, 1].sum())
+        headroom = max(0, self.global_max_prey - global_prey)
+        self.max_prey = len(self.prey_list) + headroom // self.layout.num_tiles
+
+        seen = set()
+        for other in range(self.layout.num_tiles):
+            if other == self.tile:
+                continue
+            block = positions[other, :counts[other, 0]]
+            cx = block[:, 1] // cell_size
+            cy = block[:, 2] // cell_size
+            in_halo = self.layout.halo_mask(self.tile, cx, cy)
+            for entity_id, x, y, radius, type_code in block[in_halo]:
+                entity_id = int(entity_id)
+                seen.add(entity_id)
+                ghost = self.ghosts.get(entity_id)
+                if ghost is None:
+                    ghost = self._make_ghost(entity_id, int(type_code), radius)
+                    ghost.x, ghost.y = x, y
+                    self.ghosts[entity_id] = ghost
+                    self.neighbors.add_entity(ghost)
+                else:
+                    ghost.x, ghost.y = x, y
+                    self.neighbors.update_entity(ghost)
+
+        for entity_id in [i for i in self.ghosts if i not in seen]:
+            self.neighbors.remove_entity(self.ghosts.pop(entity_id))
+
+    @staticmethod
+    def _make_ghost(entity_id: int, type_code: int, radius: float):
+        # Bare instances: vision and eating only read id, position, radius and type
+        cls = Prey if type_code == HIT_PREY else Predator
+        ghost = cls.__new__(cls)
+        ghost.id = entity_id
+        ghost.radius = radius
+        ghost.entity_type = "prey" if type_code == HIT_PREY else "predator"
+        return ghost
+
+    def publish_kills_and_migrants(self):
+        counts = self.buffers.arrays["counts"]
+        if len(self.pending_kills) > KILL_CAPACITY:
+            # Withdrawn claims are never credited, so the prey simply survive
+            warnings.warn(f"tile {self.tile} frame {self.frame_count}: {len(self.pending_kills)} ghost prey "
+                          f"claims exceed KILL_CAPACITY={KILL_CAPACITY}; withdrawing the excess")
+            del self.pending_kills[KILL_CAPACITY:]
+        n_kills = len(self.pending_kills)
+        self.buffers.arrays["kills"][self.tile, :n_kills] = self.pending_kills
+        counts[self.tile, 2] = n_kills
+        n_deaths = len(self.local_prey_deaths)
+        self.buffers.arrays["prey_deaths"][self.tile, :n_deaths] = self.local_prey_deaths
+        counts[self.tile, 4] = n_deaths
+        self.local_prey_deaths.clear()
+
+        records = self.buffers.arrays["migrants"][self.tile]
+        n_migrants = 0
+        waiting = {hunt[0].id for hunt in self.deferred_hunts}
+        for e in list(self.entities):
+            dest = self.layout.tile_of(e.x, e.y)
+            if dest == self.tile or e.id in waiting:   # hunters waiting on claims move next frame
+                continue
+            if n_migrants == MIGRANT_CAPACITY:
+                break
+            encode_migrant(e, dest, records[n_migrants])
+            self.remove_entity(e)
+            n_migrants += 1
+        counts[self.tile, 3] = n_migrants
+        self.migrations += n_migrants
+
+    def adopt_migrants(self):
+        counts = self.buffers.arrays["counts"]
+        migrants = self.buffers.arrays["migrants"]
+        for other in range(self.layout.num_tiles):
+            if other == self.tile:
+                continue
+            for record in migrants[other, :counts[other, 3]]:
+                if int(record[0]) == self.tile:
+                    entity = decode_migrant(record, self.frame_rate)
+                    if entity.id in self.ghosts:
+                        self.neighbors.remove_entity(self.ghosts.pop(entity.id))
+                    self.add_entity(entity)
+
+    def apply_remote_kills(self) -> set:
+        """Kill owned prey claimed by any tile and return the ghost ids this tile won
+
+        Runs after adopt_migrants, so prey that changed owner this frame are found too.
+        """
+        counts = self.buffers.arrays["counts"]
+        kills = self.buffers.arrays["kills"]
+        prey_deaths = self.buffers.arrays["prey_deaths"]
+        dead = set()
+        for other in range(self.layout.num_tiles):
+            dead.update(prey_deaths[other, :counts[other, 4]].tolist())
+        owned = {e.id: e for e in self.prey_list}
+        winner = {}
+        for other in range(self.layout.num_tiles):   # tile order: the lowest claimant wins
+            for prey_id in kills[other, :counts[other, 2]].tolist():
+                if prey_id in dead:
+                    continue
+                winner.setdefault(prey_id, other)
+                prey = owned.pop(prey_id, None)
+                if prey is not None:
+                    super().remove_dead_prey(prey)
+        return {prey_id for prey_id, tile in winner.items() if tile == self.tile}
+
+    def settle_hunts(self, won: set):
+        """Credit deferred hunters with the owned prey and the ghost claims they won"""
+        if not self.deferred_hunts:
+            return
+        new_entities = []
+        deaths = 0
+        for e, attempts, eaten, reproduced, claims in self.deferred_hunts:
+            eaten = [p for p in eaten if p.id not in claims or p.id in won]
+            outcome, target = e.finish_hunt(self.frame_count, attempts, eaten, reproduced and bool(eaten))
+            if outcome == "eat":
+                # The prey are already gone, so log the hunt here rather than through apply_predator_outcome
+                self.log_event([self.frame_count, "hunt", e.id, e.generation, len(target)])
+            else:
+                deaths += self.apply_predator_outcome(e, outcome, target, [], new_entities)
+        self.deferred_hunts.clear()
+        self.births_last_step += len(new_entities)
+        self.deaths_last_step += deaths
+        self.add_births(new_entities)
+
+
+def encode_migrant(entity, dest: int, out: np.ndarray):
+    """Pack an entity's genome and dynamic state into a migrant record"""
+    out[:STATE_OFFSET] = (dest, entity.id, getattr(entity, "parent_id", -1) or -1)
+    for i, field in enumerate(STATE_FIELDS):
+        out[STATE_OFFSET + i] = getattr(entity, field, 0)
+    for i, field in enumerate(FITNESS_FIELDS):
+        out[FITNESS_OFFSET + i] = entity.fitness_stats.get(field, 0)
+    num_rays = len(entity.vision)
+    out[RAYS_OFFSET] = num_rays
+    out[VISION_OFFSET:VISION_OFFSET + num_rays] = entity.vision
+    out[HITS_OFFSET:HITS_OFFSET + num_rays] = [HIT_CODES[h] for h in entity.vision_hits]
+    encode_genome(entity, out[GENOME_OFFSET:])
+
+
+def decode_migrant(record: np.ndarray, frame_rate: int):
+    """Re-create an entity (same id, state and genome) from a migrant record"""
+    entity = decode_genome(record[GENOME_OFFSET:], 0.0, 0.0, frame_rate)
+    entity.id = int(record[1])
+    parent_id = int(record[2])
+    if parent_id >= 0:
+        entity.parent_id = parent_id
+    for i, field in enumerate(STATE_FIELDS):
+        if hasattr(entity, field):
+            value = record[STATE_OFFSET + i]
+            setattr(entity, field, int(value) if field in INT_STATE_FIELDS else float(value))
+    entity.is_moving = bool(entity.is_moving)
+    for i, field in enumerate(FITNESS_FIELDS):
+        if field in entity.fitness_stats:
+            entity.fitness_stats[field] = int(record[FITNESS_OFFSET + i])
+    num_rays = int(record[RAYS_OFFSET])
+    entity.vision = list(record[VISION_OFFSET:VISION_OFFSET + num_rays].astype(np.float32))
+    entity.vision_hits = [HIT_NAMES[int(h)] for h in record[HITS_OFFSET:HITS_OFFSET + num_rays]]
+    return entity
+
+
+def spawn_positions(seed: int, width: int, height: int, num_prey: int, num_predators: int):
+    """Initial positions drawn exactly as Simulation.__init__ places the starting population"""
+    rng = RandomStreams(seed)["world"]
+    prey = [(rng.randint(100, width - 100), rng.randint(100, height - 100)) for _ in range(num_prey)]
+    predators = [(rng.randint(100, min(1100, width - 100)), rng.randint(100, min(700, height - 100)))
+                 for _ in range(num_predators)]
+    return prey, predators
+
+
+def run_tile(tile: int, layout: TileLayout, buffer_names: Tuple[str, ...], position_capacity: int,
+             barrier, results: Queue, frames: int, seed: int, num_prey: int, num_predators: int,
+             max_prey: int, output_dir: str):
+    """Tile worker process: own the entities inside one tile and step them in lockstep"""
+    buffers = TileBuffers(layout.num_tiles, position_capacity, buffer_names)
+    try:
+        prey_positions, predator_positions = spawn_positions(seed, layout.width, layout.height,
+                                                             num_prey, num_predators)
+        BaseEntity._next_id = tile * ID_STRIDE + 1
+
+        sim = TileSimulation(tile, layout, buffers, barrier, max_prey, seed=seed + 1 + tile)
+        for cls, positions in ((Prey, prey_positions), (Predator, predator_positions)):
+            for x, y in positions:
+                if layout.tile_of(x, y) == tile:
+                    entity = cls(x, y, generation=0, frame_rate=sim.frame_rate)
+                    entity.fitness_stats['birth_frame'] = 0
+                    sim.add_entity(entity)
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            sim.step()
+        elapsed = time.perf_counter() - start
+
+        tile_log = os.path.join(output_dir, f"tile_{tile}_log.json")
+        sim.save_simulation_data(tile_log)
+        results.put({
+            "tile": tile,
+            "log_file": tile_log,
+            "frames": frames,
+            "elapsed_seconds": elapsed,
+            "steps_per_second": frames / elapsed if elapsed > 0 else 0,
+            "prey_count": len(sim.prey_list),
+            "predator_count": len(sim.predators),
+            "migrations_out": sim.migrations
+        })
+    except BaseException as e:
+        barrier.abort()
+        error = "tile barrier broken" if isinstance(e, BrokenBarrierError) else repr(e)
+        results.put({"tile": tile, "error": error})
+        raise
+    finally:
+        buffers.close()
+
+
+def merge_tile_logs(tile_logs: List[str]) -> Dict[str, Any]:
+    """Merge per-tile event logs and frame data into one simulation_log.json layout"""
+    merged_events = []
+    frames = {}
+    start_time = None
+    for path in tile_logs:
+        with open(path, "r") as f:
+            data = json.load(f)
+        start_time = data["start_time"] if start_time is None else min(start_time, data["start_time"])
+        merged_events.extend(data["events"])
+        for fd in data["frame_data"]:
+            entry = frames.setdefault(fd["frame"], {
+                "frame": fd["frame"], "time_seconds": fd["time_seconds"],
+                "populations": {"prey_count": 0, "predator_count": 0},
+                "generations": {"prey_avg": 0.0, "prey_max": 0, "predator_avg": 0.0, "predator_max": 0}
+            })
+            pops, gens = fd["populations"], fd["generations"]
+            entry["populations"]["prey_count"] += pops["prey_count"]
+            entry["populations"]["predator_count"] += pops["predator_count"]
+            # Accumulate weighted sums; turned into averages below
+            entry["generations"]["prey_avg"] += gens["prey_avg"] * pops["prey_count"]
+            entry["generations"]["predator_avg"] += gens["predator_avg"] * pops["predator_count"]
+            entry["generations"]["prey_max"] = max(entry["generations"]["prey_max"], gens["prey_max"])
+            entry["generations"]["predator_max"] = max(entry["generations"]["predator_max"], gens["predator_max"])
+
+    frame_data = [frames[f] for f in sorted(frames)]
+    for entry in frame_data:
+        pops, gens = entry["populations"], entry["generations"]
+        gens["prey_avg"] = gens["prey_avg"] / pops["prey_count"] if pops["prey_count"] else 0
+        gens["predator_avg"] = gens["predator_avg"] / pops["predator_count"] if pops["predator_count"] else 0
+
+    merged_events.sort(key=lambda event: event[0])
+    merged = {"start_time": start_time, "frame_data": frame_data, "events": merged_events}
+    merged["summary"] = SimulationAnalytics.from_events(merged_events, frame_data).get_summary()
+    return merged
+
+
+def run_decomposed(tiles_x: int, tiles_y: int, frames: int, width: int = WORLD_WIDTH,
+                   height: int = WORLD_HEIGHT, cell_size: int = GRID_CELL_SIZE,
+                   num_prey: int = NUM_STARTING_PREY, num_predators: int = NUM_STARTING_PREDATORS,
+                   max_prey: int = MAX_PREY, seed: int = 0,
+                   output_dir: str = "decomposed_results") -> Dict[str, Any]:
+    """Run one world split over tiles_x * tiles_y worker processes"""
+    halo = max(prey_module.VIEW_RANGE, predator_module.VIEW_RANGE)
+    layout = TileLayout(width, height, cell_size, tiles_x, tiles_y, halo)
+    # Predators are not capped; leave generous room above the prey cap
+    position_capacity = max_prey + 4 * num_predators + 256
+    buffers = TileBuffers(layout.num_tiles, position_capacity)
+    barrier = Barrier(layout.num_tiles)
+    results = Queue()
+    os.makedirs(output_dir, exist_ok=True)
+
+    wall_start = time.perf_counter()
+    try:
+        processes = [
+            Process(target=run_tile, args=(t, layout, buffers.names, position_capacity, barrier, results,
+                                           frames, seed, num_prey, num_predators, max_prey, output_dir))
+            for t in range(layout.num_tiles)
+        ]
+        for p in processes:
+            p.start()
+        tiles = [results.get() for _ in processes]
+        for p in processes:
+            p.join()
+    finally:
+        buffers.close()
+        buffers.unlink()
+    wall_time = time.perf_counter() - wall_start
+
+    tiles.sort(key=lambda r: r["tile"])
+    report = {
+        "metadata": {
+            "tiles": [tiles_x, tiles_y],
+            "world": [width, height],
+            "cell_size": cell_size,
+            "halo_cells": layout.halo_cells,
+            "frames": frames,
+            "seed": seed,
+            "wall_time_seconds": wall_time,
+            "steps_per_second": frames / wall_time if wall_time > 0 else 0
+        },
+        "tiles": tiles
+    }
+    if not any("error" in t for t in tiles):
+        merged = merge_tile_logs([t["log_file"] for t in tiles])
+        with open(os.path.join(output_dir, "simulation_log.json"), "w") as f:
+            json.dump(merged, f, indent=2)
+        report["summary"] = merged["summary"]
+    with open(os.path.join(output_dir, "decomposition_results.json"), "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run one world split into tiles across worker processes')
+    parser.add_argument('--tiles', default='2x1', help='Tile layout as COLSxROWS (default 2x1)')
+    parser.add_argument('--frames', type=int, default=3600, help='Frames to simulate')
+    parser.add_argument('--width', type=int, default=WORLD_WIDTH, help='World width')
+    parser.add_argument('--height', type=int, default=WORLD_HEIGHT, help='World height')
+    parser.add_argument('--prey', type=int, default=NUM_STARTING_PREY, help='Starting prey')
+    parser.add_argument('--predators', type=int, default=NUM_STARTING_PREDATORS, help='Starting predators')
+    parser.add_argument('--max-prey', type=int, default=MAX_PREY, help='Global prey cap')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for placement and tile RNGs')
+    parser.add_argument('--output-dir', default='decomposed_results', help='Directory for logs')
+    args = parser.parse_args()
+
+    tiles_x, tiles_y = (int(v) for v in args.tiles.lower().split('x'))
+    report = run_decomposed(tiles_x, tiles_y, args.frames, args.width, args.height,
+                            num_prey=args.prey, num_predators=args.predators,
+                            max_prey=args.max_prey, seed=args.seed, output_dir=args.output_dir)
+
+    print(f"\n=== Domain Decomposition Summary ===")
+    for tile in report["tiles"]:
+        if "error" in tile:
+            print(f"Tile {tile['tile']}: error {tile['error']}")
+            continue
+        print(f"Tile {tile['tile']}: {tile['steps_per_second']:.1f} steps/s, prey={tile['prey_count']} "
+              f"predators={tile['predator_count']}, migrations out={tile['migrations_out']}")
+    print(f"World throughput: {report['metadata']['steps_per_second']:.1f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 import pygame
 import math
-import random
 from entities.neural_network import NeuralNetwork
 from vision_utils import raycast_batch, raycast_batch_optimized, HIT_NONE, HIT_PREDATOR, HIT_PREY
 from sprite_cache import get_sprite_cache
+from rng import get_rng
+from work_counters import get_work_counters
+from vision_scheduler import VISION_UNSCHEDULED
+from spatial_grid import NO_WRAP
 
 HIT_TYPE_MAP = {
     HIT_PREDATOR: "predator",
@@ -13,16 +16,63 @@ HIT_TYPE_MAP = {
 
 import numpy as np
 
+# Draw detail levels (BaseEntity.draw_detail), lowered by the adaptive quality controller
+DRAW_DETAIL_BODY = 0      # body sprite only
+DRAW_DETAIL_EYES = 1      # body and eyes
+DRAW_DETAIL_FULL = 2      # body, eyes and trait overlays
+
+def draw_body(surface, entity_type, color, radius, x, y, angle, stretch, eyes=True):
+    """Draw an entity's stretched body sprite and eyes (shared by live drawing and replays)"""
+    width = radius * 2 * stretch
+    height = radius * 2 / stretch
+
+    sprite_cache = get_sprite_cache()
+    cached_sprite = sprite_cache.get_sprite(
+        entity_type=entity_type,
+        color=color,
+        width=int(width),
+        height=int(height),
+        angle=angle
+    )
+
+    rect = cached_sprite.get_rect(center=(x, y))
+    surface.blit(cached_sprite, rect)
+    work = get_work_counters()
+    if work.enabled:
+        work.sprite_blits += 1
+    if not eyes:
+        return
+
+    # === EYE RENDERING ===
+    eye_offset_angle = math.pi / 6  # separation between eyes
+    eye_distance = radius * 0.8
+    eye_radius = 4
+    pupil_radius = 2
+
+    for side in (-1, 1):  # left and right
+        eye_angle = angle + side * eye_offset_angle
+        eye_x = x + math.cos(eye_angle) * eye_distance
+        eye_y = y + math.sin(eye_angle) * eye_distance
+
+        # Sclera
+        pygame.draw.circle(surface, (255, 255, 255), (int(eye_x), int(eye_y)), eye_radius)
+
+        # Pupil (centered for now)
+        pygame.draw.circle(surface, (0, 0, 0), (int(eye_x), int(eye_y)), pupil_radius)
+
+
 class BaseEntity:
     _next_id = 1  # Class variable for unique IDs
+    draw_detail = DRAW_DETAIL_FULL  # Shared draw detail level (see DRAW_DETAIL_*)
 
     def __init__(self, x, y, entity_type="unknown"):
         self.id = BaseEntity._next_id
         BaseEntity._next_id += 1
         self.x = x
         self.y = y
-        self.angle = random.uniform(0, 2 * math.pi)
+        self.angle = get_rng("spawn").uniform(0, 2 * math.pi)
         self.last_avoid_frame = 0
+        self.last_vision_frame = VISION_UNSCHEDULED
         self.max_speed = 2.5
         self.stop_timer = 0
         self.move_timer = 0
@@ -55,13 +105,14 @@ class BaseEntity:
             self.move_timer -= 1
             if self.move_timer <= 0:
                 self.is_moving = False
-                self.stop_timer = random.randint(30, 100)
+                self.stop_timer = get_rng("movement").randint(30, 100)
         else:
             self.stop_timer -= 1
             if self.stop_timer <= 0:
                 self.is_moving = True
-                self.angle = random.uniform(0, 2 * math.pi)
-                self.move_timer = random.randint(60, 180)
+                rng = get_rng("movement")
+                self.angle = rng.uniform(0, 2 * math.pi)
+                self.move_timer = rng.randint(60, 180)
 
     def _update_softbody_stretch(self):
         # Early out if not moving
@@ -73,43 +124,16 @@ class BaseEntity:
         self.stretch += (target_stretch - self.stretch) * 0.2  # easing factor
 
     def draw(self, surface, selected=False):
-        width = self.radius * 2 * self.stretch
-        height = self.radius * 2 / self.stretch
-
-        sprite_cache = get_sprite_cache()
-        cached_sprite = sprite_cache.get_sprite(
-            entity_type=self.entity_type,
-            color=self.color,
-            width=int(width),
-            height=int(height),
-            angle=self.angle
-        )
-        
-        rect = cached_sprite.get_rect(center=(self.x, self.y))
-        surface.blit(cached_sprite, rect)
-
-        # === EYE RENDERING ===
-        eye_offset_angle = math.pi / 6  # separation between eyes
-        eye_distance = self.radius * 0.8
-        eye_radius = 4
-        pupil_radius = 2
-
-        for side in (-1, 1):  # left and right
-            eye_angle = self.angle + side * eye_offset_angle
-            eye_x = self.x + math.cos(eye_angle) * eye_distance
-            eye_y = self.y + math.sin(eye_angle) * eye_distance
-
-            # Sclera
-            pygame.draw.circle(surface, (255, 255, 255), (int(eye_x), int(eye_y)), eye_radius)
-
-            # Pupil (centered for now)
-            pygame.draw.circle(surface, (0, 0, 0), (int(eye_x), int(eye_y)), pupil_radius)
+        detail = BaseEntity.draw_detail
+        draw_body(surface, self.entity_type, self.color, self.radius,
+                  self.x, self.y, self.angle, self.stretch, eyes=detail >= DRAW_DETAIL_EYES or selected)
 
         # Draw vision rays
         if selected:
             self.draw_vision_rays(surface)
 
-        self.draw_overlay(surface) 
+        if detail >= DRAW_DETAIL_FULL:
+            self.draw_overlay(surface)
 
 
     def draw_vision_rays(self, surface):
@@ -136,15 +160,19 @@ class BaseEntity:
             pygame.draw.line(surface, color, (self.x, self.y), (end_x, end_y), 1)
 
 
-    def cast_vision(self, others):
-
+    def cast_vision(self, others, periodic=NO_WRAP):
+        """Cast rays against others; periodic is the grid's wrap tuple, so targets across an edge are seen at their nearest image"""
         other_positions = np.empty((len(others), 2), dtype=np.float32)
         other_radii = np.empty(len(others), dtype=np.float32)
         other_types = np.empty(len(others), dtype=np.int32)
+        period_x, period_y, half_x, half_y = periodic
+        x, y = self.x, self.y
 
         for i, o in enumerate(others):
-            other_positions[i, 0] = o.x
-            other_positions[i, 1] = o.y
+            dx = o.x - x
+            dy = o.y - y
+            other_positions[i, 0] = o.x - (period_x * (dx > half_x) - period_x * (dx < -half_x))
+            other_positions[i, 1] = o.y - (period_y * (dy > half_y) - period_y * (dy < -half_y))
             other_radii[i] = o.radius
             if o.entity_type == "predator":
                 other_types[i] = HIT_PREDATOR
@@ -156,10 +184,13 @@ class BaseEntity:
         detect_predator = self.entity_type == "prey"
         detect_prey = self.entity_type == "predator"
 
+        work = get_work_counters()
+        if work.enabled:
+            work.ray_pairs += self.num_rays * len(others)
         vision_raw, hits_raw = raycast_batch_optimized(
             self.x, self.y, self.angle, self.fov, self.view_range,
             self.num_rays, other_positions, other_radii, other_types,
-            detect_predator, detect_prey
+            detect_predator, detect_prey, work.get_kernel_counters()
         )
 
         self.vision = vision_raw
@@ -167,40 +198,6 @@ class BaseEntity:
 
 
 
-    def resolve_collisions(self, others, push_strength=0.05, max_push=0.8):
-        return
-        # if self.last_collision_frame > 0:
-        #     self.last_collision_frame -= 1
-        #     return
-        # self.last_collision_frame = 5
-
-        # if hasattr(self, "settling_timer") and self.settling_timer > 0:
-        #     return
-        # for other in others:
-        #     if other is self:
-        #         continue
-        #     if type(self) != type(other):  # 🔒 skip predator-prey collisions
-        #         continue
-        #     dx = self.x - other.x
-        #     dy = self.y - other.y
-        #     dist_sq = dx * dx + dy * dy
-        #     overlap = 0
-        #     radius_sum = self.radius + other.radius
-        #     if dist_sq < radius_sum * radius_sum:
-        #         dist = math.sqrt(dist_sq)
-        #         overlap = radius_sum - dist
-
-        #     if overlap > 0 and dist > 0:
-        #         push_amount = min(overlap * push_strength, max_push)
-        #         if push_amount < 0.05:
-        #             continue
-        #         push_x = (dx / dist) * (push_amount / 2)
-        #         push_y = (dy / dist) * (push_amount / 2)
-        #         self.x += push_x
-        #         self.y += push_y
-        #         other.x -= push_x
-        #         other.y -= push_y
-
     def draw_overlay(self, surface):
         pass
         
@@ -1,4 +1,5 @@
 import numpy as np
+from rng import get_rng
 
 class NeuralNetwork:
     def __init__(self, input_size, hidden_size=14, output_size=2):
@@ -7,11 +8,12 @@ class NeuralNetwork:
         self.output_size = output_size
 
         # Xavier init
-        self.w1 = np.random.randn(hidden_size, input_size) * np.sqrt(1 / input_size)
+        rng = get_rng("brain")
+        self.w1 = rng.standard_normal((hidden_size, input_size)) * np.sqrt(1 / input_size)
         self.b1 = np.zeros((hidden_size, 1))
-        self.w2 = np.random.randn(output_size, hidden_size) * np.sqrt(1 / hidden_size)
+        self.w2 = rng.standard_normal((output_size, hidden_size)) * np.sqrt(1 / hidden_size)
         # self.b2 = np.zeros((output_size, 1))
-        self.b2 = np.random.randn(output_size, 1) * 0.01
+        self.b2 = rng.standard_normal((output_size, 1)) * 0.01
         
 
     def activate(self, x):
@@ -35,6 +37,7 @@ class NeuralNetwork:
         else:
             adaptive_rate = mutation_rate * 0.7  # 0.7x rate for fine-tuning
             
+        rng = get_rng("brain")
         new_input_size = num_rays if num_rays is not None else self.input_size
         clone = NeuralNetwork(new_input_size, self.hidden_size, self.output_size)
 
@@ -44,13 +47,13 @@ class NeuralNetwork:
         clone.w1[:, :min_inputs] = self.w1[:, :min_inputs]
         if new_input_size > self.input_size:
             # Initialize new input weights randomly for expanded inputs
-            clone.w1[:, min_inputs:] = np.random.randn(self.hidden_size, new_input_size - min_inputs) * np.sqrt(1 / new_input_size)
+            clone.w1[:, min_inputs:] = rng.standard_normal((self.hidden_size, new_input_size - min_inputs)) * np.sqrt(1 / new_input_size)
         
         # Apply mutations to all layers
-        w1_mutations = np.random.randn(*clone.w1.shape) * adaptive_rate
-        b1_mutations = np.random.randn(*self.b1.shape) * adaptive_rate
-        w2_mutations = np.random.randn(*self.w2.shape) * adaptive_rate
-        b2_mutations = np.random.randn(*self.b2.shape) * adaptive_rate
+        w1_mutations = rng.standard_normal(clone.w1.shape) * adaptive_rate
+        b1_mutations = rng.standard_normal(self.b1.shape) * adaptive_rate
+        w2_mutations = rng.standard_normal(self.w2.shape) * adaptive_rate
+        b2_mutations = rng.standard_normal(self.b2.shape) * adaptive_rate
         
         clone.w1 = clone.w1 + w1_mutations
         clone.b1 = self.b1 + b1_mutations
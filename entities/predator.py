@@ -1,9 +1,9 @@
 import math
 import pygame
-import random
 from entities.base_entity import BaseEntity
 from entities.neural_network import NeuralNetwork
 from utils import hue_shifted_color, sanitize_color
+from rng import get_rng
 
 # Import centralized frame rate constant
 import sys
@@ -22,6 +22,7 @@ STARVATION_THRESHOLD_SECONDS = 12
 STARTING_ENERGY = 100
 MAX_ENERGY = 100
 ENERGY_BURN_RATE = 0.15
+VIEW_RANGE = 250
 
 
 def adaptive_mutation_probability(base_prob, generation):
@@ -47,7 +48,7 @@ class Predator(BaseEntity):
         self.fitness_stats['hunt_attempts'] = 0
         self.frame_rate = frame_rate
         self.fov = math.radians(90)
-        self.view_range = 250
+        self.view_range = VIEW_RANGE
         self.color = (255, 80, 80)
         self.radius = 12
         self.generation = generation
@@ -82,7 +83,7 @@ class Predator(BaseEntity):
         self._screen_height = None 
 
 
-    def update(self, frame_count, grid):
+    def update(self, frame_count):
         self.age += 1
         # Optimize vision processing with single pass
         prey_hits = 0
@@ -131,67 +132,62 @@ class Predator(BaseEntity):
         self.energy -= self.energy_burn_base * (30.0 / self.frame_rate)
         self.energy = max(0, self.energy)
 
-        # Skip collision detection if barely moving and not hunting
+        # Skip contact tests if barely moving and not hunting; hunters' contacts are
+        # resolved for all predators at once by the simulation (see contacts.py)
         if frame_count % 2 == 0 and (self.speed > 0.5 or sees_prey):
-            eaten = []
-            nearby_entities = grid.get_neighbors(self, radius=self.radius * 3)
-            
-            for entity in nearby_entities:
-                if entity.entity_type != "prey":
-                    continue
-                prey = entity
-                dx = prey.x - self.x
-                dy = prey.y - self.y
-                dist_sq = dx * dx + dy * dy
-                
-                # Early distance check using squared distance (faster)
-                if dist_sq < (self.radius + prey.radius) ** 2:
-                    # Only calculate angle if within collision distance
-                    angle_to_prey = math.atan2(dy, dx)
-                    angle_diff = (angle_to_prey - self.angle + math.pi) % (2 * math.pi) - math.pi
-                    facing_prey = abs(angle_diff) < math.radians(60)
-
-                    if facing_prey:
-                        self.fitness_stats['hunt_attempts'] += 1
-                        
-                        if frame_count - self.last_eat_time > self.eat_cooldown_frames:
-                            self.prey_eaten += 1
-                            self.last_eat_time = frame_count
-                            self.time_since_last_meal = 0
-                            self.energy = min(self.energy + 30, self.max_energy)
-                            
-                            self.fitness_stats['prey_caught'] += 1
-
-                            if self.prey_eaten >= self.required_eats_to_reproduce:
-                                self.prey_eaten = 0
-                                self.record_reproduction()
-                                return "reproduce", prey
-
-                        eaten.append(prey)
-
-            if eaten:
-                return "eat", eaten
-
+            return "hunt", None
+
+        return self.check_starvation()
+
+    def can_eat(self, frame_count):
+        """Whether the eat cooldown has passed, so a meal now counts toward energy and reproduction"""
+        return frame_count - self.last_eat_time > self.eat_cooldown_frames
+
+    def finish_hunt(self, frame_count, attempts, eaten, reproduced):
+        """Apply this frame's contact results from contacts.resolve_contacts
+
+        Args:
+            attempts: Facing contacts, including prey another predator won
+            eaten: Prey this predator ate, in contact order
+            reproduced: Whether the first meal completed a reproduction (eaten holds just that prey)
+        """
+        self.fitness_stats['hunt_attempts'] += attempts
+        if not eaten:
+            return self.check_starvation()
+        if self.can_eat(frame_count):
+            self.prey_eaten += 1
+            self.last_eat_time = frame_count
+            self.time_since_last_meal = 0
+            self.energy = min(self.energy + 30, self.max_energy)
+            self.fitness_stats['prey_caught'] += 1
+            if reproduced:
+                self.prey_eaten = 0
+                self.record_reproduction()
+                return "reproduce", eaten[0]
+        return "eat", eaten
+
+    def check_starvation(self):
         self.time_since_last_meal += 1
         if self.time_since_last_meal >= self.starvation_threshold or self.energy <= 0:
             return "die", self
-
         return None, None
 
     
     def clone(self):
+        rng = get_rng("reproduction")
+        mutation_rng = get_rng("mutation")
         child = Predator(
-            self.x + random.randint(-10, 10),
-            self.y + random.randint(-10, 10),
+            self.x + rng.randint(-10, 10),
+            self.y + rng.randint(-10, 10),
             generation=self.generation + 1,
             frame_rate=self.frame_rate
         )
         child.parent_id = self.id
         child.mutations = {}
 
-        if random.random() < adaptive_mutation_probability(0.02, self.generation):  # Adaptive vision mutation rate
+        if mutation_rng.random() < adaptive_mutation_probability(0.02, self.generation):  # Adaptive vision mutation rate
             old_rays = self.num_rays
-            child.num_rays = min(30, self.num_rays + random.choice([1, 2]))
+            child.num_rays = min(30, self.num_rays + mutation_rng.choice([1, 2]))
             child.vision = [1.0] * child.num_rays
             child.vision_hits = ["none"] * child.num_rays
             child.brain = self.brain.resize_input(new_num_inputs=child.num_rays + 3)
@@ -213,21 +209,21 @@ class Predator(BaseEntity):
 
         # Mutate physical traits
         old_speed = self.max_speed
-        child.max_speed = max(1.0, round(self.max_speed + random.gauss(0, 0.1), 2))
+        child.max_speed = max(1.0, round(self.max_speed + mutation_rng.gauss(0, 0.1), 2))
         if abs(child.max_speed - old_speed) / old_speed > 0.1:
             child.mutations["s"] = [old_speed, child.max_speed]
             
         old_turn = self.max_turn_speed
-        child.max_turn_speed = max(0.05, round(self.max_turn_speed + random.gauss(0, 0.01), 3))
+        child.max_turn_speed = max(0.05, round(self.max_turn_speed + mutation_rng.gauss(0, 0.01), 3))
         if abs(child.max_turn_speed - old_turn) / old_turn > 0.1:
             child.mutations["t"] = [old_turn, child.max_turn_speed]
             
-        child.stretch = max(0.5, round(self.stretch + random.gauss(0, 0.01), 3))
+        child.stretch = max(0.5, round(self.stretch + mutation_rng.gauss(0, 0.01), 3))
         if child.stretch > self.stretch:
             child.color = hue_shifted_color(self.color, 0.1)
             
         old_energy = self.max_energy
-        child.max_energy = max(100, int(self.max_energy + random.gauss(0, 10)))
+        child.max_energy = max(100, int(self.max_energy + mutation_rng.gauss(0, 10)))
         if abs(child.max_energy - old_energy) / old_energy > 0.05:
             child.mutations["e"] = [old_energy, child.max_energy]
 
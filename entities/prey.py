@@ -1,9 +1,9 @@
 import math
-import random
 import pygame
 from entities.base_entity import BaseEntity
 from entities.neural_network import NeuralNetwork
 from utils import hue_shifted_color
+from rng import get_rng
 
 # Import centralized frame rate constant
 import sys
@@ -68,10 +68,10 @@ class Prey(BaseEntity):
         self.max_turn_speed = MAX_TURN_SPEED
         # Randomize starting energy to prevent synchronization across all generations
         base_energy = STARTING_ENERGY if generation > 0 else 0
-        self.energy = base_energy + random.randint(0, 40)  # Add 0-40 random energy
+        self.energy = base_energy + get_rng("spawn").randint(0, 40)  # Add 0-40 random energy
         self.max_energy = MAX_ENRERGY
         # Randomize energy regen rate to prevent synchronization (±20% variation)
-        self.energy_regen = (ENERGY_REGEN_RATE / frame_rate) * random.uniform(0.8, 1.2)
+        self.energy_regen = (ENERGY_REGEN_RATE / frame_rate) * get_rng("spawn").uniform(0.8, 1.2)
         self.energy_burn_base = ENERGY_BURN_BASE
 
         self.reproduce_energy_cost = REPRODUCTION_COST
@@ -157,44 +157,14 @@ class Prey(BaseEntity):
         self.y %= self._screen_height
 
         self._update_softbody_stretch()
-        # self.avoid_neighbors(grid)
         
         # Check death conditions
         return self.should_die_naturally()
 
 
-    def avoid_neighbors(self, grid):
-        # if self.neighbor_avoid_timer > 0:
-        #     self.neighbor_avoid_timer -= 1
-        #     return
-        # self.neighbor_avoid_timer = 4
-
-        radius_squared = (self.radius * 2) ** 2
-        move_x, move_y = 0, 0
-        count = 0
-
-        for other in grid.get_neighbors(self):
-            if other is self or not isinstance(other, Prey):
-                continue
-            dx = self.x - other.x
-            dy = self.y - other.y
-            dist_squared = dx * dx + dy * dy
-            if 0 < dist_squared < radius_squared:
-                strength = 1 - (dist_squared / radius_squared)
-                norm = math.sqrt(dist_squared)
-                move_x += (dx / norm) * strength
-                move_y += (dy / norm) * strength
-                count += 1
-
-        if count > 0:
-            self.x += (move_x / count) * 0.5 
-            self.y += (move_y / count) * 0.5
-
-
-
     def should_reproduce(self):
         # ✅ Reproduce based on energy level with slight randomization to prevent synchronization
-        threshold = REPRODUCTION_ENERGY_THRESHOLD + random.uniform(-5, 5)
+        threshold = REPRODUCTION_ENERGY_THRESHOLD + get_rng("reproduction").uniform(-5, 5)
         return self.energy >= threshold
     
     def should_die_naturally(self):
@@ -210,15 +180,17 @@ class Prey(BaseEntity):
         return None
 
     def clone(self):
+        rng = get_rng("reproduction")
+        mutation_rng = get_rng("mutation")
         child = Prey(
-            self.x + random.randint(-30, 30),
-            self.y + random.randint(-30, 30),
+            self.x + rng.randint(-30, 30),
+            self.y + rng.randint(-30, 30),
             generation=self.generation + 1
         )
         child.parent_id = self.id
         child.brain = self.brain.copy_with_mutation(generation=self.generation)
         # child.speed = max(0.5, round(self.max_speed + random.gauss(0, 1), 2))
-        child.energy_burn_base = max(0.1, round(self.energy_burn_base - random.gauss(0, 0.01), 2))
+        child.energy_burn_base = max(0.1, round(self.energy_burn_base - mutation_rng.gauss(0, 0.01), 2))
         
         # Track significant mutations
         child.mutations = {}
@@ -240,9 +212,9 @@ class Prey(BaseEntity):
         child.stretch = self.stretch
         mutated = False
 
-        if random.random() < adaptive_mutation_probability(SPEED_MUTATION_PROB, self.generation):
+        if mutation_rng.random() < adaptive_mutation_probability(SPEED_MUTATION_PROB, self.generation):
             old_speed = self.max_speed
-            child.max_speed = round(self.max_speed + random.uniform(0.3, 1), 2)
+            child.max_speed = round(self.max_speed + mutation_rng.uniform(0.3, 1), 2)
             if self.max_speed < child.max_speed:
                 child.stretch += 0.3
                 mutated = True
@@ -250,9 +222,9 @@ class Prey(BaseEntity):
                 if abs(child.max_speed - old_speed) / old_speed > 0.1:
                     child.mutations["s"] = [old_speed, child.max_speed]
 
-        if random.random() < adaptive_mutation_probability(MAX_ENERGY_MUTATION_PROB, self.generation):
+        if mutation_rng.random() < adaptive_mutation_probability(MAX_ENERGY_MUTATION_PROB, self.generation):
             old_energy = self.max_energy
-            child.max_energy = round(self.max_energy + random.uniform(1, 3), 2)
+            child.max_energy = round(self.max_energy + mutation_rng.uniform(1, 3), 2)
             mutated = True
             # Track significant energy mutation (>5% change)
             if abs(child.max_energy - old_energy) / old_energy > 0.05:
@@ -262,17 +234,17 @@ class Prey(BaseEntity):
         #     child.max_turn_speed = round(self.max_turn_speed + random.uniform(0.5, 3), 2)
         #     mutated = True
 
-        if random.random() < adaptive_mutation_probability(ENERGY_REGEN_MUTATION_PROB, self.generation):
+        if mutation_rng.random() < adaptive_mutation_probability(ENERGY_REGEN_MUTATION_PROB, self.generation):
             old_regen = self.energy_regen
-            child.energy_regen = round(self.energy_regen + random.uniform(0.01, 0.05), 2)
+            child.energy_regen = round(self.energy_regen + mutation_rng.uniform(0.01, 0.05), 2)
             mutated = True
             # Track significant regen mutation (>10% change)
             if abs(child.energy_regen - old_regen) / old_regen > 0.1:
                 child.mutations["r"] = [old_regen, child.energy_regen]
 
-        if random.random() < adaptive_mutation_probability(MAX_ENERGY_MUTATION_PROB, self.generation):
+        if mutation_rng.random() < adaptive_mutation_probability(MAX_ENERGY_MUTATION_PROB, self.generation):
             old_energy = self.max_energy
-            child.max_energy = round(self.max_energy + random.uniform(5, 20), 2)
+            child.max_energy = round(self.max_energy + mutation_rng.uniform(5, 20), 2)
             mutated = True
             # Track significant energy mutation (>5% change) - second mutation chance
             if abs(child.max_energy - old_energy) / old_energy > 0.05:
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+On-Demand Frame Profiler for Evolution Simulation
+Runs cProfile for the next N frames when requested (hotkey or SIGUSR1), then writes a
+.pstats file and a top-functions text summary tagged with the frame range and population
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import time
+from typing import Optional
+
+DEFAULT_FRAMES = 300   # Frames profiled per request (5 seconds at 60 FPS)
+TOP_FUNCTIONS = 30     # Rows in each table of the text summary
+
+
+class FrameProfiler:
+    """Profiles a window of frames; requests are flag-only so a signal handler can make them"""
+
+    def __init__(self, frames=DEFAULT_FRAMES, output_dir="."):
+        self.frames = frames
+        self.output_dir = output_dir
+        self.requested = False
+        self.profile: Optional[cProfile.Profile] = None
+        self.last_output = None
+
+    @property
+    def active(self) -> bool:
+        return self.profile is not None
+
+    def request(self, *_):
+        """Profile the next `frames` frames (ignored while a profile is running)
+
+        Accepts and ignores (signum, frame) so it can be installed as a signal handler.
+        """
+        if self.profile is None:
+            self.requested = True
+
+    def frame_start(self, sim):
+        """Call once per frame, before the frame's work"""
+        if self.profile is None:
+            if self.requested:
+                self.requested = False
+                self._start(sim)
+            return
+        self._frames_left -= 1
+        if self._frames_left <= 0:
+            self._stop(sim)
+
+    def _start(self, sim):
+        self._start_frame = sim.frame_count
+        self._start_population = (len(sim.prey_list), len(sim.predators))
+        self._start_time = time.perf_counter()
+        self._frames_left = self.frames
+        print(f"Profiling {self.frames} frames from frame {sim.frame_count}...")
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def _stop(self, sim):
+        self.profile.disable()
+        profile, self.profile = self.profile, None
+        elapsed = time.perf_counter() - self._start_time
+        end_frame = sim.frame_count
+        base = os.path.join(self.output_dir, f"profile_frames_{self._start_frame}-{end_frame}")
+
+        profile.dump_stats(base + ".pstats")
+        with open(base + ".txt", "w") as f:
+            f.write(self._summary(profile, end_frame, elapsed, sim))
+        self.last_output = base
+        print(f"Profile saved to {base}.pstats ({base}.txt summary)")
+
+    def _summary(self, profile: cProfile.Profile, end_frame: int, elapsed: float, sim) -> str:
+        prey, predators = self._start_population
+        frames = max(end_frame - self._start_frame, 1)
+        header = (
+            f"Frames {self._start_frame}-{end_frame} ({frames} steps, {elapsed:.2f}s wall, "
+            f"{elapsed / frames * 1000:.2f} ms/frame)\n"
+            f"Population at start: {prey} prey, {predators} predators\n"
+            f"Population at end:   {len(sim.prey_list)} prey, {len(sim.predators)} predators\n"
+        )
+        out = io.StringIO()
+        stats = pstats.Stats(profile, stream=out).strip_dirs()
+        out.write(f"\n=== Top {TOP_FUNCTIONS} by cumulative time ===\n")
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        out.write(f"\n=== Top {TOP_FUNCTIONS} by internal time ===\n")
+        stats.sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+        return header + out.getvalue()
+
+    def stop(self, sim):
+        """Finish an in-progress profile early (e.g. at exit)"""
+        if self.profile is not None:
+            self._stop(sim)
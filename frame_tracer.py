@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Frame Tracer for Evolution Simulation
+Records spans for frame phases and background work (saves, checkpoints, sprite
+pre-computation) into a bounded ring buffer and exports Chrome trace-event JSON,
+which opens in Perfetto (ui.perfetto.dev) or chrome://tracing
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Dict, Any, Optional
+
+
+class FrameTracer:
+    """Bounded ring buffer of trace events; recording is a no-op until enabled"""
+
+    def __init__(self, capacity=500_000):
+        """Initialize tracer
+
+        Args:
+            capacity: Maximum events kept; the oldest are dropped first
+        """
+        self.enabled = False
+        self.events = deque(maxlen=capacity)
+        self.thread_names = {}
+        self.origin_ns = perf_counter_ns()
+
+    def enable(self, capacity: Optional[int] = None):
+        if capacity is not None and capacity != self.events.maxlen:
+            self.events = deque(self.events, maxlen=capacity)
+        self.enabled = True
+
+    def _thread_id(self) -> int:
+        ident = threading.get_ident()
+        if ident not in self.thread_names:
+            self.thread_names[ident] = threading.current_thread().name
+        return ident
+
+    def span(self, name: str, start_ns: int, end_ns: int, category: str = "frame",
+             args: Optional[Dict[str, Any]] = None):
+        """Record a completed span (a begin/end pair) measured with perf_counter_ns"""
+        if self.enabled:
+            # deque.append is atomic, so background threads can record without a lock
+            self.events.append(("X", name, category, start_ns, end_ns - start_ns, self._thread_id(), args))
+
+    @contextmanager
+    def trace(self, name: str, category: str = "background", args: Optional[Dict[str, Any]] = None):
+        """Context manager recording a span around a block"""
+        if not self.enabled:
+            yield
+            return
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.span(name, start, perf_counter_ns(), category, args)
+
+    def instant(self, name: str, category: str = "frame", args: Optional[Dict[str, Any]] = None):
+        if self.enabled:
+            self.events.append(("i", name, category, perf_counter_ns(), 0, self._thread_id(), args))
+
+    def counter(self, name: str, values: Dict[str, float]):
+        """Record counter values (drawn as a track, e.g. population over time)"""
+        if self.enabled:
+            self.events.append(("C", name, "counter", perf_counter_ns(), 0, self._thread_id(), values))
+
+    def export(self, filepath="trace.json") -> int:
+        """Write the buffered events as Chrome trace-event JSON; returns the event count"""
+        pid = os.getpid()
+        origin = self.origin_ns
+        trace_events = [
+            {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self.thread_names.items()
+        ]
+        for phase, name, category, start_ns, duration_ns, tid, args in list(self.events):
+            event = {"ph": phase, "name": name, "cat": category, "pid": pid, "tid": tid,
+                     "ts": (start_ns - origin) / 1000}
+            if phase == "X":
+                event["dur"] = duration_ns / 1000
+            elif phase == "i":
+                event["s"] = "t"
+            if args:
+                event["args"] = args
+            trace_events.append(event)
+
+        with open(filepath, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+        return len(trace_events)
+
+
+# Global tracer instance
+_frame_tracer = None
+
+def get_tracer() -> FrameTracer:
+    """Get global frame tracer instance"""
+    global _frame_tracer
+    if _frame_tracer is None:
+        _frame_tracer = FrameTracer()
+    return _frame_tracer
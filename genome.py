@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Genome Encoding for Evolution Simulation
+Packs an entity's heritable state (brain weights plus the traits clone() passes on)
+into a flat float64 vector and rebuilds entities from it
+"""
+
+import numpy as np
+
+from entities.prey import Prey
+from entities.predator import Predator
+from entities.neural_network import NeuralNetwork
+
+SPECIES_PREY = 0
+SPECIES_PREDATOR = 1
+
+# Traits clone() copies or mutates, per species
+PREY_TRAITS = ("max_speed", "max_turn_speed", "max_energy", "energy_regen",
+               "energy_burn_base", "reproduce_energy_cost", "radius", "stretch")
+PREDATOR_TRAITS = ("max_speed", "max_turn_speed", "max_energy", "stretch", "radius")
+
+# Per-entity state that is not heritable but must survive moving an entity between
+# worlds (tile migration) or across a restart (checkpoints)
+STATE_FIELDS = ("angle", "speed", "angular_velocity", "energy", "age", "children_spawned",
+                "is_moving", "move_timer", "stop_timer",
+                "frames_since_predator_seen", "frames_since_prey_seen", "prey_eaten",
+                "time_since_last_meal", "last_eat_time", "last_vision_frame")
+INT_STATE_FIELDS = {"age", "children_spawned", "move_timer", "stop_timer", "frames_since_predator_seen",
+                    "frames_since_prey_seen", "prey_eaten", "time_since_last_meal", "last_vision_frame"}
+FITNESS_FIELDS = ("birth_frame", "children_produced", "threat_encounters", "successful_escapes",
+                  "prey_caught", "hunt_attempts")
+
+# Header layout: [valid, species, generation, input_size, hidden_size, r, g, b]
+HEADER_SIZE = 8
+
+# Brain shapes as built in Prey/Predator __init__ (predator rays grow to 30 via clone)
+PREY_BRAIN_SHAPE = (24 + 3, 16)
+MAX_PREDATOR_BRAIN_SHAPE = (30 + 3, 10)
+
+
+def brain_size(input_size: int, hidden_size: int, output_size: int = 2) -> int:
+    """Number of floats in a flattened brain (w1, b1, w2, b2)"""
+    return hidden_size * input_size + hidden_size + output_size * hidden_size + output_size
+
+
+def max_genome_size() -> int:
+    """Largest genome of either species; sizes a fixed-width genome slot"""
+    prey_size = len(PREY_TRAITS) + brain_size(*PREY_BRAIN_SHAPE)
+    predator_size = len(PREDATOR_TRAITS) + brain_size(*MAX_PREDATOR_BRAIN_SHAPE)
+    return HEADER_SIZE + max(prey_size, predator_size)
+
+
+def encode_genome(entity, out: np.ndarray) -> int:
+    """Write entity's genome into out (a float64 slot); returns the number of floats used"""
+    brain = entity.brain
+    is_prey = entity.entity_type == "prey"
+    traits = PREY_TRAITS if is_prey else PREDATOR_TRAITS
+
+    out[:HEADER_SIZE] = (1.0, SPECIES_PREY if is_prey else SPECIES_PREDATOR, entity.generation,
+                         brain.input_size, brain.hidden_size, *entity.color)
+    pos = HEADER_SIZE
+    for trait in traits:
+        out[pos] = getattr(entity, trait)
+        pos += 1
+    for weights in (brain.w1, brain.b1, brain.w2, brain.b2):
+        n = weights.size
+        out[pos:pos + n] = weights.ravel()
+        pos += n
+    return pos
+
+
+def decode_genome(genome: np.ndarray, x: float, y: float, frame_rate: int):
+    """Build a new Prey or Predator at (x, y) from an encoded genome, or None for an empty slot"""
+    if genome[0] != 1.0:
+        return None
+    species = int(genome[1])
+    generation = int(genome[2])
+    input_size = int(genome[3])
+    hidden_size = int(genome[4])
+    color = tuple(int(c) for c in genome[5:8])
+
+    if species == SPECIES_PREY:
+        entity = Prey(x, y, generation=generation, frame_rate=frame_rate)
+        traits = PREY_TRAITS
+    else:
+        entity = Predator(x, y, generation=generation, frame_rate=frame_rate, num_rays=input_size - 3)
+        traits = PREDATOR_TRAITS
+
+    pos = HEADER_SIZE
+    for trait in traits:
+        setattr(entity, trait, float(genome[pos]))
+        pos += 1
+    entity.radius = int(entity.radius)
+    entity.color = color
+
+    brain = NeuralNetwork(input_size, hidden_size, entity.brain.output_size)
+    for name in ("w1", "b1", "w2", "b2"):
+        shape = getattr(brain, name).shape
+        n = shape[0] * shape[1]
+        setattr(brain, name, genome[pos:pos + n].reshape(shape).copy())
+        pos += n
+    entity.brain = brain
+    return entity
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Spatial Grid Benchmark for Evolution Simulation
+Compares SpatialGrid with HierarchicalGrid across population densities and layouts
+(uniform and clustered) for the query radii the simulation uses: prey vision (100,
+predators only), predator vision (250, prey only), prey avoidance (default radius) and
+predator eating (radius * 3). Checks that both grids find exactly the entities a
+brute-force search finds within range (using minimum-image distances with --wrap),
+then reports microseconds per query, cells visited and per-frame update cost.
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Any
+
+import numpy as np
+
+from simulation import WORLD_WIDTH, WORLD_HEIGHT, GRID_CELL_SIZE
+from spatial_grid import SpatialGrid, HierarchicalGrid
+from work_counters import get_work_counters
+
+GRIDS = {"SpatialGrid": SpatialGrid, "HierarchicalGrid": HierarchicalGrid}
+
+# (name, observer type, radius or None for the grid default, species wanted)
+QUERIES = [
+    ("prey_vision", "prey", 100, "predator"),
+    ("predator_vision", "predator", 250, "prey"),
+    ("prey_avoidance", "prey", None, None),
+    ("predator_eating", "predator", 36, "prey"),
+]
+
+DENSITIES = [(250, 5), (1000, 20), (4000, 50), (10000, 100)]
+LAYOUTS = ["uniform", "clustered"]
+
+
+class _Point:
+    __slots__ = ("id", "x", "y", "radius", "entity_type")
+
+    def __init__(self, entity_id, x, y, radius, entity_type):
+        self.id = entity_id
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.entity_type = entity_type
+
+
+def make_population(rng: np.random.Generator, prey: int, predators: int, layout: str,
+                    width: float, height: float) -> List[_Point]:
+    """Prey uniform or in Gaussian clusters; predators always uniform"""
+    if layout == "clustered":
+        centers = rng.uniform((0, 0), (width, height), (max(prey // 200, 1), 2))
+        positions = centers[rng.integers(0, len(centers), prey)] + rng.normal(0, 60, (prey, 2))
+        positions = np.clip(positions, 0, (width - 1, height - 1))
+    else:
+        positions = rng.uniform((0, 0), (width, height), (prey, 2))
+    points = [_Point(i, float(x), float(y), 8.0, "prey") for i, (x, y) in enumerate(positions)]
+    for j, (x, y) in enumerate(rng.uniform((0, 0), (width, height), (predators, 2))):
+        points.append(_Point(prey + j, float(x), float(y), 12.0, "predator"))
+    return points
+
+
+def in_range(observer, candidates, radius, species, periodic) -> set:
+    """Ids within radius of the observer (the filter every caller applies after the grid)"""
+    radius = radius or GRID_CELL_SIZE * 1.5
+    period_x, period_y, half_x, half_y = periodic
+    found = set()
+    for o in candidates:
+        if o is observer or (species is not None and o.entity_type != species):
+            continue
+        dx = o.x - observer.x
+        dy = o.y - observer.y
+        dx -= period_x * (dx > half_x) - period_x * (dx < -half_x)
+        dy -= period_y * (dy > half_y) - period_y * (dy < -half_y)
+        if dx * dx + dy * dy <= radius * radius:
+            found.add(o.id)
+    return found
+
+
+def brute_force(observer, points: List[_Point], xy: np.ndarray, types: np.ndarray, radius, species,
+                periodic) -> set:
+    """Reference answer: every point within radius, by minimum-image distance when periodic"""
+    radius = radius or GRID_CELL_SIZE * 1.5
+    period_x, period_y, half_x, half_y = periodic
+    d = xy - (observer.x, observer.y)
+    d[:, 0] -= period_x * ((d[:, 0] > half_x).astype(float) - (d[:, 0] < -half_x))
+    d[:, 1] -= period_y * ((d[:, 1] > half_y).astype(float) - (d[:, 1] < -half_y))
+    mask = (d ** 2).sum(axis=1) <= radius * radius
+    if species is not None:
+        mask &= types == species
+    return {points[i].id for i in np.flatnonzero(mask) if points[i] is not observer}
+
+
+def run_case(points: List[_Point], width: float, height: float, cell_size: int,
+             observers_per_query: int, rng: np.random.Generator, wrap: bool = False) -> Dict[str, Any]:
+    grids = {}
+    for name, cls in GRIDS.items():
+        grid = cls(width, height, cell_size, wrap=wrap)
+        for p in points:
+            grid.add_entity(p)
+        grids[name] = grid
+
+    xy = np.array([(p.x, p.y) for p in points])
+    types = np.array([p.entity_type for p in points])
+    work = get_work_counters()
+    queries = {}
+    mismatches = 0
+    for query_name, observer_type, radius, species in QUERIES:
+        observers = [p for p in points if p.entity_type == observer_type]
+        observers = [observers[i] for i in rng.integers(0, len(observers), observers_per_query)]
+        row = {}
+        results = {}
+        for name, grid in grids.items():
+            work.reset()
+            start = time.perf_counter_ns()
+            found = [grid.get_neighbors(o, radius=radius, species=species) for o in observers]
+            elapsed = time.perf_counter_ns() - start
+            row[name] = {"us_per_query": round(elapsed / len(observers) / 1000, 2),
+                         "cells_per_query": round(work.grid_cells_visited / len(observers), 1),
+                         "entities_per_query": round(work.grid_entities_returned / len(observers), 1)}
+            # Query plus the caller's type and distance filter, which scales with entities returned
+            start = time.perf_counter_ns()
+            results[name] = [in_range(o, c, radius, species, grid.periodic) for o, c in zip(observers, found)]
+            elapsed += time.perf_counter_ns() - start
+            row[name]["us_per_query_filtered"] = round(elapsed / len(observers) / 1000, 2)
+        periodic = grids["SpatialGrid"].periodic
+        truth = [brute_force(o, points, xy, types, radius, species, periodic) for o in observers]
+        mismatches += sum(results[name] != truth for name in grids)
+        row["speedup"] = round(row["SpatialGrid"]["us_per_query_filtered"]
+                               / max(row["HierarchicalGrid"]["us_per_query_filtered"], 1e-9), 2)
+        queries[query_name] = row
+
+    # One frame of movement: every entity steps up to 3 px, then the grids update
+    steps = rng.uniform(-3, 3, (len(points), 2))
+    start_xy = [(p.x, p.y) for p in points]
+    updates = {}
+    for name, grid in grids.items():
+        for p, (dx, dy) in zip(points, steps):
+            if wrap:
+                p.x = (p.x + dx) % width
+                p.y = (p.y + dy) % height
+            else:
+                p.x = min(max(p.x + dx, 0), width - 1)
+                p.y = min(max(p.y + dy, 0), height - 1)
+        start = time.perf_counter_ns()
+        for p in points:
+            grid.update_entity(p)
+        updates[name] = round((time.perf_counter_ns() - start) / 1e6, 3)
+        for p, (x, y) in zip(points, start_xy):   # undo so the second grid sees the same move
+            p.x, p.y = x, y
+    return {"queries": queries, "update_ms_per_frame": updates, "mismatches": mismatches}
+
+
+def run_benchmark(observers_per_query: int = 300, cell_size: int = GRID_CELL_SIZE, seed: int = 0,
+                  scale: float = 1.0, wrap: bool = False) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    width, height = WORLD_WIDTH * scale, WORLD_HEIGHT * scale
+    rows = []
+    for prey, predators in DENSITIES:
+        for layout in LAYOUTS:
+            points = make_population(rng, prey, predators, layout, width, height)
+            result = run_case(points, width, height, cell_size, observers_per_query, rng, wrap)
+            rows.append({"prey": prey, "predators": predators, "layout": layout, **result})
+    return rows
+
+
+def print_report(rows: List[Dict[str, Any]]):
+    print("Times are microseconds per query including the caller's distance filter")
+    print(f"{'prey':>6} {'pred':>5} {'layout':<10} {'query':<16} {'grid us':>8} {'hier us':>8} "
+          f"{'speedup':>8} {'grid cells':>10} {'hier cells':>10} {'grid ents':>9} {'hier ents':>9}")
+    for row in rows:
+        for query_name, q in row["queries"].items():
+            print(f"{row['prey']:>6} {row['predators']:>5} {row['layout']:<10} {query_name:<16} "
+                  f"{q['SpatialGrid']['us_per_query_filtered']:>8.1f} "
+                  f"{q['HierarchicalGrid']['us_per_query_filtered']:>8.1f} "
+                  f"{q['speedup']:>7.2f}x {q['SpatialGrid']['cells_per_query']:>10.1f} "
+                  f"{q['HierarchicalGrid']['cells_per_query']:>10.1f} "
+                  f"{q['SpatialGrid']['entities_per_query']:>9.1f} {q['HierarchicalGrid']['entities_per_query']:>9.1f}")
+        update = row["update_ms_per_frame"]
+        print(f"{'':>23} update/frame: grid {update['SpatialGrid']:.2f} ms, "
+              f"hier {update['HierarchicalGrid']:.2f} ms, mismatches {row['mismatches']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SpatialGrid vs HierarchicalGrid benchmark')
+    parser.add_argument('--observers', type=int, default=300, help='Observers timed per query type')
+    parser.add_argument('--cell-size', type=int, default=GRID_CELL_SIZE, help='Fine cell size')
+    parser.add_argument('--scale', type=float, default=1.0, help='World size multiplier (density falls with scale^2)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for generated populations')
+    parser.add_argument('--wrap', action='store_true', help='Toroidal world (wrapped grids, minimum-image distances)')
+    parser.add_argument('--output', default='grid_benchmark.json', help='Where to write results')
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.observers, args.cell_size, args.seed, args.scale, args.wrap)
+    print_report(rows)
+    with open(args.output, "w") as f:
+        json.dump({"cell_size": args.cell_size, "scale": args.scale, "wrap": args.wrap, "results": rows}, f, indent=2)
+    print(f"\nResults saved to: {args.output}")
+    if any(row["mismatches"] for row in rows):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
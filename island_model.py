@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Island-Model Evolution for Evolution Simulation
+Runs N independent worlds in separate processes and periodically migrates the
+top-fitness prey and predators around a ring. Genomes travel through a
+multiprocessing.shared_memory buffer instead of pickled entity objects.
+"""
+
+import argparse
+import json
+import os
+import time
+from multiprocessing import Barrier, Process, Queue
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError
+from typing import Dict, List, Any
+
+import numpy as np
+
+from genome import SPECIES_PREY, SPECIES_PREDATOR, encode_genome, decode_genome, max_genome_size
+from simulation import Simulation
+
+BARRIER_TIMEOUT_SECONDS = 600
+
+
+def rank_by_fitness(sim: Simulation, species: int) -> List[Any]:
+    """Entities of one species sorted from fittest to weakest"""
+    if species == SPECIES_PREY:
+        population = sim.prey_list
+        fitness = lambda e: e.calculate_prey_fitness()
+    else:
+        population = sim.predators
+        fitness = lambda e: e.calculate_predator_fitness()
+    for e in population:
+        e.update_fitness_stats(sim.frame_count)
+    return sorted(population, key=fitness, reverse=True)
+
+
+def export_migrants(sim: Simulation, slots: np.ndarray, migrants: int):
+    """Write the top-fitness genomes of each species into this island's outgoing slots"""
+    slots[:] = 0.0
+    for species in (SPECIES_PREY, SPECIES_PREDATOR):
+        for i, entity in enumerate(rank_by_fitness(sim, species)[:migrants]):
+            encode_genome(entity, slots[species, i])
+
+
+def log_replaced(sim: Simulation, resident):
+    """Log a resident displaced by an immigrant, with the fitness data a death event carries"""
+    if resident.entity_type == "prey":
+        fitness, prey_eaten = resident.calculate_prey_fitness(), None
+    else:
+        fitness, prey_eaten = resident.calculate_predator_fitness(), resident.prey_eaten
+    sim.log_event([sim.frame_count, "migrate_out", resident.id, resident.generation,
+                   resident.age // sim.frame_rate, resident.entity_type, resident.children_spawned,
+                   prey_eaten, int(fitness)])
+
+
+def import_migrants(sim: Simulation, slots: np.ndarray, source_island: int) -> int:
+    """Replace the weakest residents with immigrants decoded from another island's slots"""
+    arrived = 0
+    world_rng = sim.rng["world"]
+    for species in (SPECIES_PREY, SPECIES_PREDATOR):
+        immigrants = []
+        for genome in slots[species]:
+            x = world_rng.randint(100, sim.width - 100)
+            y = world_rng.randint(100, sim.height - 100)
+            entity = decode_genome(genome, x, y, sim.frame_rate)
+            if entity is not None:
+                immigrants.append(entity)
+        if not immigrants:
+            continue
+
+        weakest = rank_by_fitness(sim, species)[-len(immigrants):]
+        for resident in weakest:
+            log_replaced(sim, resident)
+            sim.remove_entity(resident)
+        for entity in immigrants:
+            entity.parent_id = None
+            entity.fitness_stats['birth_frame'] = sim.frame_count
+            sim.add_entity(entity)
+            sim.log_event([sim.frame_count, "migrate_in", entity.id, source_island,
+                           entity.entity_type, entity.generation])
+        arrived += len(immigrants)
+    return arrived
+
+
+def run_island(island: int, num_islands: int, shm_name: str, buffer_shape: tuple,
+               barrier, results: Queue, frames: int, migration_interval: int,
+               migrants: int, seed: int, output_dir: str):
+    """Island process: step one world and exchange migrants every migration_interval frames"""
+    shm = SharedMemory(name=shm_name)
+    try:
+        buffer = np.ndarray(buffer_shape, dtype=np.float64, buffer=shm.buf)
+        outgoing = buffer[island]
+        incoming = buffer[(island - 1) % num_islands]
+
+        sim = Simulation(seed=seed)
+        immigrants = 0
+        start = time.perf_counter()
+        for _ in range(frames):
+            sim.step()
+            if num_islands > 1 and sim.frame_count % migration_interval == 0:
+                export_migrants(sim, outgoing, migrants)
+                barrier.wait(BARRIER_TIMEOUT_SECONDS)   # all genomes written
+                immigrants += import_migrants(sim, incoming, (island - 1) % num_islands)
+                barrier.wait(BARRIER_TIMEOUT_SECONDS)   # all genomes read before the next export
+        elapsed = time.perf_counter() - start
+
+        island_dir = os.path.join(output_dir, f"island_{island}")
+        os.makedirs(island_dir, exist_ok=True)
+        sim.save_simulation_data(os.path.join(island_dir, "simulation_log.json"))
+
+        summary = sim.analytics.get_summary()
+        results.put({
+            "island": island,
+            "seed": seed,
+            "frames": frames,
+            "elapsed_seconds": elapsed,
+            "steps_per_second": frames / elapsed if elapsed > 0 else 0,
+            "immigrants": immigrants,
+            "prey_count": len(sim.prey_list),
+            "predator_count": len(sim.predators),
+            "generation_spread": summary["generation_spread"]
+        })
+    except BaseException as e:
+        # Release the other islands instead of leaving them blocked on the barrier
+        barrier.abort()
+        error = "migration barrier broken" if isinstance(e, BrokenBarrierError) else repr(e)
+        results.put({"island": island, "error": error})
+        raise
+    finally:
+        shm.close()
+
+
+def run_islands(num_islands: int, frames: int, migration_interval: int = 600, migrants: int = 3,
+                base_seed: int = 0, output_dir: str = "island_results") -> Dict[str, Any]:
+    """Run num_islands worlds in parallel with ring migration and collect their summaries"""
+    buffer_shape = (num_islands, 2, migrants, max_genome_size())
+    shm = SharedMemory(create=True, size=int(np.prod(buffer_shape)) * np.dtype(np.float64).itemsize)
+    barrier = Barrier(num_islands)
+    results = Queue()
+    os.makedirs(output_dir, exist_ok=True)
+
+    wall_start = time.perf_counter()
+    try:
+        processes = [
+            Process(target=run_island, args=(i, num_islands, shm.name, buffer_shape, barrier, results,
+                                             frames, migration_interval, migrants, base_seed + i, output_dir))
+            for i in range(num_islands)
+        ]
+        for p in processes:
+            p.start()
+        islands = [results.get() for _ in processes]
+        for p in processes:
+            p.join()
+    finally:
+        shm.close()
+        shm.unlink()
+    wall_time = time.perf_counter() - wall_start
+
+    islands.sort(key=lambda r: r["island"])
+    report = {
+        "metadata": {
+            "islands": num_islands,
+            "frames": frames,
+            "migration_interval": migration_interval,
+            "migrants_per_species": migrants,
+            "base_seed": base_seed,
+            "wall_time_seconds": wall_time,
+            "total_steps_per_second": num_islands * frames / wall_time if wall_time > 0 else 0
+        },
+        "islands": islands
+    }
+    with open(os.path.join(output_dir, "island_results.json"), "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Island-model evolution across processes')
+    parser.add_argument('--islands', type=int, default=os.cpu_count() or 2, help='Number of worlds')
+    parser.add_argument('--frames', type=int, default=7200, help='Frames to simulate per island')
+    parser.add_argument('--migration-interval', type=int, default=600, help='Frames between migrations')
+    parser.add_argument('--migrants', type=int, default=3, help='Top genomes per species sent each migration')
+    parser.add_argument('--seed', type=int, default=0, help='Base seed; island i uses seed + i')
+    parser.add_argument('--output-dir', default='island_results', help='Directory for per-island logs')
+    args = parser.parse_args()
+
+    report = run_islands(args.islands, args.frames, args.migration_interval, args.migrants,
+                         args.seed, args.output_dir)
+
+    print(f"\n=== Island Model Summary ===")
+    for island in report["islands"]:
+        if "error" in island:
+            print(f"Island {island['island']}: error {island['error']}")
+            continue
+        spread = island["generation_spread"]
+        print(f"Island {island['island']}: {island['steps_per_second']:.1f} steps/s, "
+              f"prey={island['prey_count']} predators={island['predator_count']}, "
+              f"max gen prey={spread['prey_max_generation']} predators={spread['pred_max_generation']}, "
+              f"immigrants={island['immigrants']}")
+    print(f"Total throughput: {report['metadata']['total_steps_per_second']:.1f} steps/s")
+    print(f"Results saved to: {os.path.join(args.output_dir, 'island_results.json')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Latency Histograms for Evolution Simulation
+Fixed-bucket, log-scale (HDR-style) histograms of nanosecond durations. Buckets split
+each power of two into SUB_BUCKETS linear steps, so any value is reported within ~6%.
+The layout is fixed, so histograms from different runs and processes merge by adding counts.
+"""
+
+from typing import Dict, List, Any, Iterable
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS   # 16 linear buckets per power of two
+MAX_EXPONENT = 40                    # 2^40 ns ~ 18 minutes; larger values land in the top bucket
+# Exact buckets below SUB_BUCKETS ns, then one row per exponent from SUB_BUCKET_BITS to MAX_EXPONENT
+NUM_BUCKETS = (MAX_EXPONENT - SUB_BUCKET_BITS + 2) * SUB_BUCKETS
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def bucket_index(value_ns: int) -> int:
+    """Bucket for a duration: values below SUB_BUCKETS ns are exact, above that log-linear"""
+    if value_ns < SUB_BUCKETS:
+        return max(value_ns, 0)
+    exponent = value_ns.bit_length() - 1
+    if exponent > MAX_EXPONENT:
+        return NUM_BUCKETS - 1
+    sub = (value_ns >> (exponent - SUB_BUCKET_BITS)) & (SUB_BUCKETS - 1)
+    return (exponent - SUB_BUCKET_BITS + 1) * SUB_BUCKETS + sub
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Largest nanosecond value that falls in a bucket (percentiles report this edge)"""
+    if index < SUB_BUCKETS:
+        return index
+    exponent = index // SUB_BUCKETS + SUB_BUCKET_BITS - 1
+    sub = index % SUB_BUCKETS
+    width = 1 << (exponent - SUB_BUCKET_BITS)
+    return (1 << exponent) + (sub + 1) * width - 1
+
+
+class LatencyHistogram:
+    """Mergeable log-bucketed histogram of durations in nanoseconds"""
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.total_count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def record(self, value_ns: int):
+        value_ns = int(value_ns)
+        self.counts[bucket_index(value_ns)] += 1
+        self.total_count += 1
+        self.total_ns += value_ns
+        if self.min_ns is None or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's counts into this one"""
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.total_count += other.total_count
+        self.total_ns += other.total_ns
+        if other.min_ns is not None and (self.min_ns is None or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        return self
+
+    def reset(self):
+        self.__init__()
+
+    def percentile(self, q: float) -> int:
+        """Nanosecond upper edge of the bucket holding the q-th percentile (capped at the max seen)"""
+        if self.total_count == 0:
+            return 0
+        target = max(1, -(-q * self.total_count // 100))   # ceil(q% of count)
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(bucket_upper_bound(i), self.max_ns)
+        return self.max_ns
+
+    def summary_ms(self) -> Dict[str, Any]:
+        """count, mean, min, max and PERCENTILES in milliseconds"""
+        if self.total_count == 0:
+            return {"count": 0}
+        summary = {
+            "count": self.total_count,
+            "mean": round(self.total_ns / self.total_count / 1e6, 3),
+            "min": round(self.min_ns / 1e6, 3),
+            "max": round(self.max_ns / 1e6, 3),
+        }
+        for q in PERCENTILES:
+            summary[f"p{q:g}"] = round(self.percentile(q) / 1e6, 3)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sparse JSON form: only non-empty buckets are stored"""
+        return {
+            "sub_bucket_bits": SUB_BUCKET_BITS,
+            "max_exponent": MAX_EXPONENT,
+            "count": self.total_count,
+            "total_ns": self.total_ns,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "buckets": {str(i): c for i, c in enumerate(self.counts) if c},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        if data.get("sub_bucket_bits") != SUB_BUCKET_BITS or data.get("max_exponent") != MAX_EXPONENT:
+            raise ValueError("Histogram bucket layout does not match")
+        histogram = cls()
+        for index, count in data["buckets"].items():
+            # Older logs kept overflow in unreachable buckets past the top one
+            histogram.counts[min(int(index), NUM_BUCKETS - 1)] += count
+        histogram.total_count = data["count"]
+        histogram.total_ns = data["total_ns"]
+        histogram.min_ns = data["min_ns"]
+        histogram.max_ns = data["max_ns"]
+        return histogram
+
+
+def merge_histograms(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    merged = LatencyHistogram()
+    for histogram in histograms:
+        merged.merge(histogram)
+    return merged
+
+
+def merge_histogram_sets(sets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge {name: histogram dict} mappings (e.g. frame + phases from several logs) by name"""
+    merged: Dict[str, LatencyHistogram] = {}
+    for histogram_set in sets:
+        for name, data in histogram_set.items():
+            merged.setdefault(name, LatencyHistogram()).merge(LatencyHistogram.from_dict(data))
+    return {name: histogram.to_dict() for name, histogram in merged.items()}
@@ -1,24 +1,56 @@
 import math
-import random
 import pygame
 import sys
 import argparse
-import json
 import time
 import signal
 import atexit
 from entities.prey import Prey
 from entities.predator import Predator
-from spatial_grid import SpatialGrid
-from performance_logger import PerformanceLogger
+from performance_logger import PerformanceLogger, SPIKE_FACTOR, MAX_SPIKE_RECORDS
+from metrics_server import MetricsServer
+from memory_tracker import MemoryTracker
+from quality_controller import QualityController
+from neighbor_lists import NEIGHBOR_SKIN
+from frame_profiler import FrameProfiler, DEFAULT_FRAMES as DEFAULT_PROFILE_FRAMES
 from sprite_cache import get_sprite_cache
 from vision_array_pool import get_vision_array_pool
+from work_counters import get_work_counters
+from frame_tracer import get_tracer
+from simulation import Simulation
+from checkpoint import CheckpointWriter, load_checkpoint
+from replay import ReplayRecorder
 
 
 
 
 parser = argparse.ArgumentParser(description='Evolutionary AI Simulation')
 parser.add_argument('--presentation-mode', action='store_true', help='Enable presentation mode')
+parser.add_argument('--resume', metavar='CHECKPOINT', help='Resume from a checkpoint file')
+parser.add_argument('--checkpoint', default='checkpoint.npz', help='Checkpoint file written periodically and at exit')
+parser.add_argument('--checkpoint-interval', type=float, default=300,
+                    help='Seconds between automatic checkpoints (0 disables)')
+parser.add_argument('--seed', type=int, help='Seed for a reproducible run (random if omitted)')
+parser.add_argument('--record', metavar='REPLAY', help='Record a keyframe + delta replay to this file')
+parser.add_argument('--trace', metavar='TRACE', help='Record frame phase spans and export Chrome/Perfetto JSON at exit')
+parser.add_argument('--trace-buffer', type=int, default=500_000, help='Maximum trace events kept (oldest dropped)')
+parser.add_argument('--spike-factor', type=float, default=SPIKE_FACTOR,
+                    help='Capture a diagnostic record for frames slower than this multiple of the target frame time (0 disables)')
+parser.add_argument('--max-spikes', type=int, default=MAX_SPIKE_RECORDS, help='Spike records kept in the performance log')
+parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this local port (/metrics)')
+parser.add_argument('--profile-frames', type=int, default=DEFAULT_PROFILE_FRAMES,
+                    help='Frames profiled with cProfile per F9 press or SIGUSR1')
+parser.add_argument('--profile-dir', default='.', help='Where profile .pstats and summaries are written')
+parser.add_argument('--memory-interval', type=float, default=0,
+                    help='Seconds between memory samples in the performance log (0 disables; enables tracemalloc)')
+parser.add_argument('--vision-budget', type=int, help='Maximum vision recasts per frame (default: no cap)')
+parser.add_argument('--neighbor-skin', type=float, default=NEIGHBOR_SKIN,
+                    help='Skin (px) of the cached vision/eating neighbour lists (0 queries the grid every time)')
+parser.add_argument('--no-crowding', action='store_true',
+                    help='Disable soft-body separation and prey neighbour avoidance')
+parser.add_argument('--adaptive-quality', action='store_true',
+                    help='Adjust vision throttle, collision interval, grid cell size and draw detail to hold the frame rate')
+parser.add_argument('--keyframe-interval', type=int, default=300, help='Frames between replay keyframes')
 args = parser.parse_args()
 
 pygame.init()
@@ -32,6 +64,14 @@ VISION_THROTTLE = 3
 NUM_STARTING_PREY = 250
 NUM_STARTING_PREDATORS = 5
 
+resumed_sim = None
+if args.resume:
+    load_start = time.perf_counter()
+    resumed_sim = load_checkpoint(args.resume)
+    SCREEN_WIDTH, SCREEN_HEIGHT = resumed_sim.width, resumed_sim.height
+    print(f"Resumed from {args.resume} at frame {resumed_sim.frame_count} "
+          f"({len(resumed_sim.entities)} entities) in {time.perf_counter() - load_start:.2f}s")
+
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
 pygame.display.set_caption("Evolving AIs: Predator vs Prey")
 clock = pygame.time.Clock()
@@ -46,127 +86,113 @@ presentation_step = 0
 paused = args.presentation_mode
 show_stats = False
 
-simulation_data = {
-    "start_time": time.time(),
-    "frame_data": [],
-    "events": []
-}
 log_interval = FRAME_RATE
 last_save_time = time.time()
 save_interval = 30
 
-perf_logger = PerformanceLogger()
-vision_cast_count = 0
+if args.trace:
+    get_tracer().enable(args.trace_buffer)
+perf_logger = PerformanceLogger(spike_factor=args.spike_factor, max_spikes=args.max_spikes)
+perf_logger.watch_counter("sprite_cache_misses", lambda: get_sprite_cache().cache_misses)
+perf_logger.watch_counter("array_pool_allocations", lambda: get_vision_array_pool().allocations_made)
+checkpoint_writer = CheckpointWriter(args.checkpoint)
+last_checkpoint_time = time.time()
 
 def save_simulation_data():
     try:
-        with open("simulation_log.json", "w") as f:
-            json.dump(simulation_data, f, indent=2)
-        print(f"Simulation data saved to simulation_log.json ({len(simulation_data['events'])} events)")
+        sim.save_simulation_data("simulation_log.json")
+        print(f"Simulation data saved to simulation_log.json ({len(sim.simulation_data['events'])} events)")
         
         perf_logger.save_to_file()
         perf_logger.print_summary()
+        sim.analytics.print_summary()
     except Exception as e:
         print(f"Error saving simulation data: {e}")
 
+def save_checkpoint_on_exit():
+    try:
+        checkpoint_writer.wait()
+        checkpoint_writer.save_async(sim)
+        checkpoint_writer.wait()
+        print(f"Checkpoint saved to {args.checkpoint} (frame {sim.frame_count})")
+    except Exception as e:
+        print(f"Error saving checkpoint: {e}")
+
+def close_replay():
+    if replay_recorder is not None:
+        replay_recorder.close()
+        print(f"Replay saved to {args.record} ({replay_recorder.frames_recorded} frames, "
+              f"{replay_recorder.bytes_written / 1024:.0f} KB)")
+
+def export_trace():
+    if args.trace:
+        count = get_tracer().export(args.trace)
+        print(f"Trace saved to {args.trace} ({count} events) - open in ui.perfetto.dev")
+
 def signal_handler(sig, frame):
     print("\nSaving simulation data before exit...")
     save_simulation_data()
     pygame.quit()
     sys.exit(0)
 
+def stop_profiler():
+    profiler.stop(sim)
+
+profiler = FrameProfiler(args.profile_frames, args.profile_dir)
 signal.signal(signal.SIGINT, signal_handler)
+if hasattr(signal, "SIGUSR1"):
+    signal.signal(signal.SIGUSR1, profiler.request)  # kill -USR1 <pid> profiles the next frames
+atexit.register(export_trace)  # registered first so it runs last and sees the exit-time saves
+atexit.register(save_checkpoint_on_exit)
 atexit.register(save_simulation_data)
+atexit.register(close_replay)
+atexit.register(stop_profiler)
 title_font = pygame.font.Font(None, 84)
 subtitle_font = pygame.font.Font(None, 48)
 text_font = pygame.font.Font(None, 36)
 small_font = pygame.font.Font(None, 28)
 
 
-entities = []
-predators = []
-prey_list = []
-
-
-for _ in range(NUM_STARTING_PREY):
-    x, y = random.randint(100, SCREEN_WIDTH - 100), random.randint(100, SCREEN_HEIGHT - 100)
-    prey = Prey(x, y, generation=0, frame_rate=FRAME_RATE)
-    prey.fitness_stats['birth_frame'] = 0
-    entities.append(prey)
-    prey_list.append(prey)
-
-for _ in range(NUM_STARTING_PREDATORS):
-    x, y = random.randint(100, 1100), random.randint(100, 700)
-    predator = Predator(x, y, generation=0, frame_rate=FRAME_RATE)
-    predator.fitness_stats['birth_frame'] = 0
-    entities.append(predator)
-    predators.append(predator)
+sim = resumed_sim or Simulation(
+    SCREEN_WIDTH, SCREEN_HEIGHT, frame_rate=FRAME_RATE,
+    num_prey=NUM_STARTING_PREY, num_predators=NUM_STARTING_PREDATORS,
+    max_prey=MAX_PREY, vision_throttle=VISION_THROTTLE, grid_cell_size=GRID_CELL_SIZE,
+    seed=args.seed, vision_budget=args.vision_budget, neighbor_skin=args.neighbor_skin
+)
+sim.vision_scheduler.budget = args.vision_budget  # also applies to a resumed world
+sim.crowding = not args.no_crowding
+if sim.neighbor_skin != args.neighbor_skin:
+    sim.set_neighbor_skin(args.neighbor_skin)
+print(f"Seed: {sim.seed}")
+entities = sim.entities
+predators = sim.predators
+prey_list = sim.prey_list
+
+replay_recorder = None
+if args.record:
+    replay_recorder = ReplayRecorder(args.record, sim.width, sim.height, sim.frame_rate,
+                                     keyframe_interval=args.keyframe_interval)
+
+memory_tracker = MemoryTracker() if args.memory_interval > 0 else None
+last_memory_time = time.time()
+
+quality = QualityController(sim, FRAME_RATE, perf_logger=perf_logger) if args.adaptive_quality else None
+
+metrics_server = None
+if args.metrics_port is not None:
+    metrics_server = MetricsServer(args.metrics_port)
+    metrics_server.start()
+    print(f"Metrics at http://{metrics_server.host}:{metrics_server.port}/metrics")
 
 selected_entity = None
 show_debug_panel = False
-frame_count = 0
-grid = SpatialGrid(SCREEN_WIDTH, SCREEN_HEIGHT, cell_size=GRID_CELL_SIZE)
-
-for entity in entities:
-    grid.add_entity(entity)
-
-def log_simulation_data():
-    if frame_count % log_interval != 0:
-        return
-    
-    prey_generations = [p.generation for p in prey_list] if prey_list else [0]
-    pred_generations = [p.generation for p in predators] if predators else [0]
-    
-    prey_energies = [p.energy for p in prey_list] if prey_list else [0]
-    prey_max_speeds = [p.max_speed for p in prey_list] if prey_list else [0]
-    pred_max_speeds = [p.max_speed for p in predators] if predators else [0]
-    
-    frame_data = {
-        "frame": frame_count,
-        "time_seconds": frame_count // FRAME_RATE,
-        "populations": {
-            "prey_count": len(prey_list),
-            "predator_count": len(predators)
-        },
-        "generations": {
-            "prey_avg": sum(prey_generations) / len(prey_generations),
-            "prey_max": max(prey_generations),
-            "predator_avg": sum(pred_generations) / len(pred_generations),
-            "predator_max": max(pred_generations)
-        },
-        "traits": {
-            "prey_energy": {
-                "avg": sum(prey_energies) / len(prey_energies) if prey_energies else 0,
-                "min": min(prey_energies) if prey_energies else 0,
-                "max": max(prey_energies) if prey_energies else 0
-            },
-            "prey_speed": {
-                "avg": sum(prey_max_speeds) / len(prey_max_speeds) if prey_max_speeds else 0,
-                "min": min(prey_max_speeds) if prey_max_speeds else 0,
-                "max": max(prey_max_speeds) if prey_max_speeds else 0
-            },
-            "predator_speed": {
-                "avg": sum(pred_max_speeds) / len(pred_max_speeds) if pred_max_speeds else 0,
-                "min": min(pred_max_speeds) if pred_max_speeds else 0,
-                "max": max(pred_max_speeds) if pred_max_speeds else 0
-            }
-        }
-    }
-    
-    simulation_data["frame_data"].append(frame_data)
-    
-    # Periodic save to disk (much less frequent)
-    global last_save_time
-    current_time = time.time()
-    if current_time - last_save_time > save_interval:
-        save_simulation_data()
-        last_save_time = current_time
 
 running = True
 while running:
-    frame_count += 1
     perf_logger.log_frame_start()  # Track frame timing
-    vision_cast_count = 0  # Reset counter for this frame
+    profiler.frame_start(sim)
+    if quality is not None and not paused:
+        quality.update(perf_logger.last_frame_busy_ns)
     
     screen.fill((30, 30, 30))
 
@@ -196,153 +222,59 @@ while running:
                     paused = not paused
                 elif event.key == pygame.K_s:
                     show_stats = not show_stats
+                elif event.key == pygame.K_F9:
+                    profiler.request()
+    perf_logger.lap("events")
 
     # Only update simulation when not paused
     if not paused:
-        if frame_count % VISION_THROTTLE == 0:
-            for e in entities:
-                neighbors = grid.get_neighbors(e, radius=e.view_range)
-                nearby = []
-
-                view_range_sq = e.view_range * e.view_range
-                detect_type = Predator if isinstance(e, Prey) else Prey if isinstance(e, Predator) else None
-
-                for o in neighbors:
-                    if o is e:
-                        continue
-                    if detect_type and not isinstance(o, detect_type):
-                        continue
-                    dx = o.x - e.x
-                    dy = o.y - e.y
-                    if dx * dx + dy * dy <= view_range_sq + o.radius * o.radius:
-                        nearby.append(o)
-
-                e.cast_vision(nearby)
-                vision_cast_count += 1
-
-        new_entities = []
-        removed_prey = []
-        for e in entities:
-            if isinstance(e, Prey):
-                e.age += 1
-                death_reason = e.update(grid)
-                # Update grid position if entity moved
-                grid.update_entity(e)
-                
-                # Check for natural death
-                if death_reason:
-                    e.update_fitness_stats(frame_count)
-                    fitness_score = e.calculate_prey_fitness()
-                    simulation_data["events"].append([
-                        frame_count, "death_natural", e.id, e.generation,
-                        e.age // FRAME_RATE, int(e.energy), e.children_spawned, death_reason, int(fitness_score)
-                    ])
-                    removed_prey.append(e)
-                    continue
-                    
-                if e.should_reproduce():
-                    # Check current prey count + already planned births this frame
-                    total_prey_planned = len(prey_list) + len([x for x in new_entities if x.entity_type == "prey"])
-                    if total_prey_planned >= MAX_PREY:
-                        continue
-                    child = e.clone()
-                    child.fitness_stats['birth_frame'] = frame_count
-                    new_entities.append(child)
-                    e.children_spawned += 1
-                    e.time_at_max_energy = 0
-            elif isinstance(e, Predator):
-                outcome, target = e.update(frame_count, grid)
-                # Update grid position if entity moved
-                grid.update_entity(e)
-                if outcome == "eat":
-                    # Log hunt success - compact format
-                    simulation_data["events"].append([
-                        frame_count, "hunt", e.id, e.generation, 
-                        len([p for p in target if p in entities])
-                    ])
-                    for p in target:
-                        if p in entities:
-                            removed_prey.append(p)
-                elif outcome == "reproduce":
-                    if target in entities:
-                        removed_prey.append(target)
-                    child = e.clone()
-                    child.fitness_stats['birth_frame'] = frame_count
-                    e.children_spawned += 1
-                    new_entities.append(child)
-                elif outcome == "die":
-                    # Log predator death with fitness - compact format  
-                    target.update_fitness_stats(frame_count)
-                    fitness_score = target.calculate_predator_fitness()
-                    simulation_data["events"].append([
-                        frame_count, "death_pred", target.id, target.generation,
-                        target.age // FRAME_RATE, target.prey_eaten, int(fitness_score)
-                    ])
-                    # Remove from grid before removing from lists
-                    grid.remove_entity(target)
-                    if target in predators:
-                        predators.remove(target)
-                    if target in entities:
-                        entities.remove(target)
-
-        # Log prey death events with fitness - compact format
-        for p in removed_prey:
-            p.update_fitness_stats(frame_count)
-            fitness_score = p.calculate_prey_fitness()
-            simulation_data["events"].append([
-                frame_count, "death_prey", p.id, p.generation,
-                p.age // FRAME_RATE, int(p.energy), p.children_spawned, int(fitness_score)
-            ])
-            # Remove from grid before removing from lists
-            grid.remove_entity(p)
-            if p in prey_list:
-                prey_list.remove(p)
-            if p in entities:
-                entities.remove(p)
-
-        # Log birth events - compact format
-        for child in new_entities:
-            birth_event = [
-                frame_count, "birth_prey" if isinstance(child, Prey) else "birth_pred",
-                child.id, child.parent_id, child.generation
-            ]
-            # Add mutations if any significant ones occurred
-            if hasattr(child, 'mutations') and child.mutations:
-                birth_event.append(child.mutations)
-            simulation_data["events"].append(birth_event)
-
-        for n in new_entities:
-            entities.append(n)
-            # Add new entity to grid
-            grid.add_entity(n)
-            if isinstance(n, Prey):
-                prey_list.append(n)
-            else:
-                predators.append(n)
-                
-        # Log simulation data
-        log_simulation_data()
-        
+        sim.step()
+        perf_logger.add_phase_times(sim.phase_times_ns)
+        perf_logger.set_frame_state(sim_frame=sim.frame_count, prey=len(prey_list), predators=len(predators),
+                                    births=sim.births_last_step, deaths=sim.deaths_last_step)
+        if replay_recorder is not None:
+            replay_recorder.record_frame(sim)
+
+        # Periodic save to disk (much less frequent)
+        if sim.frame_count % log_interval == 0 and time.time() - last_save_time > save_interval:
+            save_simulation_data()
+            perf_logger.note_activity("simulation_save")
+            last_save_time = time.time()
+
+        # Periodic checkpoint: snapshot here, serialize and write on a background thread
+        if (args.checkpoint_interval > 0 and sim.frame_count % log_interval == 0
+                and time.time() - last_checkpoint_time > args.checkpoint_interval):
+            if checkpoint_writer.save_async(sim):
+                perf_logger.note_activity("checkpoint_snapshot")
+                last_checkpoint_time = time.time()
+        if checkpoint_writer.busy:
+            perf_logger.note_activity("checkpoint_writing")
+
         # Log performance data every log_interval frames
-        if frame_count % log_interval == 0:
+        if sim.frame_count % log_interval == 0:
             current_fps = clock.get_fps()
             sprite_cache = get_sprite_cache()
             cache_stats = sprite_cache.get_cache_stats()
             array_pool = get_vision_array_pool()
             pool_stats = array_pool.get_pool_stats()
+            memory = None
+            if memory_tracker is not None and time.time() - last_memory_time >= args.memory_interval:
+                memory = memory_tracker.sample(sim)
+                last_memory_time = time.time()
             perf_logger.log_performance_sample(
-                frame_count, current_fps, len(prey_list), len(predators),
-                entities_drawn=len(entities), vision_casts=vision_cast_count,
-                sprite_cache_stats=cache_stats, array_pool_stats=pool_stats
+                sim.frame_count, current_fps, len(prey_list), len(predators),
+                entities_drawn=len(entities), vision_casts=sim.vision_cast_count,
+                sprite_cache_stats=cache_stats, array_pool_stats=pool_stats,
+                work_counters=get_work_counters().collect(), memory=memory
             )
-
-        if frame_count % 5 == 0:
-            for e in entities:
-                neighbors = grid.get_neighbors(e)
-                e.resolve_collisions(neighbors)
+            perf_logger.note_activity("performance_sample")
+            if metrics_server is not None:
+                metrics_server.publish(sim, perf_logger, current_fps, cache_stats, pool_stats)
+        perf_logger.lap("saving")
 
     for e in entities:
         e.draw(screen, selected=(e == selected_entity))
+    perf_logger.lap("drawing")
 
     if selected_entity:
         lines = [
@@ -350,10 +282,10 @@ while running:
         ]
         if isinstance(selected_entity, Prey):
             energy_percent = 0
-            if frame_count - last_info_update_time > FRAME_RATE:
+            if sim.frame_count - last_info_update_time > FRAME_RATE:
                 displayed_energy = round(selected_entity.energy)
                 energy_percent = (displayed_energy / selected_entity.max_energy) * 100
-                last_info_update_time = frame_count
+                last_info_update_time = sim.frame_count
 
             lines += [
                 f"Energy: {displayed_energy} / {selected_entity.max_energy} ({energy_percent:.0f}%)",
@@ -547,8 +479,11 @@ while running:
             stats_text = [
                 f"Prey: {len(prey_list)} | Predators: {len(predators)}",
                 f"Avg Generation - Prey: {avg_prey_gen:.1f} | Predators: {avg_pred_gen:.1f}",
-                f"Time: {frame_count // FRAME_RATE}s"
+                f"Max Generation - Prey: {sim.analytics.max_generation['prey']} | Predators: {sim.analytics.max_generation['predator']}",
+                f"Time: {sim.frame_count // FRAME_RATE}s"
             ]
+            if quality is not None:
+                stats_text.append(f"Quality: {quality.level_name}")
             
             # Semi-transparent background
             stats_panel_height = len(stats_text) * 22 + 12
@@ -561,7 +496,10 @@ while running:
                 stat_surface = small_font.render(stat, True, (200, 255, 200))
                 screen.blit(stat_surface, (SCREEN_WIDTH - 420, 26 + i * 22))
 
+    perf_logger.lap("overlay")
+
     pygame.display.flip()
+    perf_logger.lap("flip")
     clock.tick(FRAME_RATE)
 
 pygame.quit()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Memory Tracker for Evolution Simulation
+Periodic memory samples for finding growth in long runs: process RSS, the top
+tracemalloc allocation sites by growth since the previous sample, and explicit sizes
+of the structures that can grow without bound (event log, frame data, sprite cache,
+vision array pools, analytics records) plus live vs reachable entity and brain counts
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Dict, Any, Optional
+
+from sprite_cache import get_sprite_cache
+from vision_array_pool import get_vision_array_pool
+from entities.base_entity import BaseEntity
+from entities.neural_network import NeuralNetwork
+
+TOP_ALLOCATIONS = 10   # Allocation sites reported per sample
+
+
+def get_rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux /proc), falling back to the peak from getrusage"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024   # bytes on macOS, KB elsewhere
+    except ImportError:
+        return None
+
+
+class MemoryTracker:
+    """Takes memory samples; tracemalloc runs from the first sample until stop()
+
+    Tracing starts at the first sample rather than at import: allocations made while
+    Numba compiles the kernels would otherwise add hundreds of thousands of traces and
+    make every snapshot take seconds. Growth after warmup is what matters for leaks.
+    """
+
+    def __init__(self, top=TOP_ALLOCATIONS, trace_frames=1):
+        """Initialize tracker
+
+        Args:
+            top: Allocation sites listed per sample, by growth since the previous sample
+            trace_frames: Stack depth tracemalloc stores per allocation (1 is cheapest)
+        """
+        self.top = top
+        self.trace_frames = trace_frames
+        self._previous_snapshot = None
+
+    def _allocation_growth(self) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        snapshot = tracemalloc.take_snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        growth = []
+        if self._previous_snapshot is not None:
+            stats = [stat for stat in snapshot.compare_to(self._previous_snapshot, "lineno")
+                     if stat.traceback[0].filename != tracemalloc.__file__]
+            for stat in stats[:self.top]:
+                frame = stat.traceback[0]
+                growth.append({
+                    "site": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                    "size_kb": round(stat.size / 1024, 1),
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff
+                })
+        self._previous_snapshot = snapshot
+        return {"traced_mb": round(traced / 2**20, 2), "peak_mb": round(peak / 2**20, 2), "top_growth": growth}
+
+    def sample(self, sim) -> Dict[str, Any]:
+        """One memory sample for a Simulation (walks the GC heap; take it every few seconds at most)"""
+        # Entities and brains reachable anywhere vs those in the world: a growing gap is a leak
+        reachable_entities = reachable_brains = 0
+        for obj in gc.get_objects():
+            if isinstance(obj, BaseEntity):
+                reachable_entities += 1
+            elif isinstance(obj, NeuralNetwork):
+                reachable_brains += 1
+
+        sprite_cache = get_sprite_cache()
+        array_pool = get_vision_array_pool()
+        data = sim.simulation_data
+        rss = get_rss_bytes()
+        return {
+            "rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+            "tracemalloc": self._allocation_growth(),
+            "structures": {
+                "events": len(data["events"]),
+                "frame_data": len(data["frame_data"]),
+                "analytics_records": len(sim.analytics.records),
+                "sprite_cache_entries": len(sprite_cache.cache),
+                "sprite_cache_kb": round(sprite_cache.measure_memory_usage() / 1024, 1),
+                "array_pool_arrays": array_pool.get_pool_stats()["pooled_arrays"],
+                "array_pool_kb": round(array_pool.pooled_bytes() / 1024, 1)
+            },
+            "entities": {
+                "live": len(sim.entities),
+                "reachable": reachable_entities,
+                "reachable_brains": reachable_brains
+            }
+        }
+
+    def stop(self):
+        tracemalloc.stop()
+        self._previous_snapshot = None
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Prometheus Metrics Endpoint for Evolution Simulation
+Serves FPS, steps/s, populations, generation stats, cache hit rates and phase timings
+in Prometheus text format from a background thread. The simulation thread formats a
+snapshot and swaps it in whole; scrapes only read the latest snapshot, so they never
+touch simulation state or block the main loop.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_PORT = 9108
+FRAME_QUANTILES = (50, 90, 99, 99.9)
+
+
+class _MetricsWriter:
+    """Collects samples grouped under HELP/TYPE headers"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def metric(self, name: str, kind: str, help_text: str, samples: List[tuple]):
+        """samples: (labels dict or None, value)"""
+        self.lines.append(f"# HELP evosim_{name} {help_text}")
+        self.lines.append(f"# TYPE evosim_{name} {kind}")
+        for labels, value in samples:
+            label_text = ""
+            if labels:
+                label_text = "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+            # Counts stay exact integers; long-running counters must not lose precision
+            text = str(value) if isinstance(value, int) else repr(round(float(value), 6))
+            self.lines.append(f"evosim_{name}{label_text} {text}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def format_metrics(sim, perf_logger, fps: float, steps_per_second: float,
+                   sprite_cache_stats: Optional[Dict[str, Any]] = None,
+                   array_pool_stats: Optional[Dict[str, Any]] = None) -> str:
+    """Prometheus text exposition of a Simulation and its PerformanceLogger"""
+    out = _MetricsWriter()
+    out.metric("fps", "gauge", "Frames per second (pygame clock)", [(None, fps)])
+    out.metric("fps_rolling", "gauge", "Rolling average frames per second",
+               [(None, perf_logger.get_recent_avg_fps(1))])
+    out.metric("steps_per_second", "gauge", "Simulation steps per second since the last publish",
+               [(None, steps_per_second)])
+    out.metric("steps_total", "counter", "Simulation steps taken", [(None, sim.frame_count)])
+
+    species = {"prey": sim.prey_list, "predator": sim.predators}
+    out.metric("population", "gauge", "Living entities",
+               [({"species": s}, len(group)) for s, group in species.items()])
+    out.metric("generation_mean", "gauge", "Mean generation of living entities",
+               [({"species": s}, sum(e.generation for e in group) / len(group) if group else 0)
+                for s, group in species.items()])
+    analytics = sim.analytics
+    out.metric("generation_max", "gauge", "Highest generation born",
+               [({"species": s}, analytics.max_generation[s]) for s in species])
+    out.metric("births_total", "counter", "Births recorded",
+               [({"species": s}, sum(analytics.generation_counts[s].values())) for s in species])
+
+    if sprite_cache_stats is not None:
+        out.metric("sprite_cache_hit_ratio", "gauge", "Sprite cache hit rate",
+                   [(None, sprite_cache_stats["hit_rate"])])
+        out.metric("sprite_cache_misses_total", "counter", "Sprite cache misses",
+                   [(None, sprite_cache_stats["cache_misses"])])
+    if array_pool_stats is not None:
+        out.metric("array_pool_reuse_ratio", "gauge", "Vision array pool reuse rate",
+                   [(None, array_pool_stats["reuse_rate"])])
+        out.metric("array_pool_allocations_total", "counter", "Vision arrays allocated outside the pool",
+                   [(None, array_pool_stats["allocations_made"])])
+
+    phase_stats = perf_logger.get_phase_stats()
+    out.metric("phase_seconds", "gauge", "Rolling average time per frame in each phase",
+               [({"phase": p}, s["avg"] / 1e3) for p, s in phase_stats.items()])
+    out.metric("phase_seconds_total", "counter", "Total time spent in each phase",
+               [({"phase": p}, ns / 1e9) for p, ns in perf_logger.phase_totals_ns.items()])
+    frame = perf_logger.frame_histogram
+    if frame.total_count:
+        out.metric("frame_seconds", "summary", "Frame time over the run",
+                   [({"quantile": f"{q / 100:g}"}, frame.percentile(q) / 1e9) for q in FRAME_QUANTILES])
+        out.lines.append(f"evosim_frame_seconds_sum {round(frame.total_ns / 1e9, 6)!r}")
+        out.lines.append(f"evosim_frame_seconds_count {frame.total_count}")
+    out.metric("frame_spikes_total", "counter", "Frames over the spike threshold",
+               [(None, perf_logger.spike_count)])
+    return out.text()
+
+
+class MetricsServer:
+    """HTTP endpoint on a daemon thread serving the most recently published snapshot"""
+
+    def __init__(self, port: int = DEFAULT_PORT, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = port
+        # Replaced wholesale by publish(); rebinding a reference is atomic, so readers need no lock
+        self._snapshot = b"# no snapshot published yet\n"
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._last_publish = None   # (time, frame_count) for steps/s
+
+    def start(self):
+        server_ref = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = server_ref._snapshot
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True, name="metrics-server").start()
+
+    def publish(self, sim, perf_logger, fps: float, sprite_cache_stats: Optional[Dict[str, Any]] = None,
+                array_pool_stats: Optional[Dict[str, Any]] = None):
+        """Format a snapshot on the caller's thread and swap it in"""
+        now = time.perf_counter()
+        steps_per_second = 0.0
+        if self._last_publish is not None and now > self._last_publish[0]:
+            steps_per_second = (sim.frame_count - self._last_publish[1]) / (now - self._last_publish[0])
+        self._last_publish = (now, sim.frame_count)
+        text = format_metrics(sim, perf_logger, fps, steps_per_second, sprite_cache_stats, array_pool_stats)
+        self._snapshot = text.encode("utf-8")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
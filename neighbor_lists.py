@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Verlet Neighbour Lists for Evolution Simulation
+Caches each observer's candidates for a (radius, species) query across frames. Every
+entity has an anchor, its position when last anchored. A list holds the entities whose
+anchor lies within radius + skin of the observer's anchor. While every entity stays
+within skin / 2 of its anchor, that list is a superset of everything within radius.
+Distances are minimum-image when the grid wraps.
+An entity that moves further is re-anchored: its own lists are dropped, and it is
+removed from or inserted into other observers' lists as needed. Births and deaths
+update only the lists they touch, so the grid is queried only on those events.
+"""
+
+from typing import Dict, List
+
+from work_counters import get_work_counters
+
+NEIGHBOR_SKIN = 40.0   # Extra reach cached beyond the query radius (px)
+
+_work = get_work_counters()
+
+
+class VerletNeighborLists:
+    """Grid wrapper with the SpatialGrid interface that answers get_neighbors from cached lists"""
+
+    def __init__(self, grid, skin=NEIGHBOR_SKIN):
+        """Initialize lists
+
+        Args:
+            grid: SpatialGrid (or HierarchicalGrid) kept in sync through this wrapper
+            skin: Extra reach cached per list; larger skins rebuild less often but hold
+                more candidates per list
+        """
+        self.grid = grid
+        self.skin = skin
+        self.half_skin_sq = (skin / 2) ** 2
+        self.anchors: Dict[int, tuple] = {}       # entity id -> (x, y) when last anchored
+        self.lists: Dict[tuple, Dict] = {}        # (observer id, radius, species) -> {id: entity}
+        self.observer_keys: Dict[int, List] = {}  # observer id -> keys of its lists
+        self.listed_in: Dict[int, set] = {}       # member id -> keys of lists holding it
+        # Species listed -> {observer species: largest radius any of its lists uses}
+        self.max_radius: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def cell_size(self):
+        return self.grid.cell_size
+
+    @property
+    def periodic(self):
+        return self.grid.periodic
+
+    def clear(self):
+        self.grid.clear()
+        self.anchors.clear()
+        self.lists.clear()
+        self.observer_keys.clear()
+        self.listed_in.clear()
+        self.max_radius.clear()
+
+    def add_entity(self, entity):
+        self.grid.add_entity(entity)
+        self.anchors[entity.id] = (entity.x, entity.y)
+        self._insert(entity)
+
+    def remove_entity(self, entity):
+        self.grid.remove_entity(entity)
+        self._drop_lists(entity.id)
+        lists = self.lists
+        for key in self.listed_in.pop(entity.id, ()):
+            del lists[key][entity.id]
+        self.anchors.pop(entity.id, None)
+
+    def update_entity(self, entity):
+        """Update the grid and re-anchor the entity if it left its skin"""
+        self.grid.update_entity(entity)
+        anchor = self.anchors.get(entity.id)
+        if anchor is None:
+            self.anchors[entity.id] = (entity.x, entity.y)
+            self._insert(entity)
+            return
+        if self._moved_sq(entity, anchor) > self.half_skin_sq:
+            self._reanchor(entity)
+
+    def _moved_sq(self, entity, anchor):
+        """Squared minimum-image distance from the anchor (wrapping an edge is not a jump)"""
+        period_x, period_y, half_x, half_y = self.grid.periodic
+        dx = entity.x - anchor[0]
+        dy = entity.y - anchor[1]
+        dx -= period_x * (dx > half_x) - period_x * (dx < -half_x)
+        dy -= period_y * (dy > half_y) - period_y * (dy < -half_y)
+        return dx * dx + dy * dy
+
+    def get_neighbors(self, entity, radius=None, species=None):
+        """Cached superset of the entities within radius of entity (excluding itself)"""
+        anchor = self.anchors.get(entity.id)
+        if anchor is None:
+            return self.grid.get_neighbors(entity, radius=radius, species=species)
+        if self._moved_sq(entity, anchor) > self.half_skin_sq:
+            # Moved this frame but not yet passed through update_entity
+            self._reanchor(entity)
+        radius = radius or self.grid.cell_size * 1.5  # fallback
+        key = (entity.id, radius, species)
+        members = self.lists.get(key)
+        if members is None:
+            members = self._build(entity, key)
+        elif _work.enabled:
+            _work.neighbor_list_reuses += 1
+        return list(members.values())
+
+    def _build(self, entity, key):
+        _, radius, species = key
+        ax, ay = self.anchors[entity.id]
+        reach = radius + self.skin
+        reach_sq = reach * reach
+        anchors = self.anchors
+        listed_in = self.listed_in
+        period_x, period_y, half_x, half_y = self.grid.periodic
+        members = {}
+        # Anchors within reach are within reach + skin of the current positions
+        for o in self.grid.get_neighbors(entity, radius=reach + self.skin, species=species):
+            if o is entity or (species is not None and o.entity_type != species):
+                continue
+            a = anchors[o.id]
+            dx = a[0] - ax
+            dy = a[1] - ay
+            dx -= period_x * (dx > half_x) - period_x * (dx < -half_x)
+            dy -= period_y * (dy > half_y) - period_y * (dy < -half_y)
+            if dx * dx + dy * dy <= reach_sq:
+                members[o.id] = o
+                listed_in.setdefault(o.id, set()).add(key)
+        self.lists[key] = members
+        self.observer_keys.setdefault(entity.id, []).append(key)
+        by_observer = self.max_radius.setdefault(species, {})
+        if radius > by_observer.get(entity.entity_type, 0):
+            by_observer[entity.entity_type] = radius
+        if _work.enabled:
+            _work.neighbor_list_builds += 1
+        return members
+
+    def _drop_lists(self, entity_id):
+        """Forget an observer's lists (they are rebuilt on next use)"""
+        listed_in = self.listed_in
+        for key in self.observer_keys.pop(entity_id, ()):
+            for member_id in self.lists.pop(key):
+                listed_in[member_id].discard(key)
+
+    def _reanchor(self, entity):
+        self._drop_lists(entity.id)
+        ax, ay = self.anchors[entity.id] = (entity.x, entity.y)
+        keys = self.listed_in.get(entity.id)
+        if keys:
+            anchors = self.anchors
+            skin = self.skin
+            period_x, period_y, half_x, half_y = self.grid.periodic
+            for key in list(keys):
+                observer_anchor = anchors[key[0]]
+                dx = observer_anchor[0] - ax
+                dy = observer_anchor[1] - ay
+                dx -= period_x * (dx > half_x) - period_x * (dx < -half_x)
+                dy -= period_y * (dy > half_y) - period_y * (dy < -half_y)
+                reach = key[1] + skin
+                if dx * dx + dy * dy > reach * reach:
+                    del self.lists[key][entity.id]
+                    keys.discard(key)
+        self._insert(entity)
+        if _work.enabled:
+            _work.neighbor_list_reanchors += 1
+
+    def _insert(self, entity):
+        """Add a (re-)anchored entity to the existing lists whose reach now covers it"""
+        entity_id = entity.id
+        ax, ay = self.anchors[entity_id]
+        anchors = self.anchors
+        lists = self.lists
+        observer_keys = self.observer_keys
+        skin = self.skin
+        period_x, period_y, half_x, half_y = self.grid.periodic
+        for listed_species in (entity.entity_type, None):
+            for observer_species, max_radius in self.max_radius.get(listed_species, {}).items():
+                for observer in self.grid.get_neighbors(entity, radius=max_radius + 2 * skin,
+                                                        species=observer_species):
+                    keys = observer_keys.get(observer.id)
+                    if not keys or observer is entity:
+                        continue
+                    observer_anchor = anchors[observer.id]
+                    dx = observer_anchor[0] - ax
+                    dy = observer_anchor[1] - ay
+                    dx -= period_x * (dx > half_x) - period_x * (dx < -half_x)
+                    dy -= period_y * (dy > half_y) - period_y * (dy < -half_y)
+                    dist_sq = dx * dx + dy * dy
+                    for key in keys:
+                        if key[2] != listed_species:
+                            continue
+                        reach = key[1] + skin
+                        members = lists[key]
+                        if dist_sq <= reach * reach and entity_id not in members:
+                            members[entity_id] = entity
+                            self.listed_in.setdefault(entity_id, set()).add(key)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep Runner for Evolution Simulation
+Runs every combination of a parameter grid headless in a process pool and
+collects final and time-series metrics into one results file
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Any
+
+import entities.prey as prey_module
+import entities.predator as predator_module
+from latency_histogram import LatencyHistogram, merge_histogram_sets
+from simulation import Simulation, STEP_PHASES
+
+# Sweepable parameters: name -> (target, attribute)
+# "sim" targets are Simulation constructor arguments; modules are patched per run
+SWEEP_PARAMETERS = {
+    "MAX_PREY": ("sim", "max_prey"),
+    "VISION_THROTTLE": ("sim", "vision_throttle"),
+    "GRID_CELL_SIZE": ("sim", "grid_cell_size"),
+    "COLLISION_INTERVAL": ("sim", "collision_interval"),
+    "VISION_BUDGET": ("sim", "vision_budget"),
+    "NEIGHBOR_SKIN": ("sim", "neighbor_skin"),
+    "WRAP_WORLD": ("sim", "wrap"),
+    "CROWDING": ("sim", "crowding"),
+    "NUM_STARTING_PREY": ("sim", "num_prey"),
+    "NUM_STARTING_PREDATORS": ("sim", "num_predators"),
+    "REQUIRED_EATS_TO_REPRODUCE": (predator_module, "REQUIRED_EATS_TO_REPRODUCE"),
+    "PREDATOR_VIEW_RANGE": (predator_module, "VIEW_RANGE"),
+    "ENERGY_REGEN_RATE": (prey_module, "ENERGY_REGEN_RATE"),
+    "PREY_VIEW_RANGE": (prey_module, "VIEW_RANGE"),
+}
+
+# Module defaults captured at import so a reused pool worker never leaks a previous run's values
+MODULE_DEFAULTS = {
+    name: getattr(target, attr)
+    for name, (target, attr) in SWEEP_PARAMETERS.items() if target != "sim"
+}
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of a {parameter: [values]} grid"""
+    unknown = [name for name in grid if name not in SWEEP_PARAMETERS]
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(unknown)} "
+                         f"(known: {', '.join(SWEEP_PARAMETERS)})")
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def apply_module_parameters(config: Dict[str, Any]):
+    """Reset patched module constants to their defaults, then apply this run's overrides"""
+    for name, default in MODULE_DEFAULTS.items():
+        target, attr = SWEEP_PARAMETERS[name]
+        setattr(target, attr, config.get(name, default))
+
+
+def run_configuration(run_index: int, config: Dict[str, Any], seed: int,
+                      frames: int, output_dir: str) -> Dict[str, Any]:
+    """Pool worker: run one configuration headless and return compact metrics"""
+    apply_module_parameters(config)
+
+    sim_kwargs = {SWEEP_PARAMETERS[name][1]: value
+                  for name, value in config.items() if SWEEP_PARAMETERS[name][0] == "sim"}
+    run_dir = os.path.join(output_dir, f"run_{run_index:03d}")
+    os.makedirs(run_dir, exist_ok=True)
+
+    sim = Simulation(seed=seed, **sim_kwargs)
+    histograms = {name: LatencyHistogram() for name in ("step",) + STEP_PHASES}
+    step_histogram = histograms["step"]
+    start = time.perf_counter()
+    for _ in range(frames):
+        step_start = time.perf_counter_ns()
+        sim.step()
+        step_histogram.record(time.perf_counter_ns() - step_start)
+        for phase, ns in sim.phase_times_ns.items():
+            histograms[phase].record(ns)
+    elapsed = time.perf_counter() - start
+
+    sim.save_simulation_data(os.path.join(run_dir, "simulation_log.json"))
+    with open(os.path.join(run_dir, "config.json"), "w") as f:
+        json.dump({"config": config, "seed": seed, "frames": frames}, f, indent=2)
+
+    summary = sim.analytics.get_summary()
+    return {
+        "run_index": run_index,
+        "config": config,
+        "seed": seed,
+        "run_dir": run_dir,
+        "worker_pid": os.getpid(),
+        "frames": frames,
+        "elapsed_seconds": elapsed,
+        "steps_per_second": frames / elapsed if elapsed > 0 else 0,
+        "latency_ms": {name: h.summary_ms() for name, h in histograms.items()},
+        "histograms": {name: h.to_dict() for name, h in histograms.items()},
+        "final": {
+            "prey_count": len(sim.prey_list),
+            "predator_count": len(sim.predators),
+            "generation_spread": summary["generation_spread"],
+            "mutation_overview": summary["mutation_overview"],
+            "deaths": summary["deaths"],
+            "hunting": summary["hunting"],
+            "lineage": summary["lineage"]
+        },
+        "time_series": [
+            [fd["frame"], fd["populations"]["prey_count"], fd["populations"]["predator_count"],
+             fd["generations"]["prey_max"], fd["generations"]["predator_max"]]
+            for fd in sim.simulation_data["frame_data"]
+        ]
+    }
+
+
+def summarize_workers(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate throughput per pool worker process"""
+    workers = {}
+    for run in runs:
+        worker = workers.setdefault(str(run["worker_pid"]), {"runs": 0, "frames": 0, "elapsed_seconds": 0.0})
+        worker["runs"] += 1
+        worker["frames"] += run["frames"]
+        worker["elapsed_seconds"] += run["elapsed_seconds"]
+    for worker in workers.values():
+        worker["steps_per_second"] = worker["frames"] / worker["elapsed_seconds"] if worker["elapsed_seconds"] > 0 else 0
+    return workers
+
+
+def summarize_latency(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge step/phase histograms across repeats of each configuration and across all runs"""
+    by_config = {}
+    for run in runs:
+        key = json.dumps(run["config"], sort_keys=True)
+        by_config.setdefault(key, {"config": run["config"], "sets": []})["sets"].append(run["histograms"])
+
+    def percentiles(sets):
+        merged = merge_histogram_sets(sets)
+        return {name: LatencyHistogram.from_dict(data).summary_ms() for name, data in merged.items()}
+
+    return {
+        "overall_ms": percentiles([run["histograms"] for run in runs]),
+        "by_config": [{"config": entry["config"], "runs": len(entry["sets"]), "latency_ms": percentiles(entry["sets"])}
+                      for entry in by_config.values()]
+    }
+
+
+def run_sweep(grid: Dict[str, List[Any]], frames: int, repeats: int = 1, base_seed: int = 0,
+              output_dir: str = "sweep_results", max_workers: int = None) -> Dict[str, Any]:
+    """Run every grid configuration (times repeats) in a process pool"""
+    configs = expand_grid(grid)
+    jobs = [(i * repeats + r, config, base_seed + i * repeats + r)
+            for i, config in enumerate(configs) for r in range(repeats)]
+    os.makedirs(output_dir, exist_ok=True)
+
+    wall_start = time.perf_counter()
+    runs = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_configuration, index, config, seed, frames, output_dir)
+                   for index, config, seed in jobs]
+        for future in as_completed(futures):
+            run = future.result()
+            runs.append(run)
+            print(f"Run {run['run_index']:03d} {run['config']} seed={run['seed']}: "
+                  f"{run['steps_per_second']:.1f} steps/s, final prey={run['final']['prey_count']} "
+                  f"predators={run['final']['predator_count']}")
+    runs.sort(key=lambda r: r["run_index"])
+    wall_time = time.perf_counter() - wall_start
+
+    results = {
+        "metadata": {
+            "grid": grid,
+            "frames_per_run": frames,
+            "repeats": repeats,
+            "base_seed": base_seed,
+            "wall_time_seconds": wall_time,
+            "total_steps_per_second": sum(r["frames"] for r in runs) / wall_time if wall_time > 0 else 0,
+            "time_series_columns": ["frame", "prey_count", "predator_count", "prey_max_gen", "pred_max_gen"]
+        },
+        "workers": summarize_workers(runs),
+        "latency": summarize_latency(runs),
+        "runs": runs
+    }
+    results_file = os.path.join(output_dir, "sweep_results.json")
+    with open(results_file, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSweep results saved to: {results_file}")
+    return results
+
+
+def parse_value(text: str):
+    """Parse a CLI grid value as a bool (true/false), int or float, falling back to the raw string"""
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless parameter sweep for the evolution simulation')
+    parser.add_argument('--grid', help='JSON file with {"PARAMETER": [values, ...]}')
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=V1,V2',
+                        help='Grid axis on the command line (repeatable)')
+    parser.add_argument('--frames', type=int, default=3600, help='Frames to simulate per run')
+    parser.add_argument('--repeats', type=int, default=1, help='Runs per configuration (different seeds)')
+    parser.add_argument('--seed', type=int, default=0, help='Base seed; run i uses seed + i')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default='sweep_results', help='Directory for per-run logs and results')
+    args = parser.parse_args()
+
+    grid = {}
+    if args.grid:
+        with open(args.grid, 'r') as f:
+            grid.update(json.load(f))
+    for spec in args.param:
+        name, _, values = spec.partition('=')
+        grid[name] = [parse_value(v) for v in values.split(',')]
+    if not grid:
+        parser.error("Provide a parameter grid with --grid or --param")
+
+    try:
+        run_sweep(grid, args.frames, args.repeats, args.seed, args.output_dir, args.workers)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,69 @@ Performance Logger for Evolution Simulation
 Tracks frame rates, population sizes, and performance metrics
 """
 
+import gc
 import json
 import time
+from time import perf_counter_ns
 import sys
 import os
 from collections import deque
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable
+
+from latency_histogram import LatencyHistogram, merge_histogram_sets
+from frame_tracer import get_tracer
 
 # Import centralized frame rate constant
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
-    from main import FRAME_RATE
+    from simulation import FRAME_RATE
 except ImportError:
     FRAME_RATE = 60  # Fallback if import fails
 
+# Frame phases in main-loop order; vision through collisions come from Simulation.step
+FRAME_PHASES = ("events", "vision", "update", "bookkeeping", "logging", "collisions",
+                "saving", "drawing", "overlay", "flip")
+PHASE_WINDOW = 60  # Frames in the rolling per-phase window
+SPIKE_FACTOR = 3.0        # Frames slower than this multiple of the target frame time are spikes
+MAX_SPIKE_RECORDS = 50    # Most recent spike records kept in the log
+
 class PerformanceLogger:
-    def __init__(self, log_file="performance_log.json"):
+    def __init__(self, log_file="performance_log.json", spike_factor=SPIKE_FACTOR,
+                 max_spikes=MAX_SPIKE_RECORDS):
         self.log_file = log_file
         self.start_time = time.time()
         self.frame_times = deque(maxlen=60)  # Last 60 frame times for rolling average
         self.last_frame_time = time.time()
-        
+
+        # Phase timing: lap() charges the time since the previous lap to a phase
+        self.phase_windows = {phase: deque(maxlen=PHASE_WINDOW) for phase in FRAME_PHASES}
+        self.phase_totals_ns = dict.fromkeys(FRAME_PHASES, 0)
+        self.timed_frames = 0
+        self._frame_phases_ns = dict.fromkeys(FRAME_PHASES, 0)
+        self._lap_ns = perf_counter_ns()
+        self.last_frame_busy_ns = 0   # Sum of the last frame's phases (frame time minus the tick sleep)
+
+        # Latency histograms: the interval set feeds each sample, then folds into the run totals
+        self.frame_histogram = LatencyHistogram()
+        self.phase_histograms = {phase: LatencyHistogram() for phase in FRAME_PHASES}
+        self.interval_frame_histogram = LatencyHistogram()
+        self.interval_phase_histograms = {phase: LatencyHistogram() for phase in FRAME_PHASES}
+        self._frame_start_ns = None
+
+        # Spike detection: a frame over the threshold gets a diagnostic record of what ran in it
+        self.spike_threshold_ns = int(spike_factor * 1e9 / FRAME_RATE) if spike_factor else None
+        self.spikes = deque(maxlen=max_spikes)
+        self.spike_count = 0
+        self.spike_sources: Dict[str, Callable[[], int]] = {}
+        self._spike_baseline = {}
+        self._frame_state = {}
+        self._frame_activity = []
+        self._gc_collections = [0, 0, 0]
+        self._gc_pause_ns = 0
+        self._gc_start_ns = 0
+        if self.spike_threshold_ns:
+            gc.callbacks.append(self._on_gc)
+
         self.data = {
             "start_time": self.start_time,
             "performance_samples": [],
@@ -40,11 +82,137 @@ class PerformanceLogger:
         frame_time = current_time - self.last_frame_time
         self.frame_times.append(frame_time)
         self.last_frame_time = current_time
+
+        # Close out the previous frame's phases
+        now_ns = perf_counter_ns()
+        if self._frame_start_ns is not None:
+            frame_ns = now_ns - self._frame_start_ns
+            self.interval_frame_histogram.record(frame_ns)
+            get_tracer().span("frame", self._frame_start_ns, now_ns, args={"frame": self.timed_frames})
+            if self.spike_threshold_ns and frame_ns > self.spike_threshold_ns:
+                self._capture_spike(frame_ns)
+            frame_phases = self._frame_phases_ns
+            self.last_frame_busy_ns = sum(frame_phases.values())
+            interval_histograms = self.interval_phase_histograms
+            for phase, ns in frame_phases.items():
+                self.phase_windows[phase].append(ns)
+                self.phase_totals_ns[phase] += ns
+                interval_histograms[phase].record(ns)
+                frame_phases[phase] = 0
+            self.timed_frames += 1
+        if self.spike_threshold_ns:
+            self._reset_spike_context()
+        self._frame_start_ns = now_ns
+        self._lap_ns = now_ns
+
+    def watch_counter(self, name: str, read: Callable[[], int]):
+        """Report how much a cumulative counter (e.g. sprite cache misses) grew in spike frames"""
+        self.spike_sources[name] = read
+        self._spike_baseline[name] = read()
+
+    def set_frame_state(self, **state):
+        """Attach this frame's world state (populations, births, deaths) to a spike record"""
+        self._frame_state = state
+
+    def note_activity(self, name: str):
+        """Mark occasional work done this frame (saves, checkpoints) for a spike record"""
+        self._frame_activity.append(name)
+
+    def _on_gc(self, phase: str, info: Dict[str, int]):
+        if phase == "start":
+            self._gc_start_ns = perf_counter_ns()
+        else:
+            self._gc_pause_ns += perf_counter_ns() - self._gc_start_ns
+            self._gc_collections[info["generation"]] += 1
+
+    def _reset_spike_context(self):
+        for name, read in self.spike_sources.items():
+            self._spike_baseline[name] = read()
+        self._frame_state = {}
+        self._frame_activity = []
+        self._gc_collections = [0, 0, 0]
+        self._gc_pause_ns = 0
+
+    def _capture_spike(self, frame_ns: int):
+        """Record the phase breakdown and everything else that happened in a slow frame"""
+        phases_ms = {phase: round(ns / 1e6, 3) for phase, ns in self._frame_phases_ns.items() if ns}
+        timed_ns = sum(self._frame_phases_ns.values())
+        record = {
+            "frame": self.timed_frames,
+            "timestamp": round(time.time() - self.start_time, 3),
+            "frame_ms": round(frame_ns / 1e6, 3),
+            "threshold_ms": round(self.spike_threshold_ns / 1e6, 3),
+            "phases_ms": phases_ms,
+            "slowest_phase": max(phases_ms, key=phases_ms.get) if phases_ms else None,
+            # Time outside the laps: mostly clock.tick() sleeping to the target frame rate
+            "untimed_ms": round((frame_ns - timed_ns) / 1e6, 3),
+            "state": self._frame_state,
+            "counters": {name: read() - self._spike_baseline[name] for name, read in self.spike_sources.items()},
+            "gc": {"collections": {f"gen{g}": n for g, n in enumerate(self._gc_collections) if n},
+                   "pause_ms": round(self._gc_pause_ns / 1e6, 3)},
+            "activity": self._frame_activity
+        }
+        self.spikes.append(record)
+        self.spike_count += 1
+        get_tracer().instant("spike", args={"frame_ms": record["frame_ms"], "slowest_phase": record["slowest_phase"]})
+
+    def lap(self, phase: str):
+        """Charge the time since the previous lap (or frame start) to a phase"""
+        now = perf_counter_ns()
+        self._frame_phases_ns[phase] += now - self._lap_ns
+        get_tracer().span(phase, self._lap_ns, now)
+        self._lap_ns = now
+
+    def add_phase_times(self, phase_times_ns: Dict[str, int]):
+        """Add phases timed elsewhere (e.g. Simulation.phase_times_ns) and restart the lap"""
+        frame_phases = self._frame_phases_ns
+        for phase, ns in phase_times_ns.items():
+            frame_phases[phase] += ns
+        self._lap_ns = perf_counter_ns()
+
+    def get_phase_stats(self) -> Dict[str, Dict[str, float]]:
+        """Rolling avg/max milliseconds per phase over the last PHASE_WINDOW frames"""
+        stats = {}
+        for phase, window in self.phase_windows.items():
+            if window:
+                stats[phase] = {"avg": round(sum(window) / len(window) / 1e6, 3),
+                                "max": round(max(window) / 1e6, 3)}
+        return stats
+
+    def _fold_interval_histograms(self) -> Dict[str, Any]:
+        """Percentiles since the last sample, then merge the interval into the run totals"""
+        latency = {
+            "frame": self.interval_frame_histogram.summary_ms(),
+            "phases": {phase: h.summary_ms() for phase, h in self.interval_phase_histograms.items()}
+        }
+        self.frame_histogram.merge(self.interval_frame_histogram)
+        self.interval_frame_histogram.reset()
+        for phase, histogram in self.interval_phase_histograms.items():
+            self.phase_histograms[phase].merge(histogram)
+            histogram.reset()
+        return latency
+
+    def get_histograms(self) -> Dict[str, Any]:
+        """Run-total histograms (frame and each phase) in mergeable JSON form"""
+        self._fold_interval_histograms()
+        histograms = {"frame": self.frame_histogram.to_dict()}
+        for phase, histogram in self.phase_histograms.items():
+            histograms[phase] = histogram.to_dict()
+        return histograms
+
+    def get_phase_ranking(self) -> List[tuple]:
+        """(phase, total seconds, ms per frame, share of timed time) sorted by cost"""
+        total = sum(self.phase_totals_ns.values())
+        frames = max(self.timed_frames, 1)
+        ranking = [(phase, ns / 1e9, ns / frames / 1e6, ns / total if total else 0.0)
+                   for phase, ns in self.phase_totals_ns.items()]
+        return sorted(ranking, key=lambda r: r[1], reverse=True)
         
     def log_performance_sample(self, frame_count: int, current_fps: float, 
                               prey_count: int, predator_count: int, 
                               entities_drawn: int = None, vision_casts: int = None,
-                              sprite_cache_stats: dict = None, array_pool_stats: dict = None):
+                              sprite_cache_stats: dict = None, array_pool_stats: dict = None,
+                              work_counters: dict = None, memory: dict = None):
         """Log a performance sample"""
         
         # Calculate rolling frame time statistics
@@ -74,7 +242,9 @@ class PerformanceLogger:
                 "prey": prey_count,
                 "predator": predator_count,
                 "total": prey_count + predator_count
-            }
+            },
+            "phase_times_ms": self.get_phase_stats(),
+            "latency_ms": self._fold_interval_histograms()
         }
         
         # Add optional metrics
@@ -82,13 +252,22 @@ class PerformanceLogger:
             sample["rendering"] = {"entities_drawn": entities_drawn}
         if vision_casts is not None:
             sample["ai"] = {"vision_casts": vision_casts}
+        if work_counters is not None:
+            sample.setdefault("ai", {})["work"] = work_counters
         if sprite_cache_stats is not None:
             sample["sprite_cache"] = sprite_cache_stats
         if array_pool_stats is not None:
             sample["vision_array_pool"] = array_pool_stats
+        if memory is not None:
+            sample["memory"] = memory
             
         self.data["performance_samples"].append(sample)
         
+    def log_quality_change(self, change: Dict[str, Any]):
+        """Record an adaptive quality adjustment (see quality_controller)"""
+        self.data.setdefault("quality_adjustments", []).append(change)
+        get_tracer().instant("quality_change", args={"level": change["level"], "reason": change["reason"]})
+
     def get_recent_avg_fps(self, samples=10) -> float:
         """Get average FPS from recent samples"""
         if len(self.data["performance_samples"]) == 0:
@@ -99,8 +278,13 @@ class PerformanceLogger:
     def save_to_file(self):
         """Save performance data to JSON file"""
         try:
-            with open(self.log_file, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            self.data["histograms"] = self.get_histograms()
+            if self.spike_threshold_ns:
+                self.data["spikes"] = {"threshold_ms": round(self.spike_threshold_ns / 1e6, 3),
+                                       "count": self.spike_count, "records": list(self.spikes)}
+            with get_tracer().trace("save_performance_log"):
+                with open(self.log_file, 'w') as f:
+                    json.dump(self.data, f, indent=2)
         except Exception as e:
             print(f"Error saving performance data: {e}")
             
@@ -119,6 +303,20 @@ class PerformanceLogger:
         print(f"Samples collected: {len(samples)}")
         print(f"FPS - Avg: {sum(fps_values)/len(fps_values):.1f}, Min: {min(fps_values):.1f}, Max: {max(fps_values):.1f}")
         print(f"Population - Max: {max(populations)}, Final: {populations[-1]}")
+        if self.timed_frames:
+            self._fold_interval_histograms()
+            frame = self.frame_histogram.summary_ms()
+            print(f"Frame time (ms) - p50: {frame['p50']}, p90: {frame['p90']}, p99: {frame['p99']}, "
+                  f"p99.9: {frame['p99.9']}, max: {frame['max']}")
+            print(f"Frame phases by cost ({self.timed_frames} frames):")
+            for phase, seconds, ms_per_frame, share in self.get_phase_ranking():
+                latency = self.phase_histograms[phase].summary_ms()
+                print(f"  {phase:<12} {seconds:8.2f}s  {ms_per_frame:7.2f} ms/frame  {share * 100:5.1f}%  "
+                      f"p99 {latency['p99']:7.2f} ms  p99.9 {latency['p99.9']:7.2f} ms")
+        if self.spike_count:
+            worst = max(self.spikes, key=lambda s: s["frame_ms"])
+            print(f"Frame spikes (>{self.spike_threshold_ns / 1e6:.1f} ms): {self.spike_count}, "
+                  f"worst {worst['frame_ms']:.1f} ms (slowest phase: {worst['slowest_phase']})")
         print(f"Performance log saved to: {self.log_file}")
 
 
@@ -158,10 +356,88 @@ def analyze_performance_log(log_file="performance_log.json"):
     for i, sample in enumerate(worst_samples):
         print(f"{i+1}. Frame {sample['frame']}: {sample['fps']['rolling_avg']:.1f} FPS, "
               f"{sample['populations']['total']} entities")
+
+    # Rank frame phases by their average cost across samples
+    phase_samples = [s["phase_times_ms"] for s in samples if s.get("phase_times_ms")]
+    if phase_samples:
+        phase_avg = {}
+        for phase in FRAME_PHASES:
+            values = [p[phase]["avg"] for p in phase_samples if phase in p]
+            if values:
+                phase_avg[phase] = sum(values) / len(values)
+        total = sum(phase_avg.values())
+        print(f"\nFrame Phases by Cost:")
+        for phase, ms in sorted(phase_avg.items(), key=lambda item: item[1], reverse=True):
+            worst = max(p[phase]["max"] for p in phase_samples if phase in p)
+            share = ms / total * 100 if total else 0
+            print(f"  {phase:<12} avg {ms:7.2f} ms  worst {worst:7.2f} ms  {share:5.1f}%")
+
+    if data.get("histograms"):
+        print_latency_percentiles(data["histograms"])
+
+    memory_samples = [(s["frame"], s["memory"]) for s in samples if s.get("memory")]
+    if len(memory_samples) > 1:
+        (first_frame, first), (last_frame, last) = memory_samples[0], memory_samples[-1]
+        print(f"\nMemory Growth (frame {first_frame} -> {last_frame}, {len(memory_samples)} samples):")
+        if first["rss_mb"] is not None and last["rss_mb"] is not None:
+            print(f"  {'rss_mb':<22} {first['rss_mb']:>10} -> {last['rss_mb']:<10} ({last['rss_mb'] - first['rss_mb']:+.1f})")
+        for group in ("structures", "entities"):
+            for name, value in last[group].items():
+                start = first[group].get(name, 0)
+                print(f"  {name:<22} {start:>10} -> {value:<10} ({value - start:+g})")
+        leaked = last["entities"]["reachable"] - last["entities"]["live"]
+        if leaked > 0:
+            print(f"  {leaked} entities are reachable but no longer in the world")
+        if last["tracemalloc"]["top_growth"]:
+            print("  Top allocation growth in the last interval:")
+            for site in last["tracemalloc"]["top_growth"][:5]:
+                print(f"    {site['site']:<32} {site['size_diff_kb']:+10.1f} KB  ({site['count_diff']:+d} blocks)")
+
+    spikes = data.get("spikes")
+    if spikes and spikes["records"]:
+        print(f"\nFrame Spikes (>{spikes['threshold_ms']} ms): {spikes['count']} total, "
+              f"last {len(spikes['records'])} kept")
+        for spike in sorted(spikes["records"], key=lambda s: s["frame_ms"], reverse=True)[:5]:
+            state = spike["state"]
+            details = [f"{spike['slowest_phase']} {spike['phases_ms'].get(spike['slowest_phase'], 0):.1f} ms"]
+            if state:
+                details.append(f"{state.get('prey', 0)}+{state.get('predators', 0)} entities, "
+                               f"{state.get('births', 0)} births, {state.get('deaths', 0)} deaths")
+            details += [f"{name}={count}" for name, count in spike["counters"].items() if count]
+            if spike["gc"]["collections"]:
+                details.append(f"gc {spike['gc']['pause_ms']:.1f} ms")
+            details += spike["activity"]
+            print(f"  Frame {spike['frame']}: {spike['frame_ms']:.1f} ms - " + ", ".join(details))
+
+
+def print_latency_percentiles(histograms: Dict[str, Any]):
+    """Print p50/p90/p99/p99.9 for the frame and each phase from histogram dicts"""
+    print(f"\nLatency Percentiles (ms):")
+    print(f"  {'':<12} {'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} {'max':>8}")
+    for name, data in histograms.items():
+        latency = LatencyHistogram.from_dict(data).summary_ms()
+        if latency["count"]:
+            print(f"  {name:<12} {latency['p50']:>8.2f} {latency['p90']:>8.2f} {latency['p99']:>8.2f} "
+                  f"{latency['p99.9']:>8.2f} {latency['max']:>8.2f}")
+
+
+def merge_performance_logs(log_files: List[str]) -> Dict[str, Any]:
+    """Merge the latency histograms of several performance logs (runs or processes)"""
+    histogram_sets = []
+    for log_file in log_files:
+        with open(log_file, 'r') as f:
+            data = json.load(f)
+        if data.get("histograms"):
+            histogram_sets.append(data["histograms"])
+    return merge_histogram_sets(histogram_sets)
               
     
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 2:
+        merged = merge_performance_logs(sys.argv[1:])
+        print(f"\n=== Merged Latency ({len(sys.argv) - 1} logs) ===")
+        print_latency_percentiles(merged)
+    elif len(sys.argv) > 1:
         analyze_performance_log(sys.argv[1])
     else:
         analyze_performance_log()
\ No newline at end of file
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Adaptive Quality Controller for Evolution Simulation
+Holds a target frame rate by stepping through a ladder of quality levels (vision
+throttle, collision interval, grid cell size, draw detail) based on measured frame
+work time. Hysteresis keeps it from oscillating: separate up/down thresholds, a
+cooldown, a growing backoff after failed upgrades, and no upgrade to a level whose
+last measured cost per entity predicts it would go over budget at the current
+population. Every adjustment is logged.
+"""
+
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+from entities.base_entity import BaseEntity, DRAW_DETAIL_BODY, DRAW_DETAIL_EYES, DRAW_DETAIL_FULL
+from simulation import FRAME_RATE
+
+# Highest quality first; "default" matches the Simulation defaults
+QUALITY_LEVELS = [
+    {"name": "ultra", "vision_throttle": 1, "collision_interval": 3, "grid_cell_size": 50,
+     "draw_detail": DRAW_DETAIL_FULL},
+    {"name": "high", "vision_throttle": 2, "collision_interval": 4, "grid_cell_size": 50,
+     "draw_detail": DRAW_DETAIL_FULL},
+    {"name": "default", "vision_throttle": 3, "collision_interval": 5, "grid_cell_size": 50,
+     "draw_detail": DRAW_DETAIL_FULL},
+    {"name": "reduced", "vision_throttle": 4, "collision_interval": 6, "grid_cell_size": 75,
+     "draw_detail": DRAW_DETAIL_EYES},
+    {"name": "low", "vision_throttle": 5, "collision_interval": 8, "grid_cell_size": 100,
+     "draw_detail": DRAW_DETAIL_BODY},
+    {"name": "minimal", "vision_throttle": 6, "collision_interval": 10, "grid_cell_size": 100,
+     "draw_detail": DRAW_DETAIL_BODY},
+]
+
+HIGH_WATER = 0.9          # Lower quality when frame work exceeds this share of the frame budget
+LOW_WATER = 0.6           # Raise quality when frame work is below this share
+WINDOW_FRAMES = 60        # Frames averaged per decision (covers several vision throttle cycles)
+COOLDOWN_FRAMES = 120     # Minimum frames between adjustments
+MAX_BACKOFF = 16          # Cap on the upgrade cooldown multiplier
+COST_MEMORY_FRAMES = 7200 # Frames a level's measured cost is trusted (2 minutes at 60 FPS)
+
+
+class QualityController:
+    """Adjusts a Simulation's quality level from per-frame work time"""
+
+    def __init__(self, sim, target_fps=FRAME_RATE, levels: Optional[List[Dict[str, Any]]] = None,
+                 high_water=HIGH_WATER, low_water=LOW_WATER, window=WINDOW_FRAMES,
+                 cooldown=COOLDOWN_FRAMES, perf_logger=None):
+        """Initialize controller
+
+        Args:
+            sim: Simulation whose settings are adjusted
+            target_fps: Frame rate to hold; the frame budget is 1 / target_fps
+            levels: Quality ladder, highest quality first (defaults to QUALITY_LEVELS)
+            high_water, low_water: Budget shares that trigger a downgrade / upgrade
+            window: Frames averaged before deciding
+            cooldown: Frames to wait after an adjustment
+            perf_logger: PerformanceLogger that records each adjustment
+        """
+        self.sim = sim
+        self.levels = levels or QUALITY_LEVELS
+        self.budget_ns = 1e9 / target_fps
+        self.high_water = high_water
+        self.low_water = low_water
+        self.cooldown = cooldown
+        self.perf_logger = perf_logger
+        self.busy = deque(maxlen=window)
+        self.frames_at_level = 0
+        self.upgrade_backoff = 1
+        self._last_was_upgrade = False
+        self.level_cost_ns: Dict[int, tuple] = {}   # level -> (work ns per entity, frame measured)
+        self.frames = 0
+        self.adjustments: List[Dict[str, Any]] = []
+        self.level = self._closest_level()
+        self._apply(self.levels[self.level])
+
+    def _closest_level(self) -> int:
+        """Level whose vision throttle is nearest the Simulation's current setting"""
+        throttle = self.sim.vision_throttle
+        return min(range(len(self.levels)), key=lambda i: abs(self.levels[i]["vision_throttle"] - throttle))
+
+    def _apply(self, level: Dict[str, Any]):
+        sim = self.sim
+        sim.vision_throttle = level["vision_throttle"]
+        sim.collision_interval = level["collision_interval"]
+        sim.set_grid_cell_size(level["grid_cell_size"])
+        BaseEntity.draw_detail = level["draw_detail"]
+
+    @property
+    def level_name(self) -> str:
+        return self.levels[self.level]["name"]
+
+    def update(self, frame_busy_ns: int):
+        """Feed one frame's work time (excluding the frame-rate sleep) and adjust if needed"""
+        self.busy.append(frame_busy_ns)
+        self.frames += 1
+        self.frames_at_level += 1
+        if len(self.busy) < self.busy.maxlen or self.frames_at_level < self.cooldown:
+            return
+
+        busy_ns = sum(self.busy) / len(self.busy)
+        load = busy_ns / self.budget_ns
+        population = max(len(self.sim.entities), 1)
+        self.level_cost_ns[self.level] = (busy_ns / population, self.frames)
+        if load > self.high_water and self.level < len(self.levels) - 1:
+            # A downgrade right after an upgrade means the upgrade did not fit: wait longer next time
+            if self._last_was_upgrade and self.frames_at_level < 2 * self.cooldown:
+                self.upgrade_backoff = min(self.upgrade_backoff * 2, MAX_BACKOFF)
+            self._change(self.level + 1, "over_budget", load)
+        elif (load < self.low_water and self.level > 0
+              and self.frames_at_level >= self.cooldown * self.upgrade_backoff
+              and self.predicted_load(self.level - 1) <= self.high_water):
+            self._change(self.level - 1, "headroom", load)
+        elif self.frames_at_level >= self.cooldown * MAX_BACKOFF and self.upgrade_backoff > 1:
+            # Stable for a long time: let upgrades be tried sooner again
+            self.upgrade_backoff //= 2
+            self.frames_at_level = self.cooldown
+            self._last_was_upgrade = False
+
+    def predicted_load(self, level: int) -> float:
+        """Budget share a level would use at the current population (0 if not measured recently)"""
+        cost, measured_at = self.level_cost_ns.get(level, (0.0, 0))
+        if self.frames - measured_at > COST_MEMORY_FRAMES:
+            return 0.0
+        return cost * len(self.sim.entities) / self.budget_ns
+
+    def _change(self, new_level: int, reason: str, load: float):
+        old = self.levels[self.level]
+        new = self.levels[new_level]
+        self._apply(new)
+        sim = self.sim
+        change = {
+            "frame": sim.frame_count,
+            "timestamp": time.time(),
+            "from": old["name"],
+            "to": new["name"],
+            "level": new_level,
+            "reason": reason,
+            "load": round(load, 3),
+            "busy_ms": round(load * self.budget_ns / 1e6, 2),
+            "budget_ms": round(self.budget_ns / 1e6, 2),
+            "population": len(sim.entities),
+            "upgrade_backoff": self.upgrade_backoff,
+            "settings": {k: v for k, v in new.items() if k != "name"}
+        }
+        self.adjustments.append(change)
+        if self.perf_logger is not None:
+            self.perf_logger.log_quality_change(change)
+        print(f"Quality {old['name']} -> {new['name']} at frame {sim.frame_count} ({reason}: "
+              f"{change['busy_ms']:.1f}/{change['budget_ms']:.1f} ms, {change['population']} entities)")
+
+        self._last_was_upgrade = new_level < self.level
+        self.level = new_level
+        self.frames_at_level = 0
+        self.busy.clear()
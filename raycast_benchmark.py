@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Raycast Kernel Benchmark and Correctness Suite for Evolution Simulation
+Cross-checks every kernel in vision_utils against a NumPy reference implementation,
+then times each kernel over a sweep of ray counts, candidate counts, FOV and view range.
+JIT compilation (first call) is timed separately from steady-state calls.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import time
+from typing import Dict, List, Any
+
+import numpy as np
+
+from vision_utils import (raycast_batch, raycast_batch_pooled, raycast_batch_optimized,
+                          HIT_NONE, HIT_PREDATOR, HIT_PREY)
+
+SWEEP_RAYS = [7, 15, 24, 30]
+SWEEP_CANDIDATES = [0, 4, 16, 64, 256]
+SWEEP_FOV = [math.radians(90), 2 * math.pi]
+SWEEP_RANGE = [150.0, 250.0]
+VISION_TOLERANCE = 1e-6
+
+
+def reference_raycast(self_x, self_y, self_angle, fov, view_range, num_rays,
+                      other_positions, other_radii, other_types, detect_predator, detect_prey):
+    """Vectorized reference with the kernels' semantics (nearest projected hit per ray)"""
+    if abs(fov - 2 * math.pi) < 1e-5:
+        angles = np.arange(num_rays) * (2 * math.pi / num_rays)
+    else:
+        start = self_angle - fov / 2.0
+        angles = start + np.arange(num_rays) * (fov / (num_rays - 1))
+
+    vision = np.ones(num_rays, dtype=np.float32)
+    hits = np.full(num_rays, HIT_NONE, dtype=np.int32)
+    if len(other_positions) == 0:
+        return vision, hits
+
+    positions = other_positions.astype(np.float64)
+    radii = other_radii.astype(np.float64)
+    detectable = ((other_types == HIT_PREDATOR) & bool(detect_predator)) | \
+                 ((other_types == HIT_PREY) & bool(detect_prey))
+
+    ray_dx = np.cos(angles)[:, None]
+    ray_dy = np.sin(angles)[:, None]
+    dx = positions[:, 0] - self_x
+    dy = positions[:, 1] - self_y
+    proj = dx * ray_dx + dy * ray_dy                       # (rays, candidates)
+    dist_sq = (positions[:, 0] - (self_x + ray_dx * proj)) ** 2 + \
+              (positions[:, 1] - (self_y + ray_dy * proj)) ** 2
+    hit = (proj > 0) & (proj < view_range) & (dist_sq < radii * radii) & detectable
+
+    masked = np.where(hit, proj, np.inf)
+    nearest = np.argmin(masked, axis=1)                    # first index wins ties, like the kernels
+    any_hit = hit.any(axis=1)
+    rows = np.arange(num_rays)
+    vision[any_hit] = masked[rows, nearest][any_hit] / view_range
+    hits[any_hit] = other_types[nearest][any_hit]
+    return vision, hits
+
+
+_pooled_arrays: Dict[int, tuple] = {}
+
+
+def _call_pooled(*args):
+    """Bare pooled kernel with arrays preallocated once per ray count (no pool bookkeeping)"""
+    num_rays = args[5]
+    if num_rays not in _pooled_arrays:
+        _pooled_arrays[num_rays] = (np.empty(num_rays, dtype=np.float32), np.empty(num_rays, dtype=np.int32),
+                                    np.empty(num_rays, dtype=np.float64))
+    vision, hits = raycast_batch_pooled(*args, *_pooled_arrays[num_rays])
+    return vision.copy(), hits.copy()
+
+
+KERNELS = {
+    "raycast_batch": raycast_batch,
+    "raycast_batch_pooled": _call_pooled,
+    "raycast_batch_optimized": raycast_batch_optimized,
+}
+
+
+def make_scene(rng: np.random.Generator, num_rays: int, candidates: int, fov: float,
+               view_range: float, observer: str = "prey") -> tuple:
+    """Random observer and candidates in and around its view range, as cast_vision builds them"""
+    self_x, self_y = 500.0, 500.0
+    self_angle = float(rng.uniform(0, 2 * math.pi))
+    distance = rng.uniform(0, view_range * 1.2, candidates)
+    bearing = rng.uniform(0, 2 * math.pi, candidates)
+    positions = np.empty((candidates, 2), dtype=np.float32)
+    positions[:, 0] = self_x + distance * np.cos(bearing)
+    positions[:, 1] = self_y + distance * np.sin(bearing)
+    radii = rng.choice([8.0, 10.0, 12.0, 15.0], candidates).astype(np.float32)
+    types = rng.choice([HIT_PREDATOR, HIT_PREY], candidates).astype(np.int32)
+    return (self_x, self_y, self_angle, fov, view_range, num_rays,
+            positions, radii, types, observer == "prey", observer == "predator")
+
+
+def check_correctness(cases: int = 500, seed: int = 0) -> Dict[str, Any]:
+    """Compare every kernel's vision and hits with the reference on random scenes"""
+    rng = np.random.default_rng(seed)
+    results = {name: {"cases": 0, "vision_mismatches": 0, "hit_mismatches": 0, "max_vision_error": 0.0,
+                      "examples": []} for name in KERNELS}
+    for case in range(cases):
+        scene = make_scene(rng, int(rng.choice(SWEEP_RAYS)), int(rng.integers(0, 64)),
+                           float(rng.choice(SWEEP_FOV)), float(rng.choice(SWEEP_RANGE)),
+                           observer="prey" if case % 2 == 0 else "predator")
+        expected_vision, expected_hits = reference_raycast(*scene)
+        for name, kernel in KERNELS.items():
+            vision, hits = kernel(*scene)
+            vision = np.asarray(vision, dtype=np.float32)
+            hits = np.asarray(hits, dtype=np.int32)
+            error = float(np.max(np.abs(vision - expected_vision))) if len(vision) else 0.0
+            stats = results[name]
+            stats["cases"] += 1
+            stats["max_vision_error"] = max(stats["max_vision_error"], error)
+            vision_bad = error > VISION_TOLERANCE
+            hits_bad = not np.array_equal(hits, expected_hits)
+            stats["vision_mismatches"] += vision_bad
+            stats["hit_mismatches"] += hits_bad
+            if (vision_bad or hits_bad) and len(stats["examples"]) < 5:
+                stats["examples"].append({"case": case, "num_rays": scene[5], "candidates": len(scene[6]),
+                                          "fov": scene[3], "max_vision_error": error,
+                                          "rays_with_wrong_hit": int(np.sum(hits != expected_hits))})
+    for stats in results.values():
+        stats["passed"] = stats["vision_mismatches"] == 0 and stats["hit_mismatches"] == 0
+    return results
+
+
+def measure_jit_warmup() -> Dict[str, float]:
+    """Seconds spent in each kernel's first call (Numba compilation), in a fresh process
+
+    raycast_batch_optimized wraps raycast_batch_pooled, so it reuses that compiled code.
+    """
+    scene = make_scene(np.random.default_rng(0), 7, 4, SWEEP_FOV[0], SWEEP_RANGE[0])
+    warmup = {}
+    for name, kernel in KERNELS.items():
+        start = time.perf_counter()
+        kernel(*scene)
+        warmup[name] = time.perf_counter() - start
+    return warmup
+
+
+def time_kernel(kernel, scene: tuple, repeats: int, calls: int) -> float:
+    """Median nanoseconds per call over repeats batches of calls"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            kernel(*scene)
+        samples.append((time.perf_counter_ns() - start) / calls)
+    return float(np.median(samples))
+
+
+def run_sweep(repeats: int = 5, calls: int = 200, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    rows = []
+    for num_rays, candidates, fov, view_range in itertools.product(SWEEP_RAYS, SWEEP_CANDIDATES,
+                                                                    SWEEP_FOV, SWEEP_RANGE):
+        scene = make_scene(rng, num_rays, candidates, fov, view_range)
+        timings = {name: time_kernel(kernel, scene, repeats, calls) for name, kernel in KERNELS.items()}
+        rows.append({
+            "num_rays": num_rays, "candidates": candidates,
+            "fov_degrees": round(math.degrees(fov)), "view_range": view_range,
+            "ns_per_call": timings,
+            "fastest": min(timings, key=timings.get)
+        })
+    return rows
+
+
+def print_report(report: Dict[str, Any]):
+    print("=== Correctness (vs reference) ===")
+    for name, stats in report["correctness"].items():
+        status = "PASS" if stats["passed"] else "FAIL"
+        print(f"{name:<26} {status}  cases={stats['cases']} vision_mismatches={stats['vision_mismatches']} "
+              f"hit_mismatches={stats['hit_mismatches']} max_error={stats['max_vision_error']:.2e}")
+
+    print("\n=== JIT warmup (first call) ===")
+    for name, seconds in report["jit_warmup_seconds"].items():
+        print(f"{name:<26} {seconds * 1000:8.1f} ms")
+
+    print("\n=== Steady state (median ns/call) ===")
+    names = list(KERNELS)
+    labels = [name.replace("raycast_batch_", "") for name in names]
+    print(f"{'rays':>4} {'cand':>5} {'fov':>4} {'range':>5}  " + "  ".join(f"{label:>13}" for label in labels)
+          + "  fastest")
+    for row in report["sweep"]:
+        print(f"{row['num_rays']:>4} {row['candidates']:>5} {row['fov_degrees']:>4} {row['view_range']:>5.0f}  " +
+              "  ".join(f"{row['ns_per_call'][n]:>13.0f}" for n in names) + f"  {row['fastest']}")
+
+    wins = {name: sum(row["fastest"] == name for row in report["sweep"]) for name in names}
+    print("\nFastest configurations per kernel: " + ", ".join(f"{n}={w}" for n, w in wins.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Raycast kernel micro-benchmark and correctness suite')
+    parser.add_argument('--cases', type=int, default=500, help='Random scenes for the correctness check')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed batches per configuration')
+    parser.add_argument('--calls', type=int, default=200, help='Kernel calls per timed batch')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for generated scenes')
+    parser.add_argument('--check-only', action='store_true', help='Only run the correctness check')
+    parser.add_argument('--output', default='raycast_benchmark.json', help='Where to write results')
+    args = parser.parse_args()
+
+    # Warmup first: nothing else may have called the kernels in this process yet
+    report = {"jit_warmup_seconds": measure_jit_warmup(),
+              "correctness": check_correctness(args.cases, args.seed),
+              "sweep": [] if args.check_only else run_sweep(args.repeats, args.calls, args.seed)}
+    print_report(report)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to: {args.output}")
+    if not all(stats["passed"] for stats in report["correctness"].values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Replay Recording and Viewer for Evolution Simulation
+Records periodic full keyframes plus compact per-frame deltas (quantized positions and
+angles, spawn and despawn records) into a chunked file, and plays it back with seeking.
+Playback only decodes and draws, so it runs far faster than the live simulation.
+
+File layout:
+    MAGIC | uint32 header length | header JSON
+    chunk*: uint32 payload length | zlib-compressed npz payload (one keyframe + its deltas)
+    footer: index JSON (first frame and byte offset of each chunk) | uint64 index offset | MAGIC
+A file without a footer (e.g. after a crash) is still readable by scanning the chunks.
+"""
+
+import argparse
+import io
+import json
+import struct
+import sys
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from frame_tracer import get_tracer
+
+MAGIC = b"EVOREPL1"
+POSITION_SCALE = 65535      # x/y quantized to uint16 across the world size
+ANGLE_SCALE = 256           # angle quantized to uint8 steps of 2*pi/256
+MAX_STRETCH = 4.0           # stretch quantized to uint8 over [0, MAX_STRETCH]
+TYPE_CODES = {"prey": 0, "predator": 1}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+
+
+class ReplayRecorder:
+    """Records a Simulation frame by frame into a chunked keyframe + delta file"""
+
+    def __init__(self, path: str, width: int, height: int, frame_rate: int, keyframe_interval: int = 300):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.keyframe_interval = keyframe_interval
+        self.file = open(path, "wb")
+        header = json.dumps({"width": width, "height": height, "frame_rate": frame_rate,
+                             "keyframe_interval": keyframe_interval}).encode("utf-8")
+        self.file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+        self.index: List[List[int]] = []   # [first_frame, byte_offset] per chunk
+        self.live_ids: List[int] = []
+        self.frames_in_chunk = 0
+        self.frames_recorded = 0
+        self.bytes_written = 0
+        self._reset_chunk()
+
+    def _reset_chunk(self):
+        self.chunk: Dict[str, list] = {key: [] for key in (
+            "frames", "despawn_ids", "despawn_counts", "spawn_ids", "spawn_types", "spawn_colors",
+            "spawn_radii", "spawn_counts", "positions", "orientations", "state_counts")}
+
+    def _quantize(self, population) -> tuple:
+        n = len(population)
+        raw = np.array([(e.x, e.y, e.angle, e.stretch) for e in population], dtype=np.float64).reshape(n, 4)
+        positions = np.empty((n, 2), dtype=np.uint16)
+        positions[:, 0] = np.clip(np.rint(raw[:, 0] / self.width * POSITION_SCALE), 0, POSITION_SCALE)
+        positions[:, 1] = np.clip(np.rint(raw[:, 1] / self.height * POSITION_SCALE), 0, POSITION_SCALE)
+        orientations = np.empty((n, 2), dtype=np.uint8)
+        orientations[:, 0] = np.rint(np.mod(raw[:, 2], 2 * np.pi) / (2 * np.pi) * ANGLE_SCALE).astype(np.int64) % ANGLE_SCALE
+        orientations[:, 1] = np.clip(np.rint(raw[:, 3] / MAX_STRETCH * 255), 0, 255)
+        return positions, orientations
+
+    def record_frame(self, sim):
+        """Append the world state after sim.step() as a keyframe or a delta"""
+        by_id = {e.id: e for e in sim.entities}
+        if self.frames_in_chunk == self.keyframe_interval:
+            self._flush_chunk()
+
+        if self.frames_in_chunk == 0:
+            # Keyframe: every live entity is a "spawn" into an empty world
+            despawned = []
+            spawned = list(sim.entities)
+            self.live_ids = [e.id for e in spawned]
+        else:
+            live_set = set(self.live_ids)
+            despawned = [i for i in self.live_ids if i not in by_id]
+            spawned = [e for e in sim.entities if e.id not in live_set]
+            if despawned:
+                dead = set(despawned)
+                self.live_ids = [i for i in self.live_ids if i not in dead]
+            self.live_ids.extend(e.id for e in spawned)
+
+        chunk = self.chunk
+        chunk["frames"].append(sim.frame_count)
+        chunk["despawn_ids"].extend(despawned)
+        chunk["despawn_counts"].append(len(despawned))
+        chunk["spawn_ids"].extend(e.id for e in spawned)
+        chunk["spawn_types"].extend(TYPE_CODES[e.entity_type] for e in spawned)
+        chunk["spawn_colors"].extend(e.color for e in spawned)
+        chunk["spawn_radii"].extend(e.radius for e in spawned)
+        chunk["spawn_counts"].append(len(spawned))
+        positions, orientations = self._quantize([by_id[i] for i in self.live_ids])
+        chunk["positions"].append(positions)
+        chunk["orientations"].append(orientations)
+        chunk["state_counts"].append(len(self.live_ids))
+
+        self.frames_in_chunk += 1
+        self.frames_recorded += 1
+
+    def _flush_chunk(self):
+        if self.frames_in_chunk == 0:
+            return
+        chunk = self.chunk
+        arrays = {
+            "frames": np.array(chunk["frames"], dtype=np.int64),
+            "despawn_ids": np.array(chunk["despawn_ids"], dtype=np.int64),
+            "despawn_counts": np.array(chunk["despawn_counts"], dtype=np.int32),
+            "spawn_ids": np.array(chunk["spawn_ids"], dtype=np.int64),
+            "spawn_types": np.array(chunk["spawn_types"], dtype=np.uint8),
+            "spawn_colors": np.array(chunk["spawn_colors"], dtype=np.uint8).reshape(-1, 3),
+            "spawn_radii": np.array(chunk["spawn_radii"], dtype=np.uint8),
+            "spawn_counts": np.array(chunk["spawn_counts"], dtype=np.int32),
+            "positions": np.concatenate(chunk["positions"]),
+            "orientations": np.concatenate(chunk["orientations"]),
+            "state_counts": np.array(chunk["state_counts"], dtype=np.int32),
+        }
+        with get_tracer().trace("replay_flush", args={"frames": self.frames_in_chunk}):
+            buffer = io.BytesIO()
+            np.savez(buffer, **arrays)
+            payload = zlib.compress(buffer.getvalue(), 6)
+
+        self.index.append([int(arrays["frames"][0]), self.file.tell()])
+        self.file.write(struct.pack("<I", len(payload)) + payload)
+        self.file.flush()
+        self.bytes_written += len(payload) + 4
+        self.frames_in_chunk = 0
+        self._reset_chunk()
+
+    def close(self):
+        """Flush the last chunk and write the seek index footer"""
+        if self.file.closed:
+            return
+        self._flush_chunk()
+        index_offset = self.file.tell()
+        self.file.write(json.dumps(self.index).encode("utf-8"))
+        self.file.write(struct.pack("<Q", index_offset) + MAGIC)
+        self.file.close()
+
+
+class ReplayFrame:
+    """Decoded world state for one frame"""
+
+    def __init__(self, frame: int, ids: List[int], types: np.ndarray, colors: np.ndarray,
+                 radii: np.ndarray, x: np.ndarray, y: np.ndarray, angles: np.ndarray, stretch: np.ndarray):
+        self.frame = frame
+        self.ids = ids
+        self.types = types
+        self.colors = colors
+        self.radii = radii
+        self.x = x
+        self.y = y
+        self.angles = angles
+        self.stretch = stretch
+
+
+class ReplayReader:
+    """Random-access reader: seek loads the nearest keyframe chunk and applies deltas"""
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        (header_length,) = struct.unpack("<I", self.file.read(4))
+        self.header = json.loads(self.file.read(header_length).decode("utf-8"))
+        self.width = self.header["width"]
+        self.height = self.header["height"]
+        self.chunks_start = self.file.tell()
+        self.index = self._read_index()
+        self._cached_chunk: Optional[int] = None
+        self._chunk_data: Optional[Dict[str, np.ndarray]] = None
+        self._chunk_offsets: Optional[Dict[str, np.ndarray]] = None
+
+    def _read_index(self) -> List[List[int]]:
+        self.file.seek(0, io.SEEK_END)
+        end = self.file.tell()
+        footer = len(MAGIC) + 8
+        if end - self.chunks_start >= footer:
+            self.file.seek(end - footer)
+            (index_offset,) = struct.unpack("<Q", self.file.read(8))
+            if self.file.read(len(MAGIC)) == MAGIC:
+                self.file.seek(index_offset)
+                return json.loads(self.file.read(end - footer - index_offset).decode("utf-8"))
+
+        # No footer: rebuild the index by walking the length-prefixed chunks
+        index = []
+        offset = self.chunks_start
+        while offset + 4 <= end:
+            self.file.seek(offset)
+            (length,) = struct.unpack("<I", self.file.read(4))
+            if offset + 4 + length > end:
+                break
+            data = self._decode_payload(self.file.read(length))
+            index.append([int(data["frames"][0]), offset])
+            offset += 4 + length
+        return index
+
+    @staticmethod
+    def _decode_payload(payload: bytes) -> Dict[str, np.ndarray]:
+        with np.load(io.BytesIO(zlib.decompress(payload))) as archive:
+            return {key: archive[key] for key in archive.files}
+
+    @property
+    def first_frame(self) -> int:
+        return self.index[0][0] if self.index else 0
+
+    @property
+    def last_frame(self) -> int:
+        if not self.index:
+            return 0
+        data = self._load_chunk(len(self.index) - 1)
+        return int(data["frames"][-1])
+
+    def _load_chunk(self, chunk_index: int) -> Dict[str, np.ndarray]:
+        if self._cached_chunk != chunk_index:
+            self.file.seek(self.index[chunk_index][1])
+            (length,) = struct.unpack("<I", self.file.read(4))
+            data = self._decode_payload(self.file.read(length))
+            self._chunk_data = data
+            # Prefix sums so each frame's slice of the concatenated arrays is O(1) to find
+            self._chunk_offsets = {
+                name: np.concatenate(([0], np.cumsum(data[f"{name}_counts"])))
+                for name in ("despawn", "spawn", "state")
+            }
+            self._cached_chunk = chunk_index
+        return self._chunk_data
+
+    def seek(self, frame: int) -> ReplayFrame:
+        """Decode the state at frame (clamped to the recording)"""
+        frames = [entry[0] for entry in self.index]
+        chunk_index = max(0, int(np.searchsorted(frames, frame, side="right")) - 1)
+        data = self._load_chunk(chunk_index)
+        offsets = self._chunk_offsets
+        position = min(max(0, int(np.searchsorted(data["frames"], frame, side="right")) - 1),
+                       len(data["frames"]) - 1)
+
+        # Replay spawn/despawn records from the keyframe up to the target frame
+        live: Dict[int, tuple] = {}
+        order: List[int] = []
+        for f in range(position + 1):
+            dead = data["despawn_ids"][offsets["despawn"][f]:offsets["despawn"][f + 1]]
+            if len(dead):
+                dead_set = set(dead.tolist())
+                order = [i for i in order if i not in dead_set]
+            start, end = offsets["spawn"][f], offsets["spawn"][f + 1]
+            for j in range(start, end):
+                entity_id = int(data["spawn_ids"][j])
+                live[entity_id] = (int(data["spawn_types"][j]), tuple(int(c) for c in data["spawn_colors"][j]),
+                                   int(data["spawn_radii"][j]))
+                order.append(entity_id)
+
+        start, end = offsets["state"][position], offsets["state"][position + 1]
+        positions = data["positions"][start:end].astype(np.float64)
+        orientations = data["orientations"][start:end].astype(np.float64)
+        attributes = [live[i] for i in order]
+        return ReplayFrame(
+            frame=int(data["frames"][position]),
+            ids=order,
+            types=np.array([a[0] for a in attributes], dtype=np.uint8),
+            colors=[a[1] for a in attributes],
+            radii=np.array([a[2] for a in attributes], dtype=np.int32),
+            x=positions[:, 0] / POSITION_SCALE * self.width,
+            y=positions[:, 1] / POSITION_SCALE * self.height,
+            angles=orientations[:, 0] / ANGLE_SCALE * 2 * np.pi,
+            stretch=orientations[:, 1] / 255 * MAX_STRETCH
+        )
+
+    def close(self):
+        self.file.close()
+
+
+def run_viewer(path: str, speed: float = 1.0):
+    """Interactive playback: SPACE pause, LEFT/RIGHT seek 1s (SHIFT: 10s), UP/DOWN speed, click bar to seek"""
+    import pygame
+    from entities.base_entity import draw_body
+
+    reader = ReplayReader(path)
+    first, last = reader.first_frame, reader.last_frame
+    frame_rate = reader.header["frame_rate"]
+
+    pygame.init()
+    screen = pygame.display.set_mode((reader.width, reader.height + 30))
+    pygame.display.set_caption(f"Replay: {path}")
+    font = pygame.font.SysFont(None, 22)
+    clock = pygame.time.Clock()
+
+    position = float(first)
+    paused = False
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                step = frame_rate * (10 if pygame.key.get_mods() & pygame.KMOD_SHIFT else 1)
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    position += step
+                elif event.key == pygame.K_LEFT:
+                    position -= step
+                elif event.key == pygame.K_UP:
+                    speed *= 2
+                elif event.key == pygame.K_DOWN:
+                    speed /= 2
+                elif event.key == pygame.K_ESCAPE:
+                    running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.pos[1] >= reader.height:
+                position = first + (last - first) * event.pos[0] / reader.width
+
+        position = min(max(position, first), last)
+        state = reader.seek(int(position))
+
+        screen.fill((30, 30, 30))
+        for i in range(len(state.ids)):
+            draw_body(screen, TYPE_NAMES[int(state.types[i])], state.colors[i], int(state.radii[i]),
+                      state.x[i], state.y[i], state.angles[i], state.stretch[i])
+
+        progress = (state.frame - first) / max(last - first, 1)
+        pygame.draw.rect(screen, (50, 50, 50), (0, reader.height, reader.width, 30))
+        pygame.draw.rect(screen, (100, 200, 255), (0, reader.height + 10, int(reader.width * progress), 10))
+        prey = int(np.sum(state.types == TYPE_CODES["prey"]))
+        label = (f"Frame {state.frame} ({state.frame // frame_rate}s)  Prey: {prey}  "
+                 f"Predators: {len(state.ids) - prey}  Speed: {speed:g}x{'  [paused]' if paused else ''}")
+        screen.blit(font.render(label, True, (255, 255, 255)), (10, 10))
+        pygame.display.flip()
+
+        if not paused:
+            position += speed
+            if position >= last:
+                paused = True
+        clock.tick(frame_rate)
+
+    reader.close()
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play back a recorded simulation')
+    parser.add_argument('replay_file', help='Replay file written with main.py --record')
+    parser.add_argument('--speed', type=float, default=1.0, help='Initial playback speed (frames per tick)')
+    parser.add_argument('--info', action='store_true', help='Print recording info and exit')
+    args = parser.parse_args()
+
+    if args.info:
+        reader = ReplayReader(args.replay_file)
+        print(f"World: {reader.width}x{reader.height} @ {reader.header['frame_rate']} FPS")
+        print(f"Frames: {reader.first_frame} - {reader.last_frame} in {len(reader.index)} chunks "
+              f"(keyframe every {reader.header['keyframe_interval']} frames)")
+        reader.close()
+        sys.exit(0)
+
+    run_viewer(args.replay_file, args.speed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Seeded Random Streams for Evolution Simulation
+Every random draw goes through a named numpy Generator stream. Each world owns one
+RandomStreams set spawned from its seed, so runs are reproducible and subsystems do not
+perturb each other's sequences (e.g. extra movement draws never shift mutation draws).
+"""
+
+import secrets
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+STREAM_NAMES = (
+    "world",         # initial placement, migrant placement
+    "spawn",         # per-entity starting traits (energy, regen)
+    "movement",      # wander angles and move/stop timers
+    "reproduction",  # reproduction thresholds and offspring offsets
+    "mutation",      # trait mutations and colour shifts
+    "brain",         # neural network initialisation and weight mutation
+)
+
+
+def new_seed() -> int:
+    """A fresh 32-bit seed for runs started without --seed (logged so they can be repeated)"""
+    return secrets.randbits(32)
+
+
+class RandomStream:
+    """Block-buffered scalar draws from one Generator
+
+    Entities draw single values in hot loops, where a Generator call per value is slow.
+    Uniforms and normals are drawn in blocks and handed out one at a time; the sequence
+    depends only on the seed and the order of calls.
+    """
+
+    def __init__(self, generator: np.random.Generator, block_size: int = 256):
+        self.generator = generator
+        self.block_size = block_size
+        self._uniforms = np.empty(0)
+        self._uniform_index = 0
+        self._normals = np.empty(0)
+        self._normal_index = 0
+
+    def random(self) -> float:
+        """Uniform float in [0, 1)"""
+        if self._uniform_index >= len(self._uniforms):
+            self._uniforms = self.generator.random(self.block_size)
+            self._uniform_index = 0
+        value = self._uniforms[self._uniform_index]
+        self._uniform_index += 1
+        return float(value)
+
+    def uniform(self, low: float, high: float) -> float:
+        return low + (high - low) * self.random()
+
+    def randint(self, low: int, high: int) -> int:
+        """Integer in [low, high], inclusive like random.randint"""
+        return low + int(self.random() * (high - low + 1))
+
+    def choice(self, options):
+        return options[int(self.random() * len(options))]
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        if self._normal_index >= len(self._normals):
+            self._normals = self.generator.standard_normal(self.block_size)
+            self._normal_index = 0
+        value = self._normals[self._normal_index]
+        self._normal_index += 1
+        return mu + sigma * float(value)
+
+    def standard_normal(self, shape) -> np.ndarray:
+        """Array of standard normals drawn directly from the generator"""
+        return self.generator.standard_normal(shape)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "bit_generator": self.generator.bit_generator.state,
+            "uniforms": self._uniforms[self._uniform_index:].tolist(),
+            "normals": self._normals[self._normal_index:].tolist(),
+        }
+
+    def set_state(self, state: Dict[str, Any]):
+        self.generator.bit_generator.state = state["bit_generator"]
+        self._uniforms = np.array(state["uniforms"], dtype=np.float64)
+        self._uniform_index = 0
+        self._normals = np.array(state["normals"], dtype=np.float64)
+        self._normal_index = 0
+
+
+class RandomStreams:
+    """One independent RandomStream per subsystem, all derived from a single seed"""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        children = np.random.SeedSequence(seed).spawn(len(STREAM_NAMES))
+        self.streams = {name: RandomStream(np.random.default_rng(child))
+                        for name, child in zip(STREAM_NAMES, children)}
+
+    def __getitem__(self, name: str) -> RandomStream:
+        return self.streams[name]
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"seed": self.seed, "streams": {name: s.get_state() for name, s in self.streams.items()}}
+
+    def set_state(self, state: Dict[str, Any]):
+        for name, stream_state in state["streams"].items():
+            self.streams[name].set_state(stream_state)
+
+
+# Streams of the world currently being built or stepped; entities draw from these
+_active_streams: Optional[RandomStreams] = None
+
+
+def activate_streams(streams: RandomStreams):
+    """Route entity draws to a world's streams (Simulation calls this before it builds or steps)"""
+    global _active_streams
+    _active_streams = streams
+
+
+def get_rng(name: str) -> RandomStream:
+    """Get a stream of the active world, seeding a fresh world if none is active"""
+    global _active_streams
+    if _active_streams is None:
+        _active_streams = RandomStreams(new_seed())
+    return _active_streams.streams[name]
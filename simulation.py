@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Simulation World for Evolution Simulation
+Owns the entities, spatial grid and event log, and advances them one frame at a time.
+Used by main.py for the interactive run and by headless tools (sweeps, benchmarks).
+"""
+
+import json
+import time
+from time import perf_counter_ns
+from typing import List, Any
+
+from entities.prey import Prey
+from entities.predator import Predator
+from spatial_grid import HierarchicalGrid
+from simulation_analytics import SimulationAnalytics
+from rng import RandomStreams, activate_streams, new_seed
+from work_counters import get_work_counters
+from frame_tracer import get_tracer
+from vision_scheduler import VisionScheduler
+from neighbor_lists import VerletNeighborLists, NEIGHBOR_SKIN
+from contacts import resolve_contacts
+from crowding import resolve_crowding
+
+WORLD_WIDTH, WORLD_HEIGHT = 1440, 1000
+FRAME_RATE = 60
+MAX_PREY = 1000
+GRID_CELL_SIZE = 50
+VISION_THROTTLE = 3
+COLLISION_INTERVAL = 5  # Frames between collision resolution passes
+WRAP_WORLD = True       # Entities wrap at the edges, so queries and distances wrap too
+CROWDING = True         # Soft-body separation and prey avoidance in the collision pass
+NUM_STARTING_PREY = 250
+NUM_STARTING_PREDATORS = 5
+STEP_PHASES = ("vision", "update", "bookkeeping", "logging", "collisions")
+
+
+class Simulation:
+    """A single predator-prey world that can be stepped with or without a display"""
+
+    def __init__(self, width=WORLD_WIDTH, height=WORLD_HEIGHT, frame_rate=FRAME_RATE,
+                 num_prey=NUM_STARTING_PREY, num_predators=NUM_STARTING_PREDATORS,
+                 max_prey=MAX_PREY, vision_throttle=VISION_THROTTLE,
+                 grid_cell_size=GRID_CELL_SIZE, seed=None, collision_interval=COLLISION_INTERVAL,
+                 vision_budget=None, neighbor_skin=NEIGHBOR_SKIN, wrap=WRAP_WORLD,
+                 crowding=CROWDING):
+        self.seed = new_seed() if seed is None else seed
+        # Per-world RNG streams; entities built or stepped by this world draw from them
+        self.rng = RandomStreams(self.seed)
+        activate_streams(self.rng)
+        self.width = width
+        self.height = height
+        self.frame_rate = frame_rate
+        self.max_prey = max_prey
+        self.vision_throttle = vision_throttle
+        self.collision_interval = collision_interval
+        self.crowding = crowding
+        # Vision recasts are spread over frames; vision_throttle is the normal refresh interval
+        self.vision_scheduler = VisionScheduler(budget=vision_budget)
+        self.log_interval = frame_rate
+
+        self.entities = []
+        self.predators = []
+        self.prey_list = []
+        self.frame_count = 0
+        self.vision_cast_count = 0
+        self.births_last_step = 0
+        self.deaths_last_step = 0
+        # Nanoseconds spent in each STEP_PHASES phase during the last step()
+        self.phase_times_ns = dict.fromkeys(STEP_PHASES, 0)
+        self.grid = HierarchicalGrid(width, height, cell_size=grid_cell_size, wrap=wrap)
+        # Vision and eating queries go through Verlet lists kept in sync with the grid (None: query the grid)
+        self.neighbor_skin = neighbor_skin
+        self.neighbors = VerletNeighborLists(self.grid, skin=neighbor_skin) if neighbor_skin else self.grid
+
+        self.simulation_data = {
+            "start_time": time.time(),
+            "seed": self.seed,
+            "frame_data": [],
+            "events": []
+        }
+        self.analytics = SimulationAnalytics()
+
+        world_rng = self.rng["world"]
+        for _ in range(num_prey):
+            x, y = world_rng.randint(100, width - 100), world_rng.randint(100, height - 100)
+            prey = Prey(x, y, generation=0, frame_rate=frame_rate)
+            prey.fitness_stats['birth_frame'] = 0
+            self.add_entity(prey)
+
+        for _ in range(num_predators):
+            x, y = world_rng.randint(100, min(1100, width - 100)), world_rng.randint(100, min(700, height - 100))
+            predator = Predator(x, y, generation=0, frame_rate=frame_rate)
+            predator.fitness_stats['birth_frame'] = 0
+            self.add_entity(predator)
+
+    def add_entity(self, entity):
+        """Add an entity to the world lists and the spatial grid"""
+        # Entities wrap at the world size; set it here so they never query the display
+        entity._screen_width = self.width
+        entity._screen_height = self.height
+        self.entities.append(entity)
+        self.neighbors.add_entity(entity)
+        if isinstance(entity, Prey):
+            self.prey_list.append(entity)
+        else:
+            self.predators.append(entity)
+
+    def remove_entity(self, entity):
+        """Remove an entity from the spatial grid and the world lists"""
+        self.neighbors.remove_entity(entity)
+        if entity in self.prey_list:
+            self.prey_list.remove(entity)
+        if entity in self.predators:
+            self.predators.remove(entity)
+        if entity in self.entities:
+            self.entities.remove(entity)
+
+    def set_grid_cell_size(self, cell_size: int):
+        """Rebuild the spatial grid with a new cell size (entities keep their positions)"""
+        if cell_size == self.grid.cell_size:
+            return
+        old_grid = self.grid
+        self.grid = type(old_grid)(self.width, self.height, cell_size=cell_size, wrap=old_grid.wrap)
+        for e in self.entities:
+            self.grid.add_entity(e)
+        if self.neighbors is old_grid:
+            self.neighbors = self.grid
+        else:
+            self.neighbors.grid = self.grid
+
+    def set_neighbor_skin(self, skin):
+        """Rebuild the neighbour lists with a new skin (None or 0 queries the grid directly)"""
+        self.neighbor_skin = skin
+        self.grid.clear()
+        self.neighbors = VerletNeighborLists(self.grid, skin=skin) if skin else self.grid
+        for e in self.entities:
+            self.neighbors.add_entity(e)
+
+    def is_alive(self, entity) -> bool:
+        """Whether an entity found through the grid is still part of this world"""
+        return entity in self.entities
+
+    def remove_dead_prey(self, prey):
+        """Log a prey death with fitness (compact format) and remove it from the world"""
+        prey.update_fitness_stats(self.frame_count)
+        fitness_score = prey.calculate_prey_fitness()
+        self.log_event([
+            self.frame_count, "death_prey", prey.id, prey.generation,
+            prey.age // self.frame_rate, int(prey.energy), prey.children_spawned, int(fitness_score)
+        ])
+        self.remove_entity(prey)
+
+    def log_event(self, event: List[Any]):
+        self.simulation_data["events"].append(event)
+        self.analytics.record_event(event)
+
+    def step(self):
+        """Advance the world by one frame: vision, movement, eating, deaths and births"""
+        activate_streams(self.rng)
+        self.frame_count += 1
+        self.vision_cast_count = 0
+        frame_count = self.frame_count
+        grid = self.neighbors
+        phase_times = self.phase_times_ns
+
+        t0 = perf_counter_ns()
+        self.update_vision()
+        t1 = perf_counter_ns()
+        phase_times["vision"] = t1 - t0
+
+        new_entities = []
+        removed_prey = []
+        hunters = []
+        predator_deaths = 0
+        for e in self.entities:
+            if isinstance(e, Prey):
+                e.age += 1
+                death_reason = e.update(grid)
+                # Update grid position if entity moved
+                grid.update_entity(e)
+
+                # Check for natural death
+                if death_reason:
+                    e.update_fitness_stats(frame_count)
+                    fitness_score = e.calculate_prey_fitness()
+                    self.log_event([
+                        frame_count, "death_natural", e.id, e.generation,
+                        e.age // self.frame_rate, int(e.energy), e.children_spawned, death_reason, int(fitness_score)
+                    ])
+                    removed_prey.append(e)
+                    continue
+
+                if e.should_reproduce():
+                    # Check current prey count + already planned births this frame
+                    total_prey_planned = len(self.prey_list) + len([x for x in new_entities if x.entity_type == "prey"])
+                    if total_prey_planned >= self.max_prey:
+                        continue
+                    child = e.clone()
+                    child.fitness_stats['birth_frame'] = frame_count
+                    new_entities.append(child)
+                    e.children_spawned += 1
+                    e.time_at_max_energy = 0
+            elif isinstance(e, Predator):
+                outcome, target = e.update(frame_count)
+                # Update grid position if entity moved
+                grid.update_entity(e)
+                if outcome == "hunt":
+                    hunters.append(e)
+                else:
+                    predator_deaths += self.apply_predator_outcome(e, outcome, target, removed_prey, new_entities)
+        if hunters:
+            predator_deaths += self.resolve_hunts(hunters, removed_prey, new_entities)
+        t2 = perf_counter_ns()
+        phase_times["update"] = t2 - t1
+
+        for p in removed_prey:
+            self.remove_dead_prey(p)
+        self.births_last_step = len(new_entities)
+        self.deaths_last_step = len(removed_prey) + predator_deaths
+
+        self.add_births(new_entities)
+        t3 = perf_counter_ns()
+        phase_times["bookkeeping"] = t3 - t2
+
+        self.log_frame_data()
+        t4 = perf_counter_ns()
+        phase_times["logging"] = t4 - t3
+
+        if self.crowding and frame_count % self.collision_interval == 0:
+            for e in resolve_crowding(self.entities, self.grid, avoid_frames=self.collision_interval):
+                self.neighbors.update_entity(e)
+        t5 = perf_counter_ns()
+        phase_times["collisions"] = t5 - t4
+
+        tracer = get_tracer()
+        if tracer.enabled:
+            for name, start, end in (("vision", t0, t1), ("update", t1, t2), ("bookkeeping", t2, t3),
+                                     ("logging", t3, t4), ("collisions", t4, t5)):
+                tracer.span(name, start, end)
+            tracer.counter("population", {"prey": len(self.prey_list), "predators": len(self.predators)})
+            tracer.counter("births_deaths", {"births": len(new_entities), "prey_deaths": len(removed_prey)})
+
+    def add_births(self, new_entities):
+        """Log birth events and add the newborns to the world"""
+        # Log birth events - compact format
+        for child in new_entities:
+            birth_event = [
+                self.frame_count, "birth_prey" if isinstance(child, Prey) else "birth_pred",
+                child.id, child.parent_id, child.generation
+            ]
+            # Add mutations if any significant ones occurred
+            if hasattr(child, 'mutations') and child.mutations:
+                birth_event.append(child.mutations)
+            self.log_event(birth_event)
+
+        for n in new_entities:
+            self.add_entity(n)
+
+    def resolve_hunts(self, hunters, removed_prey, new_entities) -> int:
+        """Resolve all hunters' contacts in one batch (each prey eaten at most once); returns predator deaths"""
+        dead_ids = {p.id for p in removed_prey}
+        prey, eats, reproductions, attempts = resolve_contacts(hunters, self.neighbors, self.frame_count, dead_ids)
+        eaten_by = [[] for _ in hunters]
+        for h, p in eats:
+            eaten_by[h].append(prey[p])
+        reproduced = set(reproductions[:, 0].tolist())
+        deaths = 0
+        for h, e in enumerate(hunters):
+            deaths += self.apply_hunt(e, int(attempts[h]), eaten_by[h], h in reproduced, removed_prey, new_entities)
+        return deaths
+
+    def apply_hunt(self, e, attempts, eaten, reproduced, removed_prey, new_entities) -> int:
+        """Credit one hunter with its share of the batched contacts; returns 1 if it died"""
+        outcome, target = e.finish_hunt(self.frame_count, attempts, eaten, reproduced)
+        return self.apply_predator_outcome(e, outcome, target, removed_prey, new_entities)
+
+    def apply_predator_outcome(self, e, outcome, target, removed_prey, new_entities) -> int:
+        """Log and queue the effects of a predator's frame outcome; returns 1 if it died"""
+        frame_count = self.frame_count
+        if outcome == "eat":
+            # Log hunt success - compact format
+            eaten = [p for p in target if self.is_alive(p)]
+            self.log_event([
+                frame_count, "hunt", e.id, e.generation, len(eaten)
+            ])
+            removed_prey.extend(eaten)
+        elif outcome == "reproduce":
+            if self.is_alive(target):
+                removed_prey.append(target)
+            child = e.clone()
+            child.fitness_stats['birth_frame'] = frame_count
+            e.children_spawned += 1
+            new_entities.append(child)
+        elif outcome == "die":
+            # Log predator death with fitness - compact format
+            target.update_fitness_stats(frame_count)
+            fitness_score = target.calculate_predator_fitness()
+            self.log_event([
+                frame_count, "death_pred", target.id, target.generation,
+                target.age // self.frame_rate, target.prey_eaten, int(fitness_score)
+            ])
+            self.remove_entity(target)
+            return 1
+        return 0
+
+    def update_vision(self):
+        """Recast vision rays for the entities the scheduler picks against nearby entities of the opposing type"""
+        grid = self.neighbors
+        periodic = self.grid.periodic
+        period_x, period_y, half_x, half_y = periodic
+        work = get_work_counters()
+        for e in self.vision_scheduler.select(self.entities, self.frame_count, self.vision_throttle):
+            detect_type = Predator if isinstance(e, Prey) else Prey if isinstance(e, Predator) else None
+            species = "predator" if detect_type is Predator else "prey" if detect_type is Prey else None
+            neighbors = grid.get_neighbors(e, radius=e.view_range, species=species)
+            nearby = []
+
+            view_range_sq = e.view_range * e.view_range
+
+            for o in neighbors:
+                if o is e:
+                    continue
+                if detect_type and not isinstance(o, detect_type):
+                    continue
+                dx = o.x - e.x
+                dy = o.y - e.y
+                dx -= period_x * (dx > half_x) - period_x * (dx < -half_x)   # minimum image
+                dy -= period_y * (dy > half_y) - period_y * (dy < -half_y)
+                if dx * dx + dy * dy <= view_range_sq + o.radius * o.radius:
+                    nearby.append(o)
+
+            e.cast_vision(nearby, periodic)
+            self.vision_cast_count += 1
+            if work.enabled:
+                work.vision_candidates += len(neighbors)
+                work.vision_candidates_kept += len(nearby)
+
+    def log_frame_data(self):
+        """Append a population/trait snapshot every log_interval frames"""
+        if self.frame_count % self.log_interval != 0:
+            return
+
+        prey_list = self.prey_list
+        predators = self.predators
+        prey_generations = [p.generation for p in prey_list] if prey_list else [0]
+        pred_generations = [p.generation for p in predators] if predators else [0]
+
+        prey_energies = [p.energy for p in prey_list] if prey_list else [0]
+        prey_max_speeds = [p.max_speed for p in prey_list] if prey_list else [0]
+        pred_max_speeds = [p.max_speed for p in predators] if predators else [0]
+
+        frame_data = {
+            "frame": self.frame_count,
+            "time_seconds": self.frame_count // self.frame_rate,
+            "populations": {
+                "prey_count": len(prey_list),
+                "predator_count": len(predators)
+            },
+            "generations": {
+                "prey_avg": sum(prey_generations) / len(prey_generations),
+                "prey_max": max(prey_generations),
+                "predator_avg": sum(pred_generations) / len(pred_generations),
+                "predator_max": max(pred_generations)
+            },
+            "traits": {
+                "prey_energy": {
+                    "avg": sum(prey_energies) / len(prey_energies) if prey_energies else 0,
+                    "min": min(prey_energies) if prey_energies else 0,
+                    "max": max(prey_energies) if prey_energies else 0
+                },
+                "prey_speed": {
+                    "avg": sum(prey_max_speeds) / len(prey_max_speeds) if prey_max_speeds else 0,
+                    "min": min(prey_max_speeds) if prey_max_speeds else 0,
+                    "max": max(prey_max_speeds) if prey_max_speeds else 0
+                },
+                "predator_speed": {
+                    "avg": sum(pred_max_speeds) / len(pred_max_speeds) if pred_max_speeds else 0,
+                    "min": min(pred_max_speeds) if pred_max_speeds else 0,
+                    "max": max(pred_max_speeds) if pred_max_speeds else 0
+                }
+            }
+        }
+
+        self.simulation_data["frame_data"].append(frame_data)
+        self.analytics.record_frame_data(frame_data)
+
+    def save_simulation_data(self, filepath="simulation_log.json"):
+        """Write the event log, frame data and live analytics summary to disk"""
+        with get_tracer().trace("save_simulation_data", args={"events": len(self.simulation_data["events"])}):
+            self.simulation_data["summary"] = self.analytics.get_summary()
+            with open(filepath, "w") as f:
+                json.dump(self.simulation_data, f, indent=2)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Online Simulation Analytics for Evolution Simulation
+Maintains the analyze_simulation.py aggregates incrementally as events are logged
+"""
+
+from collections import Counter
+from typing import Dict, List, Any, Optional
+
+SPECIES_BY_BIRTH_EVENT = {"birth_prey": "prey", "birth_pred": "predator"}
+
+
+class EntityRecord:
+    """Compact per-entity state needed for incremental lineage tracking"""
+
+    __slots__ = ("species", "generation", "parent_id", "birth_frame", "mutation_types",
+                 "children_count", "total_descendants", "lineage_depth", "dead")
+
+    def __init__(self, species: str, generation: int, parent_id: int,
+                 birth_frame: int, mutation_types: tuple):
+        self.species = species
+        self.generation = generation
+        self.parent_id = parent_id
+        self.birth_frame = birth_frame
+        self.mutation_types = mutation_types
+        self.children_count = 0
+        self.total_descendants = 0
+        self.lineage_depth = 0
+        self.dead = False
+
+
+class RunningStat:
+    """Running count/sum/min/max without keeping the samples"""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0,
+            "min": self.min if self.min is not None else 0,
+            "max": self.max if self.max is not None else 0
+        }
+
+
+class SimulationAnalytics:
+    """Incremental equivalent of analyze_simulation.py fed one event at a time
+
+    Only entities with a birth or migrate_in event are tracked, matching the offline
+    analyzer: the founding generation never appears in the event log.
+    """
+
+    def __init__(self):
+        self.records: Dict[int, EntityRecord] = {}
+        self.final_frame = 0
+        self.simulation_time_seconds = 0
+
+        self.births = Counter()
+        self.deaths = Counter()
+        self.death_causes = Counter()
+        self.mutated_births = Counter()
+        self.max_generation = {"prey": 0, "predator": 0}
+        self.generation_counts = {"prey": Counter(), "predator": Counter()}
+
+        self.lifespans = {"prey": RunningStat(), "predator": RunningStat()}
+        self.fitness = {"prey": RunningStat(), "predator": RunningStat()}
+        self.children_at_death = {"prey": RunningStat(), "predator": RunningStat()}
+
+        self.hunt_events = 0
+        self.prey_hunted = 0
+
+        # Island model: immigrants arriving and residents they replaced, per species
+        self.immigrants = Counter()
+        self.replaced = Counter()
+
+        # Mutation outcomes keyed by (species, mutation_type)
+        self.mutation_entities = Counter()
+        self.mutation_with_children = Counter()
+        self.mutation_children = Counter()
+        self.mutation_survival = {}
+        self.mutation_hunting = Counter()
+
+        self.max_descendants = 0
+        self.max_lineage_depth = 0
+
+    @classmethod
+    def from_events(cls, events: List[List[Any]], frame_data: Optional[List[Dict[str, Any]]] = None):
+        """Build analytics from an existing event list (e.g. a saved simulation_log.json)"""
+        analytics = cls()
+        for event in events:
+            analytics.record_event(event)
+        if frame_data:
+            analytics.record_frame_data(frame_data[-1])
+        return analytics
+
+    def record_event(self, event: List[Any]):
+        """Update aggregates for a single compact-format event"""
+        event_type = event[1]
+        if event_type in SPECIES_BY_BIRTH_EVENT:
+            self._record_birth(event, SPECIES_BY_BIRTH_EVENT[event_type])
+        elif event_type == "death_prey":
+            self._record_death(event, "prey", "hunted", event[6], event[7] if len(event) > 7 else None)
+        elif event_type == "death_natural":
+            self._record_death(event, "prey", event[7], event[6], event[8])
+        elif event_type == "death_pred":
+            self._record_death(event, "predator", "starvation", None, event[6] if len(event) > 6 else None, event[5])
+        elif event_type == "migrate_in":
+            # Immigrant: tracked like a birth without a parent in this world
+            frame, entity_id, species, generation = event[0], event[2], event[4], event[5]
+            self._add_record(entity_id, species, generation, None, frame, ())
+            self.immigrants[species] += 1
+        elif event_type == "migrate_out":
+            species = event[5]
+            self._record_death(event, species, "replaced", event[6], event[8], event[7])
+            self.replaced[species] += 1
+        elif event_type == "hunt":
+            self.hunt_events += 1
+            self.prey_hunted += event[4]
+
+    def record_frame_data(self, frame_data: Dict[str, Any]):
+        """Track the latest frame_data entry for the simulation overview"""
+        self.final_frame = frame_data["frame"]
+        self.simulation_time_seconds = frame_data["time_seconds"]
+
+    def _add_record(self, entity_id: int, species: str, generation: int, parent_id: Optional[int],
+                    frame: int, mutation_types: tuple):
+        self.records[entity_id] = EntityRecord(species, generation, parent_id, frame, mutation_types)
+        self.generation_counts[species][generation] += 1
+        if generation > self.max_generation[species]:
+            self.max_generation[species] = generation
+        if mutation_types:
+            self.mutated_births[species] += 1
+            for mutation_type in mutation_types:
+                self.mutation_entities[(species, mutation_type)] += 1
+
+    def _record_birth(self, event: List[Any], species: str):
+        frame, child_id, parent_id, generation = event[0], event[2], event[3], event[4]
+        mutations = event[5] if len(event) > 5 else {}
+        self._add_record(child_id, species, generation, parent_id, frame, tuple(mutations.keys()))
+        self.births[species] += 1
+
+        parent = self.records.get(parent_id)
+        if parent is None:
+            return
+
+        parent.children_count += 1
+        for mutation_type in parent.mutation_types:
+            key = (parent.species, mutation_type)
+            self.mutation_children[key] += 1
+            if parent.children_count == 1:
+                self.mutation_with_children[key] += 1
+
+        # Walk parent pointers: every ancestor gains a descendant, and lineage
+        # depth grows wherever this branch is now the deepest one
+        depth = 1
+        ancestor = parent
+        while ancestor is not None:
+            ancestor.total_descendants += 1
+            if ancestor.total_descendants > self.max_descendants:
+                self.max_descendants = ancestor.total_descendants
+            if depth > ancestor.lineage_depth:
+                ancestor.lineage_depth = depth
+                if depth > self.max_lineage_depth:
+                    self.max_lineage_depth = depth
+            depth += 1
+            ancestor = self.records.get(ancestor.parent_id)
+
+    def _record_death(self, event: List[Any], species: str, cause: str,
+                      children_spawned: Optional[int], fitness: Optional[float], prey_eaten: Optional[int] = None):
+        self.deaths[species] += 1
+        self.death_causes[cause] += 1
+        if fitness is not None:
+            self.fitness[species].add(fitness)
+        if children_spawned is not None:
+            self.children_at_death[species].add(children_spawned)
+
+        record = self.records.get(event[2])
+        if record is None or record.dead:
+            return
+        record.dead = True
+
+        age_seconds = event[4]
+        self.lifespans[species].add(age_seconds)
+        for mutation_type in record.mutation_types:
+            key = (species, mutation_type)
+            if key not in self.mutation_survival:
+                self.mutation_survival[key] = RunningStat()
+            self.mutation_survival[key].add(age_seconds)
+            if species == "predator":
+                self.mutation_hunting[key] += prey_eaten or 0
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Summary in the analyze_simulation.py layout plus the running aggregates"""
+        total_prey = self.births["prey"] + self.immigrants["prey"]
+        total_predators = self.births["predator"] + self.immigrants["predator"]
+
+        mutation_outcomes = {}
+        for (species, mutation_type), count in sorted(self.mutation_entities.items()):
+            key = (species, mutation_type)
+            survival = self.mutation_survival.get(key)
+            outcome = {
+                "entities": count,
+                "had_children_rate": self.mutation_with_children[key] / count,
+                "avg_children": self.mutation_children[key] / count,
+                "avg_survival_seconds": survival.to_dict()["avg"] if survival else None
+            }
+            if species == "predator" and survival:
+                outcome["avg_hunting_success"] = self.mutation_hunting[key] / survival.count
+            mutation_outcomes.setdefault(species, {})[mutation_type] = outcome
+
+        return {
+            "simulation_overview": {
+                "total_entities": total_prey + total_predators,
+                "total_prey": total_prey,
+                "total_predators": total_predators,
+                "final_frame": self.final_frame,
+                "simulation_time_seconds": self.simulation_time_seconds
+            },
+            "mutation_overview": {
+                "prey_mutation_rate": self.mutated_births["prey"] / total_prey if total_prey else 0,
+                "pred_mutation_rate": self.mutated_births["predator"] / total_predators if total_predators else 0,
+                "total_mutations": self.mutated_births["prey"] + self.mutated_births["predator"]
+            },
+            "generation_spread": {
+                "prey_max_generation": self.max_generation["prey"],
+                "pred_max_generation": self.max_generation["predator"],
+            },
+            "lifespans_seconds": {species: stat.to_dict() for species, stat in self.lifespans.items()},
+            "fitness": {species: stat.to_dict() for species, stat in self.fitness.items()},
+            "children_at_death": {species: stat.to_dict() for species, stat in self.children_at_death.items()},
+            "deaths": dict(self.deaths),
+            "death_causes": dict(self.death_causes),
+            "hunting": {
+                "hunt_events": self.hunt_events,
+                "prey_hunted": self.prey_hunted
+            },
+            "migration": {
+                "immigrants": dict(self.immigrants),
+                "replaced": dict(self.replaced)
+            },
+            "lineage": {
+                "max_descendants": self.max_descendants,
+                "max_lineage_depth": self.max_lineage_depth
+            },
+            "mutation_outcomes": mutation_outcomes
+        }
+
+    def print_summary(self):
+        """Print a short analytics summary"""
+        summary = self.get_summary()
+        overview = summary["simulation_overview"]
+        spread = summary["generation_spread"]
+        rates = summary["mutation_overview"]
+        print(f"\n=== Simulation Analytics ===")
+        print(f"Births: Prey={self.births['prey']}, Predators={self.births['predator']}")
+        if self.immigrants:
+            print(f"Migration: {self.immigrants['prey']} prey and {self.immigrants['predator']} predators "
+                  f"arrived, replacing the weakest residents")
+        print(f"Deaths: Prey={self.deaths['prey']}, Predators={self.deaths['predator']}")
+        print(f"Max generations: Prey={spread['prey_max_generation']}, Predators={spread['pred_max_generation']}")
+        print(f"Mutation rates: Prey={rates['prey_mutation_rate']:.1%}, Predators={rates['pred_mutation_rate']:.1%}")
+        print(f"Largest lineage: {self.max_descendants} descendants, depth {self.max_lineage_depth}")
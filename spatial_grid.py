@@ -1,16 +1,71 @@
 import math
+from work_counters import get_work_counters
+
+_work = get_work_counters()
+
+SPECIES_INDEX = {"prey": 0, "predator": 1}
+COARSE_FACTOR = 4        # Fine cells per coarse block side
+COARSE_MIN_RANGE = 3     # Queries spanning at least this many fine cells (each way) use the coarse level
+COARSE_MIN_RANGE_SPECIES = 2   # Same, for queries for one species (its blocks are often empty)
+
+NO_WRAP = (0.0, 0.0, math.inf, math.inf)   # periodic tuple of a bounded world
+_UNBOUNDED = 10 ** 9                        # Identity index tables cover cells in [-_UNBOUNDED, _UNBOUNDED)
+
 
 class SpatialGrid:
-    def __init__(self, width, height, cell_size):
+    def __init__(self, width, height, cell_size, wrap=False):
+        """Initialize grid
+
+        Args:
+            width, height: World size
+            cell_size: Cell side; wrapped grids shrink it slightly so whole cells tile the world
+            wrap: Toroidal world (entities wrap at the edges): cell indices wrap, so queries
+                near an edge see entities across it
+        """
         self.cell_size = cell_size
-        self.cols = math.ceil(width / cell_size)
-        self.rows = math.ceil(height / cell_size)
+        self.width = width
+        self.height = height
+        self.wrap = wrap
         self.grid = {}
         # Track entity positions for incremental updates
         self.entity_positions = {}  # entity_id -> (cell_x, cell_y)
+        self._layout(math.ceil(width / cell_size), math.ceil(height / cell_size))
+
+    def _layout(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        if self.wrap:
+            self.cell_w = self.width / cols
+            self.cell_h = self.height / rows
+            # (period_x, period_y, half_x, half_y) for minimum-image displacements:
+            # d -= period * (d > half) - period * (d < -half) maps d to the nearest image without branching
+            self.periodic = (float(self.width), float(self.height), self.width / 2, self.height / 2)
+        else:
+            self.cell_w = self.cell_h = self.cell_size
+            self.periodic = NO_WRAP
+        self._col_index, self._col_offset = self._index_table(cols)
+        self._row_index, self._row_offset = self._index_table(rows)
+
+    def _index_table(self, count):
+        """(table, offset): table[offset + c] is the stored index of unwrapped cell c
+
+        Wrapped grids map c modulo count (valid for c in [-count, 2 * count)), bounded
+        grids use an identity range, so lookups and spans never branch on the edges.
+        """
+        if self.wrap:
+            return [(i - count) % count for i in range(3 * count)], count
+        return range(-_UNBOUNDED, _UNBOUNDED), _UNBOUNDED
+
+    @staticmethod
+    def _span(index, offset, count, c, r):
+        """Stored cell indices within r cells of unwrapped cell c along one axis, each at most once"""
+        if 2 * r + 1 >= count:
+            return index[offset:offset + count]
+        return index[offset + c - r:offset + c + r + 1]
 
     def _cell_coords(self, x, y):
-        return int(x // self.cell_size), int(y // self.cell_size)
+        return (self._col_index[int(x // self.cell_w) + self._col_offset],
+                self._row_index[int(y // self.cell_h) + self._row_offset])
 
     def clear(self):
         self.grid.clear()
@@ -62,19 +117,176 @@ class SpatialGrid:
             # New entity - add normally
             self.add_entity(entity)
 
-    def get_neighbors(self, entity, radius=None):
-        cx, cy = self._cell_coords(entity.x, entity.y)
-        cells = set()
+    def get_neighbors(self, entity, radius=None, species=None):
+        """Entities in the cells covering radius around entity
 
+        species is a hint that only that entity type is wanted; this grid ignores it and
+        callers still filter, but HierarchicalGrid uses it to skip blocks wholesale.
+        """
+        cx, cy = self._cell_coords(entity.x, entity.y)
         radius = radius or self.cell_size * 1.5  # fallback
-        cell_range = int(math.ceil(radius / self.cell_size))
-
-        for dx in range(-cell_range, cell_range + 1):
-            for dy in range(-cell_range, cell_range + 1):
-                cells.add((cx + dx, cy + dy))
+        xs = self._span(self._col_index, self._col_offset, self.cols, cx, math.ceil(radius / self.cell_w))
+        ys = self._span(self._row_index, self._row_offset, self.rows, cy, math.ceil(radius / self.cell_h))
 
+        grid = self.grid
         neighbors = []
-        for cell in cells:
-            neighbors.extend(self.grid.get(cell, []))
+        for fx in xs:
+            for fy in ys:
+                cell = grid.get((fx, fy))
+                if cell:
+                    neighbors.extend(cell)
+        if _work.enabled:
+            _work.grid_queries += 1
+            _work.grid_cells_visited += len(xs) * len(ys)
+            _work.grid_entities_returned += len(neighbors)
         return neighbors
 
+
+class HierarchicalGrid(SpatialGrid):
+    """SpatialGrid with a coarse level of per-species blocks for mixed query radii
+
+    Fine cells are also kept per species, and each coarse block (COARSE_FACTOR x
+    COARSE_FACTOR fine cells) keeps one entity list per species. Large-radius queries
+    (vision) walk the blocks: blocks empty of the requested species are skipped
+    wholesale, blocks fully inside the query are taken as one list, and only the rim
+    is walked cell by cell. Small queries (eating, avoidance) stay on the fine cells.
+    With a species hint only that species is read, so the result holds only entities
+    of that type (callers filter by type anyway).
+    """
+
+    def __init__(self, width, height, cell_size, wrap=False, coarse_factor=COARSE_FACTOR,
+                 coarse_min_range=COARSE_MIN_RANGE, coarse_min_range_species=COARSE_MIN_RANGE_SPECIES):
+        self.coarse_factor = coarse_factor
+        super().__init__(width, height, cell_size, wrap=wrap)
+        self.coarse_min_range = coarse_min_range
+        self.coarse_min_range_species = coarse_min_range_species
+        self.species_cells = [{} for _ in SPECIES_INDEX]    # species index -> (cx, cy) -> [entities]
+        self.species_blocks = [{} for _ in SPECIES_INDEX]   # species index -> (bx, by) -> [entities]
+
+    def _layout(self, cols, rows):
+        f = self.coarse_factor
+        if self.wrap:
+            # Whole blocks must tile a wrapped world
+            cols, rows = -(-cols // f) * f, -(-rows // f) * f
+        super()._layout(cols, rows)
+        self._bcol_index, self._bcol_offset = self._index_table(math.ceil(cols / f))
+        self._brow_index, self._brow_offset = self._index_table(math.ceil(rows / f))
+
+    def clear(self):
+        super().clear()
+        for layer in self.species_cells + self.species_blocks:
+            layer.clear()
+
+    @staticmethod
+    def _bucket_add(layer, key, entity):
+        bucket = layer.get(key)
+        if bucket is None:
+            layer[key] = [entity]
+        else:
+            bucket.append(entity)
+
+    @staticmethod
+    def _bucket_remove(layer, key, entity):
+        bucket = layer.get(key)
+        if bucket and entity in bucket:
+            bucket.remove(entity)
+            if not bucket:
+                del layer[key]
+
+    def add_entity(self, entity):
+        super().add_entity(entity)
+        cx, cy = self.entity_positions[entity.id]
+        s = SPECIES_INDEX.get(entity.entity_type, 0)
+        f = self.coarse_factor
+        self._bucket_add(self.species_cells[s], (cx, cy), entity)
+        self._bucket_add(self.species_blocks[s], (cx // f, cy // f), entity)
+
+    def remove_entity(self, entity):
+        position = self.entity_positions.get(entity.id)
+        super().remove_entity(entity)
+        if position is not None:
+            cx, cy = position
+            s = SPECIES_INDEX.get(entity.entity_type, 0)
+            f = self.coarse_factor
+            self._bucket_remove(self.species_cells[s], (cx, cy), entity)
+            self._bucket_remove(self.species_blocks[s], (cx // f, cy // f), entity)
+
+    def update_entity(self, entity):
+        """Update entity position incrementally (only if it moved cells)"""
+        new = self._cell_coords(entity.x, entity.y)
+        old = self.entity_positions.get(entity.id)
+        if old is None:
+            self.add_entity(entity)
+            return
+        if old == new:
+            return
+        s = SPECIES_INDEX.get(entity.entity_type, 0)
+        self._bucket_remove(self.grid, old, entity)
+        self._bucket_add(self.grid, new, entity)
+        self._bucket_remove(self.species_cells[s], old, entity)
+        self._bucket_add(self.species_cells[s], new, entity)
+        self.entity_positions[entity.id] = new
+        f = self.coarse_factor
+        old_block, new_block = (old[0] // f, old[1] // f), (new[0] // f, new[1] // f)
+        if old_block != new_block:
+            self._bucket_remove(self.species_blocks[s], old_block, entity)
+            self._bucket_add(self.species_blocks[s], new_block, entity)
+
+    def get_neighbors(self, entity, radius=None, species=None):
+        radius = radius or self.cell_size * 1.5  # fallback
+        rx = math.ceil(radius / self.cell_w)
+        ry = math.ceil(radius / self.cell_h)
+        cx, cy = self._cell_coords(entity.x, entity.y)
+        cols, rows = self.cols, self.rows
+        col_index, col_offset = self._col_index, self._col_offset
+        row_index, row_offset = self._row_index, self._row_offset
+        neighbors = []
+        cells_visited = blocks_skipped = 0
+
+        if max(rx, ry) < (self.coarse_min_range if species is None else self.coarse_min_range_species):
+            cells = self.grid if species is None else self.species_cells[SPECIES_INDEX[species]]
+            xs = self._span(col_index, col_offset, cols, cx, rx)
+            ys = self._span(row_index, row_offset, rows, cy, ry)
+            for fx in xs:
+                for fy in ys:
+                    cell = cells.get((fx, fy))
+                    if cell:
+                        neighbors.extend(cell)
+            cells_visited = len(xs) * len(ys)
+        else:
+            # Unwrapped cell bounds (the whole axis, once, if the query spans it)
+            x0, x1 = (0, cols - 1) if 2 * rx + 1 >= cols else (cx - rx, cx + rx)
+            y0, y1 = (0, rows - 1) if 2 * ry + 1 >= rows else (cy - ry, cy + ry)
+            f = self.coarse_factor
+            bcol_index, bcol_offset = self._bcol_index, self._bcol_offset
+            brow_index, brow_offset = self._brow_index, self._brow_offset
+            wanted = range(len(SPECIES_INDEX)) if species is None else (SPECIES_INDEX[species],)
+            for s in wanted:
+                cells = self.species_cells[s]
+                blocks = self.species_blocks[s]
+                for bx in range(x0 // f, x1 // f + 1):
+                    fx0, fx1 = max(x0, bx * f), min(x1, bx * f + f - 1)
+                    kx = bcol_index[bcol_offset + bx]
+                    for by in range(y0 // f, y1 // f + 1):
+                        block = blocks.get((kx, brow_index[brow_offset + by]))
+                        if block is None:
+                            blocks_skipped += 1
+                            continue
+                        fy0, fy1 = max(y0, by * f), min(y1, by * f + f - 1)
+                        if fx1 - fx0 == f - 1 and fy1 - fy0 == f - 1:
+                            neighbors.extend(block)   # Block fully inside the query
+                            cells_visited += 1
+                            continue
+                        ys = row_index[row_offset + fy0:row_offset + fy1 + 1]
+                        for fx in col_index[col_offset + fx0:col_offset + fx1 + 1]:
+                            for fy in ys:
+                                cell = cells.get((fx, fy))
+                                if cell:
+                                    neighbors.extend(cell)
+                        cells_visited += (fx1 - fx0 + 1) * (fy1 - fy0 + 1)
+        if _work.enabled:
+            _work.grid_queries += 1
+            _work.grid_cells_visited += cells_visited
+            _work.grid_blocks_skipped += blocks_skipped
+            _work.grid_entities_returned += len(neighbors)
+        return neighbors
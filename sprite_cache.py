@@ -8,6 +8,7 @@ import math
 import pygame
 from typing import Dict, Tuple, Optional
 import weakref
+from frame_tracer import get_tracer
 
 class SpriteCache:
     """Manages pre-computed sprite rotations and caching"""
@@ -69,8 +70,9 @@ class SpriteCache:
         
         if cache_key not in self.cache:
             self.cache_misses += 1
-            base_sprite = self._create_base_sprite(entity_type, color, width, height)
-            self.cache[cache_key] = self._pre_compute_rotations(base_sprite)
+            with get_tracer().trace("sprite_precompute", args={"type": entity_type, "size": [width, height]}):
+                base_sprite = self._create_base_sprite(entity_type, color, width, height)
+                self.cache[cache_key] = self._pre_compute_rotations(base_sprite)
         else:
             self.cache_hits += 1
             
@@ -106,6 +108,11 @@ class SpriteCache:
         avg_pixels_per_surface = 25 * 25  # estimate for typical entity size
         return total_surfaces * avg_pixels_per_surface * 4
 
+    def measure_memory_usage(self) -> int:
+        """Exact pixel bytes held by the cached surfaces"""
+        return sum(s.get_width() * s.get_height() * s.get_bytesize()
+                   for rotations in self.cache.values() for s in rotations)
+
 
 _sprite_cache = None
 
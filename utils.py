@@ -1,11 +1,11 @@
 import colorsys
-import random
+from rng import get_rng
 
 def hue_shifted_color(from_color, shift_range=0.1):
         # Convert to HSV, shift hue, convert back
         r, g, b = from_color
         h, s, v = colorsys.rgb_to_hsv(r / 255, g / 255, b / 255)
-        h = (h + random.uniform(-shift_range, shift_range)) % 1.0
+        h = (h + get_rng("mutation").uniform(-shift_range, shift_range)) % 1.0
         r, g, b = colorsys.hsv_to_rgb(h, s, v)
         return (int(r * 255), int(g * 255), int(b * 255))
 
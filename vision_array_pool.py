@@ -117,6 +117,11 @@ class VisionArrayPool:
             "max_arrays_per_size": self.max_arrays_per_size
         }
     
+    def pooled_bytes(self) -> int:
+        """Bytes held by arrays waiting in the pools"""
+        return sum(a.nbytes for pools in (self.vision_pools, self.hits_pools, self.angles_pools)
+                   for pool in pools.values() for a in pool)
+
     def clear_pools(self):
         """Clear all pooled arrays (for memory management)"""
         self.vision_pools.clear()
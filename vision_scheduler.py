@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Vision Scheduler for Evolution Simulation
+Spreads vision recasts across frames instead of recasting every entity on every
+vision_throttle-th frame. Each entity is refreshed when its vision is older than an
+interval that depends on its situation, and entities start staggered round-robin in the
+order the scheduler first sees them, so the per-frame cast count stays flat. An optional budget caps casts per frame.
+"""
+
+from typing import List, Optional
+
+VISION_UNSCHEDULED = -1   # last_vision_frame of an entity the scheduler has not seen yet
+
+# Refresh intervals as multiples of vision_throttle (urgent entities refresh every frame)
+IDLE_INTERVAL_FACTOR = 2
+# Frames since the other species was last seen that still count as tracking or threatened
+RECENT_SIGHTING_FRAMES = 30
+# Frames without a nearby predator after which prey with none in sight count as idle and isolated
+IDLE_PREY_FRAMES = 60
+
+
+class VisionScheduler:
+    """Chooses which entities recast vision this frame"""
+
+    def __init__(self, budget: Optional[int] = None):
+        """Initialize scheduler
+
+        Args:
+            budget: Maximum casts per frame (None for no cap). Over budget, urgent entities
+                go first, then the stalest; the rest are deferred to the next frame.
+        """
+        self.budget = budget
+        self.deferred = 0   # Entities that were due but deferred by the budget, last frame
+        # Newcomers seen so far; staggers them by arrival, not by the process-wide entity id,
+        # so seeded worlds schedule the same way whatever ran before them in the process
+        self.arrivals = 0
+
+    @staticmethod
+    def refresh_interval(entity, throttle: int) -> int:
+        """Frames between recasts: 1 near a threat / tracking prey, longer for idle prey"""
+        if entity.entity_type == "prey":
+            since = entity.frames_since_predator_seen
+            if since <= RECENT_SIGHTING_FRAMES:
+                return 1
+            if since >= IDLE_PREY_FRAMES and "predator" not in entity.vision_hits:
+                return throttle * IDLE_INTERVAL_FACTOR
+            return throttle
+        if entity.frames_since_prey_seen <= RECENT_SIGHTING_FRAMES:
+            return 1
+        return throttle
+
+    def select(self, entities: List, frame: int, throttle: int) -> List:
+        """Entities whose vision should be recast on this frame"""
+        due = []
+        refresh_interval = self.refresh_interval
+        for e in entities:
+            interval = refresh_interval(e, throttle)
+            last = e.last_vision_frame
+            if last == VISION_UNSCHEDULED:
+                # Stagger newcomers round-robin so they do not all land on one frame
+                last = e.last_vision_frame = frame - interval + self.arrivals % interval
+                self.arrivals += 1
+            if frame - last >= interval:
+                due.append(e)
+
+        budget = self.budget
+        if budget is not None and len(due) > budget:
+            # Urgent (interval 1) first, then stalest first
+            due.sort(key=lambda e: (self.refresh_interval(e, throttle) != 1, e.last_vision_frame))
+            self.deferred = len(due) - budget
+            due = due[:budget]
+        else:
+            self.deferred = 0
+
+        for e in due:
+            e.last_vision_frame = frame
+        return due
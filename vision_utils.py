@@ -14,7 +14,7 @@ HIT_PREY = 2
 def raycast_batch(
     self_x, self_y, self_angle, fov, view_range, num_rays,
     other_positions, other_radii, other_types,
-    detect_predator, detect_prey
+    detect_predator, detect_prey, counters=None
 ):
     vision = np.ones(num_rays, dtype=np.float32)
     hits = np.full(num_rays, HIT_NONE, dtype=np.int32)
@@ -30,8 +30,9 @@ def raycast_batch(
         for i in range(num_rays):
             ray_angles[i] = start_angle + i * step
 
-        ray_angles = np.linspace(start_angle, start_angle + fov, num_rays)
-
+    tests = 0
+    intersections = 0
+    ray_hits = 0
     for ray_idx in range(num_rays):
         angle = ray_angles[ray_idx]
         ray_dx = math.cos(angle)
@@ -49,21 +50,31 @@ def raycast_batch(
             proj_len = dx * ray_dx + dy * ray_dy
 
             if 0 < proj_len < view_range:
+                tests += 1
                 closest_x = self_x + ray_dx * proj_len
                 closest_y = self_y + ray_dy * proj_len
                 dist_sq = (ox - closest_x) ** 2 + (oy - closest_y) ** 2
 
                 # Clamp to avoid negative zero-ish values due to floating point error
-                if dist_sq < radius * radius and proj_len < closest_dist:
-                    if typ == HIT_PREDATOR and detect_predator:
-                        closest_dist = proj_len
-                        hit_type = HIT_PREDATOR
-                    elif typ == HIT_PREY and detect_prey:
-                        closest_dist = proj_len
-                        hit_type = HIT_PREY
+                if dist_sq < radius * radius:
+                    intersections += 1
+                    if proj_len < closest_dist:
+                        if typ == HIT_PREDATOR and detect_predator:
+                            closest_dist = proj_len
+                            hit_type = HIT_PREDATOR
+                        elif typ == HIT_PREY and detect_prey:
+                            closest_dist = proj_len
+                            hit_type = HIT_PREY
 
         vision[ray_idx] = closest_dist / view_range
         hits[ray_idx] = hit_type
+        if hit_type != HIT_NONE:
+            ray_hits += 1
+
+    if counters is not None:
+        counters[0] += tests
+        counters[1] += intersections
+        counters[2] += ray_hits
 
     return vision, hits
 
@@ -73,9 +84,13 @@ def raycast_batch_pooled(
     self_x, self_y, self_angle, fov, view_range, num_rays,
     other_positions, other_radii, other_types,
     detect_predator, detect_prey,
-    vision_array, hits_array, angles_array
+    vision_array, hits_array, angles_array, counters=None
 ):
-    """Optimized raycast using pre-allocated arrays"""
+    """Optimized raycast using pre-allocated arrays
+
+    counters (optional int64 array, see work_counters) accumulates ray tests,
+    intersections and hit rays; passing None compiles a version without counting.
+    """
     
     # Reset arrays to clean state
     for i in range(num_rays):
@@ -94,6 +109,9 @@ def raycast_batch_pooled(
             angles_array[i] = start_angle + i * step
 
     # Cast rays
+    tests = 0
+    intersections = 0
+    ray_hits = 0
     for ray_idx in range(num_rays):
         angle = angles_array[ray_idx]
         ray_dx = math.cos(angle)
@@ -112,20 +130,30 @@ def raycast_batch_pooled(
             proj_len = dx * ray_dx + dy * ray_dy
 
             if 0 < proj_len < view_range:
+                tests += 1
                 closest_x = self_x + ray_dx * proj_len
                 closest_y = self_y + ray_dy * proj_len
                 dist_sq = (ox - closest_x) ** 2 + (oy - closest_y) ** 2
 
-                if dist_sq < radius * radius and proj_len < closest_dist:
-                    if typ == HIT_PREDATOR and detect_predator:
-                        closest_dist = proj_len
-                        hit_type = HIT_PREDATOR
-                    elif typ == HIT_PREY and detect_prey:
-                        closest_dist = proj_len
-                        hit_type = HIT_PREY
+                if dist_sq < radius * radius:
+                    intersections += 1
+                    if proj_len < closest_dist:
+                        if typ == HIT_PREDATOR and detect_predator:
+                            closest_dist = proj_len
+                            hit_type = HIT_PREDATOR
+                        elif typ == HIT_PREY and detect_prey:
+                            closest_dist = proj_len
+                            hit_type = HIT_PREY
 
         vision_array[ray_idx] = closest_dist / view_range
         hits_array[ray_idx] = hit_type
+        if hit_type != HIT_NONE:
+            ray_hits += 1
+
+    if counters is not None:
+        counters[0] += tests
+        counters[1] += intersections
+        counters[2] += ray_hits
 
     return vision_array, hits_array
 
@@ -133,7 +161,7 @@ def raycast_batch_pooled(
 def raycast_batch_optimized(
     self_x, self_y, self_angle, fov, view_range, num_rays,
     other_positions, other_radii, other_types,
-    detect_predator, detect_prey
+    detect_predator, detect_prey, counters=None
 ):
     """Wrapper function that uses array pooling for optimized vision casting"""
     pool = get_vision_array_pool()
@@ -144,7 +172,7 @@ def raycast_batch_optimized(
         self_x, self_y, self_angle, fov, view_range, num_rays,
         other_positions, other_radii, other_types,
         detect_predator, detect_prey,
-        vision_array, hits_array, angles_array
+        vision_array, hits_array, angles_array, counters
     )
     
     # Convert to lists for entity consumption (avoid keeping array references)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Hot-Path Work Counters for Evolution Simulation
+Counts algorithmic work (grid cells scanned, vision candidates, ray tests, contact
+checks, crowding pairs, sprite blits) so cost can be compared independently of timing noise
+"""
+
+from typing import Dict
+
+import numpy as np
+
+# Slots the raycast kernels accumulate into (see vision_utils)
+KERNEL_RAY_TESTS = 0          # candidate within view range along a ray (circle test evaluated)
+KERNEL_RAY_INTERSECTIONS = 1  # circle test passed
+KERNEL_RAY_HITS = 2           # rays that ended on a detectable target
+KERNEL_COUNTER_SLOTS = 3
+
+
+class WorkCounters:
+    """Cumulative work counters, read and reset once per performance sample"""
+
+    def __init__(self, enabled=True):
+        """Initialize counters
+
+        Args:
+            enabled: When False, call sites skip counting and the raycast kernels are
+                called without a counter array (a separate, counter-free compilation)
+        """
+        self.enabled = enabled
+        self.kernel_counters = np.zeros(KERNEL_COUNTER_SLOTS, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self.grid_queries = 0
+        self.grid_cells_visited = 0
+        self.grid_blocks_skipped = 0
+        self.grid_entities_returned = 0
+        self.neighbor_list_builds = 0
+        self.neighbor_list_reuses = 0
+        self.neighbor_list_reanchors = 0
+        self.vision_candidates = 0
+        self.vision_candidates_kept = 0
+        self.ray_pairs = 0
+        self.contact_checks = 0
+        self.crowding_pairs = 0
+        self.sprite_blits = 0
+        self.kernel_counters[:] = 0
+
+    def get_kernel_counters(self):
+        """Counter array to pass to the raycast kernels, or None when counting is off"""
+        return self.kernel_counters if self.enabled else None
+
+    def get_stats(self) -> Dict:
+        """Totals since the last reset plus per-call ratios"""
+        ray_tests = int(self.kernel_counters[KERNEL_RAY_TESTS])
+        ray_intersections = int(self.kernel_counters[KERNEL_RAY_INTERSECTIONS])
+        ray_hits = int(self.kernel_counters[KERNEL_RAY_HITS])
+        return {
+            "grid_queries": self.grid_queries,
+            "grid_cells_visited": self.grid_cells_visited,
+            "grid_blocks_skipped": self.grid_blocks_skipped,
+            "cells_per_query": round(self.grid_cells_visited / self.grid_queries, 2) if self.grid_queries else 0,
+            "entities_per_query": round(self.grid_entities_returned / self.grid_queries, 2) if self.grid_queries else 0,
+            "neighbor_list_builds": self.neighbor_list_builds,
+            "neighbor_list_reuses": self.neighbor_list_reuses,
+            "neighbor_list_reanchors": self.neighbor_list_reanchors,
+            "vision_candidates": self.vision_candidates,
+            "vision_candidates_kept": self.vision_candidates_kept,
+            "candidate_keep_rate": round(self.vision_candidates_kept / self.vision_candidates, 3)
+            if self.vision_candidates else 0,
+            "ray_pairs": self.ray_pairs,
+            "ray_tests": ray_tests,
+            "ray_intersections": ray_intersections,
+            "ray_hits": ray_hits,
+            "contact_checks": self.contact_checks,
+            "crowding_pairs": self.crowding_pairs,
+            "sprite_blits": self.sprite_blits
+        }
+
+    def collect(self) -> Dict:
+        """get_stats() then reset, for per-sample intervals"""
+        stats = self.get_stats()
+        self.reset()
+        return stats
+
+
+# Global work counters instance
+_work_counters = None
+
+def get_work_counters() -> WorkCounters:
+    """Get global work counters instance"""
+    global _work_counters
+    if _work_counters is None:
+        _work_counters = WorkCounters()
+    return _work_counters